@@ -0,0 +1,403 @@
+"""
+Card abstraction: every hand of a street mapped to one of a few hundred
+buckets of similar strength, for training and running learning bots.
+
+Offline, build_street() computes for every canonical hand of a street
+(isomorphism.canonical_index) a histogram of its equity against a random
+hand over sampled runouts of the rest of the board. Histograms are computed
+in chunks across a process pool and checkpointed to disk, so an interrupted
+build resumes where it stopped. They are then clustered with k-means under
+the earth mover's distance (for 1-D histograms, the L1 distance between
+their CDFs), and every hand's bucket is written to buckets_<street>.npy: one
+small int per canonical index, next to a JSON description.
+
+At decision time CardAbstraction memory-maps those arrays, so a bucket is a
+canonical index plus one array read:
+
+    python scripts/build_abstraction.py --streets pre-flop flop --buckets 50
+    bucket = self._bucket(observation.hole_cards, observation.community_cards)
+
+Buckets are numbered from weakest to strongest (by mean equity).
+"""
+import json
+import math
+import os
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from deck import FULL_DECK, partial_shuffle_batch
+from hand_evaluator import _save_atomic, cache_dir, evaluate_batch
+from isomorphism import canonical_index, indexer
+
+ARTIFACT_VERSION = 1
+
+# Street name (as in Observation.stage) -> board cards
+STREETS = {"pre-flop": 0, "flop": 3, "turn": 4, "river": 5}
+# Runouts per hand when not given; pre-flop has only 169 hands, so it can afford the most
+DEFAULT_RUNOUTS = {"pre-flop": 255, "flop": 64, "turn": 64, "river": 64}
+
+_shared = None  # Process-wide CardAbstraction from shared_abstraction()
+
+
+def default_directory() -> str:
+    """Where artifacts and checkpoints live ($TEXASHOLDEM_CACHE/abstraction)."""
+    return os.path.join(cache_dir(), "abstraction")
+
+
+def _street_indexer(board_size: int):
+    return indexer((2, board_size) if board_size else (2,))
+
+
+def _artifact_path(directory: str, street: str) -> str:
+    return os.path.join(directory, f"buckets_v{ARTIFACT_VERSION}_{street}.npy")
+
+
+def _info_path(directory: str, street: str) -> str:
+    return os.path.join(directory, f"buckets_v{ARTIFACT_VERSION}_{street}.json")
+
+
+# ===== EQUITY HISTOGRAMS =====
+
+def class_size(hole_cards: List[int], board: List[int]) -> int:
+    """Number of concrete (hole, board) deals in a hand's isomorphism class."""
+    signatures = Counter(
+        (tuple(sorted(c >> 8 & 0xF for c in hole_cards if c >> 12 & 0xF == bit)),
+         tuple(sorted(c >> 8 & 0xF for c in board if c >> 12 & 0xF == bit)))
+        for bit in (1, 2, 4, 8))
+    return 24 // math.prod(math.factorial(n) for n in signatures.values())
+
+
+def equity_histograms(hands: Sequence[Tuple[List[int], List[int]]], bins: int = 20,
+                      runouts: int = 64, opponents: int = 22, rng=None) -> np.ndarray:
+    """
+    Histogram of each hand's equity against one random hand, per runout.
+
+    For every hand, `runouts` completions of the board are dealt; on each,
+    equity is estimated against `opponents` random hands (dealt disjointly
+    from one shuffle, so at most 22) and dropped into one of `bins`
+    equal-width bins. On the river there is nothing left to deal, so all
+    runouts x opponents samples make a single estimate and the histogram is
+    one bin.
+
+    Args:
+        hands: (hole, board) pairs, all with the same board size.
+        rng: numpy Generator.
+
+    Returns:
+        (len(hands), bins) uint8 counts, each row summing to `runouts`.
+    """
+    if runouts > 255:
+        raise ValueError("runouts must fit in uint8 counts (<= 255)")
+    rng = rng if rng is not None else np.random.default_rng()
+    n = len(hands)
+    board_size = len(hands[0][1])
+    to_deal = 5 - board_size
+    live = 50 - board_size
+    needed = to_deal + 2 * opponents
+    if needed > live:
+        raise ValueError(f"{opponents} opponents need {needed} cards; only {live} are left")
+
+    holes = np.array([hole for hole, _ in hands], dtype=np.int64)
+    boards = np.array([board for _, board in hands], dtype=np.int64).reshape(n, board_size)
+    decks = np.array([[c for c in FULL_DECK if c not in hole and c not in board]
+                      for hole, board in hands], dtype=np.int64)
+
+    rows = np.repeat(np.arange(n), runouts)
+    dealt = decks[rows[:, None], partial_shuffle_batch(np.arange(live), n * runouts, needed, rng)]
+    full_boards = np.hstack([boards[rows], dealt[:, :to_deal]])             # (n*runouts, 5)
+    hero = evaluate_batch(np.hstack([holes[rows], full_boards]))
+    villains = dealt[:, to_deal:].reshape(n * runouts * opponents, 2)
+    villain = evaluate_batch(np.hstack([
+        villains, np.repeat(full_boards, opponents, axis=0)])).reshape(n * runouts, opponents)
+
+    share = (hero[:, None] < villain) + 0.5 * (hero[:, None] == villain)  # Lower rank wins
+    equity = share.mean(axis=1).reshape(n, runouts)
+    if to_deal == 0:
+        equity[:] = equity.mean(axis=1, keepdims=True)
+    which = np.minimum((equity * bins).astype(np.intp), bins - 1)
+    counts = np.bincount((np.arange(n)[:, None] * bins + which).ravel(), minlength=n * bins)
+    return counts.reshape(n, bins).astype(np.uint8)
+
+
+def _histogram_chunk(job) -> str:
+    """Worker entry point: histograms (+ class sizes) for canonical indices [start, stop)."""
+    board_size, start, stop, params, path = job
+    hand_indexer = _street_indexer(board_size)
+    rng = np.random.default_rng([params['seed'], board_size, start])
+    out = np.empty((stop - start, params['bins'] + 1), dtype=np.uint8)
+    batch = 512
+    for lo in range(start, stop, batch):
+        hi = min(lo + batch, stop)
+        hands = []
+        for i in range(lo, hi):
+            rounds = hand_indexer.unindex(i)
+            hands.append((rounds[0], rounds[1] if board_size else []))
+        out[lo - start:hi - start, :-1] = equity_histograms(
+            hands, params['bins'], params['runouts'], params['opponents'], rng)
+        out[lo - start:hi - start, -1] = [class_size(hole, board) for hole, board in hands]
+    _save_atomic(path, out)
+    return path
+
+
+def compute_histograms(street: str, directory: str = None, bins: int = 20, runouts: int = None,
+                       opponents: int = 22, chunk_size: int = 16384, workers: int = None,
+                       seed: int = 0, log: Callable = print) -> List[str]:
+    """
+    Histograms for every canonical hand of a street, as checkpoint files.
+
+    Each chunk of `chunk_size` canonical indices is one file, written
+    atomically; chunks already on disk are skipped, so rerunning with the
+    same parameters resumes an interrupted build. Different parameters in
+    an existing checkpoint directory raise ValueError.
+
+    Returns:
+        The chunk paths in index order. Each holds a (rows, bins + 1) uint8
+        array: the histogram, then the hand's class size.
+    """
+    board_size = STREETS[street]
+    runouts = runouts or DEFAULT_RUNOUTS[street]
+    directory = directory or default_directory()
+    checkpoint = os.path.join(directory, f"histograms_{street}")
+    os.makedirs(checkpoint, exist_ok=True)
+    params = {'bins': bins, 'runouts': runouts, 'opponents': opponents, 'seed': seed,
+              'chunk_size': chunk_size, 'version': ARTIFACT_VERSION}
+    params_path = os.path.join(checkpoint, "params.json")
+    if os.path.exists(params_path):
+        with open(params_path) as f:
+            existing = json.load(f)
+        if existing != params:
+            raise ValueError(f"{checkpoint} holds histograms built with {existing}; "
+                             f"delete it or pass the same parameters")
+    else:
+        with open(params_path, "w") as f:
+            json.dump(params, f)
+
+    size = _street_indexer(board_size).size
+    jobs, paths = [], []
+    for start in range(0, size, chunk_size):
+        path = os.path.join(checkpoint, f"chunk_{start // chunk_size:06d}.npy")
+        paths.append(path)
+        if not os.path.exists(path):
+            jobs.append((board_size, start, min(start + chunk_size, size), params, path))
+    log(f"{street}: {size:,} canonical hands, {len(paths) - len(jobs)}/{len(paths)} "
+        f"chunks already done")
+
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+
+    def report(results):
+        for done, _ in enumerate(results, 1):
+            elapsed = time.perf_counter() - start_time
+            log(f"{street}: chunk {done}/{len(jobs)} "
+                f"({elapsed:.0f}s, ~{elapsed / done * (len(jobs) - done):.0f}s left)")
+
+    if workers == 1 or len(jobs) <= 1:
+        report(map(_histogram_chunk, jobs))
+    else:
+        # The pool is only needed here; importing it eagerly slows every caller
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            report(pool.map(_histogram_chunk, jobs))
+    return paths
+
+
+# ===== CLUSTERING =====
+
+def _cdfs(counts: np.ndarray) -> np.ndarray:
+    """Histogram counts -> CDFs without the final (always 1) column, float32."""
+    cdf = np.cumsum(counts, axis=1, dtype=np.float32)
+    return cdf[:, :-1] / cdf[:, -1:]
+
+
+def _distances(cdfs: np.ndarray, centers: np.ndarray, batch: int = 2048) -> np.ndarray:
+    """(n, k) earth mover's distances, in bins, between CDF rows and centers."""
+    out = np.empty((len(cdfs), len(centers)), dtype=np.float32)
+    for lo in range(0, len(cdfs), batch):
+        out[lo:lo + batch] = np.abs(cdfs[lo:lo + batch, None, :] - centers[None]).sum(axis=2)
+    return out
+
+
+def kmeans_emd(cdfs: np.ndarray, k: int, weights: np.ndarray = None, iterations: int = 25,
+               seed: int = 0) -> np.ndarray:
+    """
+    Weighted k-means on CDF rows under the earth mover's distance.
+
+    Seeds with k-means++, then alternates assigning each row to its nearest
+    center (EMD = L1 between CDFs) and moving each center to the weighted
+    mean of its rows, until no row changes cluster. Empty clusters are
+    reseeded at the row contributing the most error.
+
+    Returns:
+        (k, bins - 1) float32 centers, as CDFs.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(cdfs)
+    weights = np.ones(n) if weights is None else np.asarray(weights, dtype=np.float64)
+    k = min(k, n)
+
+    centers = np.empty((k, cdfs.shape[1]), dtype=np.float32)
+    centers[0] = cdfs[rng.choice(n, p=weights / weights.sum())]
+    nearest = _distances(cdfs, centers[:1])[:, 0]
+    for j in range(1, k):
+        p = weights * nearest.astype(np.float64) ** 2
+        pick = rng.choice(n, p=p / p.sum()) if p.sum() > 0 else rng.integers(n)
+        centers[j] = cdfs[pick]
+        nearest = np.minimum(nearest, _distances(cdfs, centers[j:j + 1])[:, 0])
+
+    labels = None
+    for _ in range(iterations):
+        distances = _distances(cdfs, centers)
+        new_labels = distances.argmin(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        total = np.bincount(labels, weights=weights, minlength=k)
+        for col in range(cdfs.shape[1]):
+            sums = np.bincount(labels, weights=weights * cdfs[:, col], minlength=k)
+            np.divide(sums, total, out=sums, where=total > 0)
+            centers[total > 0, col] = sums[total > 0]
+        error = weights * distances[np.arange(n), labels]
+        for j in np.nonzero(total == 0)[0]:
+            worst = int(error.argmax())
+            centers[j] = cdfs[worst]
+            error[worst] = 0
+    return centers
+
+
+def _mean_equity(cdf_centers: np.ndarray) -> np.ndarray:
+    """Mean equity of each center, from its CDF over equal-width bins."""
+    bins = cdf_centers.shape[1] + 1
+    return (bins - cdf_centers.sum(axis=1)) / bins - 0.5 / bins
+
+
+# ===== PIPELINE =====
+
+def build_street(street: str, buckets: int = 200, directory: str = None, bins: int = 20,
+                 runouts: int = None, opponents: int = 22, chunk_size: int = 16384,
+                 workers: int = None, seed: int = 0, fit_sample: int = 200_000,
+                 iterations: int = 25, log: Callable = print) -> Dict:
+    """
+    Build (or resume building) one street's bucket artifact.
+
+    Computes the histograms (compute_histograms), fits kmeans_emd on up to
+    `fit_sample` hands drawn from every chunk, assigns every canonical hand
+    to its nearest center, and writes buckets_<street>.npy and .json.
+
+    Returns:
+        The JSON description: street, buckets, parameters, per-bucket mean
+        equity and share of all deals, and build time.
+    """
+    start_time = time.perf_counter()
+    runouts = runouts or DEFAULT_RUNOUTS[street]
+    directory = directory or default_directory()
+    paths = compute_histograms(street, directory, bins, runouts, opponents, chunk_size,
+                               workers, seed, log)
+    chunks = [np.load(path, mmap_mode='r') for path in paths]
+    size = sum(len(c) for c in chunks)
+
+    # Fit on a sample drawn evenly across chunks (streets can be too big to load whole)
+    rng = np.random.default_rng(seed)
+    fraction = min(1.0, fit_sample / size)
+    sample = []
+    for chunk in chunks:
+        take = len(chunk) if fraction == 1.0 else rng.binomial(len(chunk), fraction)
+        rows = np.sort(rng.choice(len(chunk), take, replace=False))
+        sample.append(np.asarray(chunk[rows]))
+    sample = np.concatenate(sample)
+    log(f"{street}: fitting {buckets} buckets on {len(sample):,} hands")
+    centers = kmeans_emd(_cdfs(sample[:, :-1]), buckets, sample[:, -1], iterations, seed)
+
+    # Renumber buckets weakest to strongest
+    order = np.argsort(_mean_equity(centers))
+    centers = centers[order]
+    dtype = np.uint8 if len(centers) <= 256 else np.uint16
+
+    os.makedirs(directory, exist_ok=True)
+    path = _artifact_path(directory, street)
+    tmp = path + ".tmp"
+    out = np.lib.format.open_memmap(tmp, mode='w+', dtype=dtype, shape=(size,))
+    deals = np.zeros(len(centers))
+    offset = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        labels = _distances(_cdfs(chunk[:, :-1]), centers).argmin(axis=1)
+        out[offset:offset + len(chunk)] = labels
+        deals += np.bincount(labels, weights=chunk[:, -1], minlength=len(centers))
+        offset += len(chunk)
+    out.flush()
+    del out
+    os.replace(tmp, path)
+
+    info = {
+        'version': ARTIFACT_VERSION, 'street': street, 'board_size': STREETS[street],
+        'canonical_hands': size, 'buckets': len(centers), 'bins': bins, 'runouts': runouts,
+        'opponents': opponents, 'seed': seed, 'fit_sample': len(sample),
+        'bucket_equity': [round(float(e), 4) for e in _mean_equity(centers)],
+        'bucket_share': [round(float(d), 6) for d in deals / deals.sum()],
+        'build_seconds': round(time.perf_counter() - start_time, 1),
+    }
+    with open(_info_path(directory, street), "w") as f:
+        json.dump(info, f, indent=1)
+    log(f"{street}: wrote {path} ({len(centers)} buckets, {info['build_seconds']}s)")
+    return info
+
+
+# ===== LOOKUP =====
+
+class CardAbstraction:
+    """
+    Bucket lookups from built artifacts, memory-mapped on first use.
+
+    Example usage:
+        abstraction = CardAbstraction()
+        bucket = abstraction.bucket(observation.hole_cards, observation.community_cards)
+        if bucket is not None:
+            strategy = self.policy[observation.stage][bucket]
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or default_directory()
+        self._tables = {}  # board size -> (bucket array, info), or None if not built
+
+    def _table(self, board_size: int):
+        if board_size not in self._tables:
+            street = next(s for s, n in STREETS.items() if n == board_size)
+            path = _artifact_path(self.directory, street)
+            if os.path.exists(path):
+                with open(_info_path(self.directory, street)) as f:
+                    info = json.load(f)
+                self._tables[board_size] = (np.load(path, mmap_mode='r'), info)
+            else:
+                self._tables[board_size] = None
+        return self._tables[board_size]
+
+    def available(self) -> List[str]:
+        """Streets with a built artifact."""
+        return [s for s, n in STREETS.items() if self._table(n) is not None]
+
+    def info(self, street: str) -> Optional[Dict]:
+        """A street's build description (see build_street), or None if not built."""
+        table = self._table(STREETS[street])
+        return table[1] if table is not None else None
+
+    def bucket(self, hole_cards: List[int], board: List[int] = ()) -> Optional[int]:
+        """Bucket (0 = weakest) of a hand on a 0, 3, 4 or 5 card board, or None if not built."""
+        table = self._table(len(board))
+        if table is None:
+            return None
+        return int(table[0][canonical_index(hole_cards, board)])
+
+    def bucket_equity(self, street: str, bucket: int) -> float:
+        """Mean equity against a random hand of a bucket's hands."""
+        return self.info(street)['bucket_equity'][bucket]
+
+
+def shared_abstraction() -> CardAbstraction:
+    """The process-wide CardAbstraction over default_directory()."""
+    global _shared
+    if _shared is None:
+        _shared = CardAbstraction()
+    return _shared
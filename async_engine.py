@@ -0,0 +1,111 @@
+"""
+Asyncio engine mode: many tables on one event loop, async and remote bots.
+
+The betting logic is the same generator-based engine as game_engine.py;
+this module only changes how decision requests are answered. Bots may
+implement `async def make_decision`, which is awaited with a per-decision
+time budget; when the budget runs out (or a remote bot fails) the seat
+auto-checks, or folds if it faces a bet. Plain synchronous bots are called
+inline as usual.
+
+    results = asyncio.run(run_tables_async(tables, num_hands=100, decision_timeout=0.5))
+"""
+import asyncio
+import inspect
+import random
+
+from time import perf_counter
+
+from display import NullSink
+from game_engine import _tournament_steps
+from profiling import TimedSink
+from rules import validate_action
+
+
+def default_action(observation):
+    """What a seat does when it runs out of time: check if free, else fold."""
+    return validate_action(observation.legal_actions(), "check", 0)
+
+
+async def decide(player, observation, decision_timeout=None, display=None):
+    """Get one decision from a sync or async bot, enforcing the time budget."""
+    decision = player.make_decision(observation)
+    if not inspect.isawaitable(decision):
+        return decision
+    try:
+        return await asyncio.wait_for(decision, decision_timeout)
+    except asyncio.TimeoutError:
+        reason = f"timed out after {decision_timeout}s"
+    except (ConnectionError, OSError, ValueError) as e:
+        reason = f"failed ({e})"
+    action = default_action(observation)
+    if display is not None:
+        display.message(f"{player.name} {reason}; auto-{action[0]}.")
+    return action
+
+
+async def play_tournament_async(players, num_hands, seed=None, display=None,
+                                decision_timeout=1.0, recorder=None, stats=None,
+                                tracker=None):
+    """
+    Async counterpart of game_engine.run_tournament.
+
+    Awaiting bots yields the event loop, so other tables keep playing while
+    this one waits on a slow or remote bot. With `stats`, decision latency
+    is measured as seen by the table, including time spent waiting.
+    """
+    if display is None:
+        display = NullSink()
+    if stats is not None:
+        display = TimedSink(display, stats)
+    steps = _tournament_steps(players, num_hands, seed, display, recorder, stats, tracker)
+    try:
+        request = next(steps)
+        while True:
+            player, observation = request
+            if stats is None:
+                decision = await decide(player, observation, decision_timeout, display)
+            else:
+                start = perf_counter()
+                decision = await decide(player, observation, decision_timeout, display)
+                stats.add_decision(player.name, perf_counter() - start)
+            request = steps.send(decision)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def run_tables_async(tables, num_hands, seed=None, display=None, decision_timeout=1.0):
+    """
+    Play every table concurrently on the running event loop.
+
+    Returns one run_tournament-style result dict per table.
+    """
+    rng = random.Random(seed)
+    return await asyncio.gather(*[
+        play_tournament_async(players, num_hands, rng.getrandbits(32), display, decision_timeout)
+        for players in tables
+    ])
+
+
+async def accept_remote_bots(count, host="127.0.0.1", port=0, on_listening=None):
+    """
+    Listen for `count` bots dialing in (python bot_protocol.py ... --connect
+    host:port) and return them as RemoteBot seats.
+
+    Args:
+        on_listening: Optional callback given the bound (host, port), e.g. to
+            launch the bot processes once the port is known.
+    """
+    from bots.RemoteBot import RemoteBot
+
+    connected = asyncio.Queue()
+
+    async def on_connect(reader, writer):
+        await connected.put(await RemoteBot.handshake(reader, writer))
+
+    server = await asyncio.start_server(on_connect, host, port)
+    if on_listening is not None:
+        on_listening(server.sockets[0].getsockname()[:2])
+    bots = [await connected.get() for _ in range(count)]
+    server.close()
+    return bots
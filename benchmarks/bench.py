@@ -0,0 +1,495 @@
+"""
+Performance benchmark suite with stored baselines.
+
+Each benchmark times one workload and reports seconds per unit (per hand,
+per decision, per action...), keeping the best of several repeats along
+with a noise estimate (how far the median repeat is above the best).
+Results can be saved as a baseline and later runs compared against it; any
+benchmark slower than the baseline by more than its tolerance is reported
+as a regression and the script exits non-zero, so it can gate CI. The
+tolerance is --threshold plus twice the larger of the two runs' noise, and
+at least --fast-threshold for benchmarks under 10us per unit, whose timings
+swing with cache and scheduler effects.
+
+    python benchmarks/bench.py                        # run and compare to the baseline
+    python benchmarks/bench.py --save                 # record a new baseline
+    python benchmarks/bench.py -k evaluator -k hand   # only matching benchmarks
+
+Baselines are only meaningful on the machine that recorded them; the
+baseline file stores a machine description and a mismatch is reported.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from treys import Evaluator  # noqa: E402
+
+from bots.Coyote import Coyote  # noqa: E402
+from deck import FULL_DECK, FastDeck, deal_batch  # noqa: E402
+from display import NullSink  # noqa: E402
+from game_engine import _tournament_steps, play_hand, run_betting_round, run_tables  # noqa: E402
+from game_state import GameState  # noqa: E402
+from hand_evaluator import evaluate, evaluate_batch, load_tables  # noqa: E402
+from mtt import Tournament, field  # noqa: E402
+from pot import build_pots, settle_pots  # noqa: E402
+from rules import legal_actions, validate_action  # noqa: E402
+from search_state import SearchState, random_policy  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+NAMES = ("Alice", "Bob", "Charlie", "David", "Erika", "Frank")
+FAST = 10e-6  # Seconds per unit below which --fast-threshold applies
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str, unit: str):
+    """Register fn() -> (seconds, units) under `name`."""
+    def register(fn):
+        BENCHMARKS[name] = (fn, unit)
+        return fn
+    return register
+
+
+def machine() -> str:
+    return f"{platform.machine()} {platform.processor() or ''} {os.cpu_count()} cpus, " \
+           f"{platform.python_implementation()} {platform.python_version()}".replace("  ", " ")
+
+
+def _seven_card_hands(n: int, seed: int = 0):
+    holes, boards = deal_batch(n, 1, seed=seed)
+    return [list(h[0]) + list(b) for h, b in zip(holes.tolist(), boards.tolist())]
+
+
+def _observations_by_stage(per_stage: int = 200, seed: int = 0):
+    """Real decision points from seeded Coyote tournaments, grouped by stage."""
+    by_stage = {"pre-flop": [], "flop": [], "turn": [], "river": []}
+    rng = random.Random(seed)
+    while min(len(v) for v in by_stage.values()) < per_stage:
+        players = [Coyote(name=n) for n in NAMES[:5]]
+        steps = _tournament_steps(players, 50, rng.getrandbits(32), NullSink())
+        try:
+            player, observation = next(steps)
+            while True:
+                by_stage[observation.stage].append((player, observation))
+                player, observation = steps.send(player.make_decision(observation))
+        except StopIteration:
+            pass
+    return {stage: obs[:per_stage] for stage, obs in by_stage.items()}
+
+
+# ===== EVALUATOR =====
+
+@benchmark("evaluator.treys_7card", "hand")
+def bench_treys():
+    evaluator = Evaluator()
+    hands = _seven_card_hands(20000)
+    start = time.perf_counter()
+    for cards in hands:
+        evaluator.evaluate(cards[:2], cards[2:])
+    return time.perf_counter() - start, len(hands)
+
+
+@benchmark("evaluator.lookup_7card", "hand")
+def bench_lookup():
+    load_tables()
+    hands = _seven_card_hands(100000)
+    start = time.perf_counter()
+    for cards in hands:
+        evaluate(cards)
+    return time.perf_counter() - start, len(hands)
+
+
+@benchmark("evaluator.lookup_batch", "hand")
+def bench_batch():
+    import numpy as np
+    load_tables()
+    cards = np.array(_seven_card_hands(200000), dtype=np.int64)
+    start = time.perf_counter()
+    evaluate_batch(cards)
+    return time.perf_counter() - start, len(cards)
+
+
+# ===== BOTS =====
+
+def _bench_coyote(stage: str):
+    decisions = _observations_by_stage()[stage]
+    players = {id(player): player for player, _ in decisions}.values()
+    elapsed = 0.0
+    for _ in range(5):
+        # Each pass must classify hands afresh, not replay HandCacheMixin hits
+        for player in players:
+            player.__dict__.pop('_hand_cache', None)
+        start = time.perf_counter()
+        for player, observation in decisions:
+            player.make_decision(observation)
+        elapsed += time.perf_counter() - start
+    return elapsed, 5 * len(decisions)
+
+
+for _stage in ("pre-flop", "flop", "turn", "river"):
+    benchmark(f"coyote.decision.{_stage}", "decision")(
+        lambda stage=_stage: _bench_coyote(stage))
+
+
+# ===== ENGINE =====
+
+@benchmark("engine.betting_round", "action")
+def bench_betting_round():
+    deck = FastDeck()
+    display = NullSink()
+    elapsed = 0.0
+    actions = 0
+    for seed in range(2000):
+        players = [Coyote(name=n) for n in NAMES]
+        deck.reset(seed)
+        for p in players:
+            p.hand = deck.draw(2)
+        game_state = GameState(players)
+        game_state.dealer_index = seed % len(players)
+        start = time.perf_counter()
+        run_betting_round(game_state, display)
+        elapsed += time.perf_counter() - start
+        actions += len(game_state.action_history)
+    return elapsed, actions
+
+
+@benchmark("engine.play_hand", "hand")
+def bench_play_hand():
+    deck = FastDeck()
+    display = NullSink()
+    hands = 3000
+    elapsed = 0.0
+    for seed in range(hands):
+        players = [Coyote(name=n) for n in NAMES]
+        start = time.perf_counter()
+        play_hand(players, seed % len(players), display=display, seed=seed, deck=deck)
+        elapsed += time.perf_counter() - start
+    return elapsed, hands
+
+
+@benchmark("engine.pot_settlement_10way", "hand")
+def bench_pots():
+    rng = random.Random(0)
+    cases = []
+    for _ in range(1000):
+        contributions = [rng.randint(1, 5000) for _ in range(10)]
+        folded = [rng.random() < 0.3 for _ in range(10)]
+        folded[rng.randrange(10)] = False
+        ranks = {s: rng.randint(1, 4) for s in range(10) if not folded[s]}
+        cases.append((contributions, folded, ranks))
+    start = time.perf_counter()
+    for _ in range(20):
+        for contributions, folded, ranks in cases:
+            payouts = settle_pots(build_pots(contributions, folded), ranks, 0, 10)
+    elapsed = time.perf_counter() - start
+    # Chips must be conserved on every case, not just the timed ones
+    for contributions, folded, ranks in cases:
+        payouts = settle_pots(build_pots(contributions, folded), ranks, 0, 10)
+        assert sum(payouts.values()) == sum(contributions)
+    return elapsed, 20 * len(cases)
+
+
+@benchmark("rules.legal_and_validate", "decision")
+def bench_rules():
+    rng = random.Random(0)
+    cases = [(rng.randint(0, 2000), rng.choice((0, 10, 20, 60)), rng.choice((20, 60, 200)),
+              rng.choice(("fold", "check", "call", "raise", "all-in")), rng.randint(0, 500))
+             for _ in range(1000)]
+    start = time.perf_counter()
+    for _ in range(50):
+        for stack, bet, current_bet, action, amount in cases:
+            validate_action(legal_actions(stack + 1, bet, current_bet, 20), action, amount)
+    return time.perf_counter() - start, 50 * len(cases)
+
+
+@benchmark("engine.multi_table", "hand")
+def bench_multi_table():
+    tables = [[Coyote(name=n) for n in NAMES[:5]] for _ in range(100)]
+    start = time.perf_counter()
+    results = run_tables(tables, 50, seed=0)
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(r['hands_played'] for r in results)
+
+
+@benchmark("mtt.field_300", "hand")
+def bench_mtt():
+    start = time.perf_counter()
+    result = Tournament(field(Coyote, 300), seed=0).run()
+    return time.perf_counter() - start, result['hands_played']
+
+
+# ===== RANGES =====
+
+@benchmark("ranges.observe_and_equity", "decision")
+def bench_ranges():
+    from ranges import OpponentRanges, hand_vs_range
+    decisions = [d for stage in _observations_by_stage(50).values() for d in stage]
+    start = time.perf_counter()
+    for _, observation in decisions:
+        ranges = OpponentRanges().observe(observation)
+        for villain in ranges.live(observation).values():
+            hand_vs_range(observation.hole_cards, observation.community_cards, villain, seed=0)
+    return time.perf_counter() - start, len(decisions)
+
+
+def _postflop_spots(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    spots = []
+    for _ in range(n):
+        cards = rng.sample(FULL_DECK, 2 + rng.choice((3, 4, 5)))
+        spots.append((cards[:2], cards[2:], rng.randint(1, 5)))
+    return spots
+
+
+@benchmark("isomorphism.canonical_index", "hand")
+def bench_canonical_index():
+    from isomorphism import canonical_index
+    spots = _postflop_spots(5000)
+    start = time.perf_counter()
+    for hole, board, _ in spots:
+        canonical_index(hole, board)
+    return time.perf_counter() - start, len(spots)
+
+
+@benchmark("equity_cache.miss", "query")
+def bench_equity_cache_miss():
+    from equity_cache import EquityCache
+    cache = EquityCache(":memory:")
+    spots = _postflop_spots(200)
+    start = time.perf_counter()
+    for hole, board, opponents in spots:
+        cache.equity(hole, board, opponents)
+    return time.perf_counter() - start, len(spots)
+
+
+@benchmark("equity_cache.hit", "query")
+def bench_equity_cache_hit():
+    from equity_cache import EquityCache
+    cache = EquityCache(":memory:", num_samples=100)
+    spots = _postflop_spots(2000)
+    for hole, board, opponents in spots:
+        cache.equity(hole, board, opponents)
+    start = time.perf_counter()
+    for hole, board, opponents in spots * 10:
+        cache.equity(hole, board, opponents)
+    return time.perf_counter() - start, 10 * len(spots)
+
+
+@benchmark("abstraction.flop_histograms", "hand")
+def bench_flop_histograms():
+    import numpy as np
+    from abstraction import equity_histograms
+    hands = [(hole, board) for hole, board, _ in _postflop_spots(1000) if len(board) == 3][:256]
+    start = time.perf_counter()
+    equity_histograms(hands, rng=np.random.default_rng(0))
+    return time.perf_counter() - start, len(hands)
+
+
+# ===== SEARCH =====
+
+def _search_state(seats: int, seed: int = 0):
+    cards = list(FULL_DECK)
+    random.Random(seed).shuffle(cards)
+    return SearchState([1000] * seats, [cards[2 * i:2 * i + 2] for i in range(seats)],
+                       deck=cards[2 * seats:])
+
+
+@benchmark("search.apply_undo", "step")
+def bench_apply_undo():
+    state = _search_state(6)
+    legal = state.legal_actions()
+    move = ("call", legal.to_call)
+    start = time.perf_counter()
+    for _ in range(100000):
+        state.apply(*move)
+        state.undo()
+    return time.perf_counter() - start, 100000
+
+
+@benchmark("search.rollout_checkdown_6max", "rollout")
+def bench_checkdown():
+    state = _search_state(6)
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(20000):
+        state.rollout(rng)
+    return time.perf_counter() - start, 20000
+
+
+@benchmark("search.rollout_random_policy_6max", "rollout")
+def bench_policy_rollout():
+    state = _search_state(6)
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(5000):
+        state.rollout(rng, random_policy)
+    return time.perf_counter() - start, 5000
+
+
+# ===== STARTUP =====
+
+# Modules a headless worker must not load just by importing the engine
+HEAVY_MODULES = ("rich", "numpy", "bots.Coyote")
+
+_STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(elapsed, *[m for m in {heavy!r} if m in sys.modules])
+"""
+
+
+def _time_fresh_process(code: str, runs: int = 10, check_heavy: bool = False):
+    """Time `code` in fresh interpreters (after one warm-up run that writes .pyc files)."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    script = _STARTUP_SCRIPT.format(code=code, heavy=HEAVY_MODULES)
+    total = 0.0
+    for i in range(runs + 1):
+        out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, check=True,
+                             capture_output=True, text=True).stdout.split()
+        if check_heavy and out[1:]:
+            raise AssertionError(f"{code!r} imported {', '.join(out[1:])}")
+        if i:
+            total += float(out[0])
+    return total, runs
+
+
+@benchmark("startup.import_engine", "import")
+def bench_import_engine():
+    return _time_fresh_process("import game_engine", check_heavy=True)
+
+
+@benchmark("startup.first_hand", "process")
+def bench_first_hand():
+    return _time_fresh_process(
+        "from bots import load_bot\n"
+        "from game_engine import play_hand\n"
+        "from display import NullSink\n"
+        "Coyote = load_bot('Coyote')\n"
+        "play_hand([Coyote(name=n) for n in 'ABCDEF'], 0, display=NullSink(), seed=1)")
+
+
+# ===== RUNNER =====
+
+def run(selected, repeat: int):
+    """
+    Run benchmarks, `repeat` times each.
+
+    Returns:
+        {name: {'seconds_per_unit', 'noise', 'unit'}}: the best repeat, and
+        the median repeat's excess over it as a fraction of the best.
+    """
+    results = {}
+    for name in selected:
+        fn, unit = BENCHMARKS[name]
+        times = [seconds / units for seconds, units in (fn() for _ in range(repeat))]
+        best = min(times)
+        noise = statistics.median(times) / best - 1
+        results[name] = {'seconds_per_unit': best, 'noise': noise, 'unit': unit}
+        print(f"{name:<32}{_format_time(best):>12} / {unit:<9} noise {noise:.1%}", flush=True)
+    return results
+
+
+def tolerance(result, base, threshold: float, fast_threshold: float) -> float:
+    """Slowdown (fraction) beyond which `result` counts as a regression from `base`."""
+    noise = max(result.get('noise', 0.0), base.get('noise', 0.0))
+    allowed = threshold + 2 * noise
+    if base['seconds_per_unit'] < FAST:
+        allowed = max(allowed, fast_threshold)
+    return allowed
+
+
+def compare(results, baseline, threshold: float, fast_threshold: float):
+    """Print a comparison table; returns the names that regressed beyond their tolerance."""
+    regressions = []
+    print(f"\n{'benchmark':<32}{'baseline':>12}{'current':>12}{'change':>10}{'allowed':>10}")
+    for name, r in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<32}{'-':>12}{_format_time(r['seconds_per_unit']):>12}{'new':>10}")
+            continue
+        change = r['seconds_per_unit'] / base['seconds_per_unit'] - 1
+        allowed = tolerance(r, base, threshold, fast_threshold)
+        flag = ""
+        if change > allowed:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<32}{_format_time(base['seconds_per_unit']):>12}"
+              f"{_format_time(r['seconds_per_unit']):>12}{change:>+10.1%}{allowed:>+10.0%}{flag}")
+    return regressions
+
+
+def _format_time(seconds: float) -> str:
+    for scale, suffix in ((1, "s"), (1e-3, "ms"), (1e-6, "us")):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {suffix}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Engine and bot benchmark suite")
+    parser.add_argument("-k", dest="patterns", action="append", default=[],
+                        help="Only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Repeats per benchmark (best is kept; at least 5 for a usable noise estimate)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Fail when a benchmark is this much slower than baseline (0.25 = 25%%), "
+                             "plus twice its measured noise")
+    parser.add_argument("--fast-threshold", type=float, default=0.5,
+                        help="Minimum tolerance for benchmarks under 10us per unit")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    if args.list:
+        for name, (_, unit) in BENCHMARKS.items():
+            print(f"{name} (per {unit})")
+        return 0
+
+    selected = [n for n in BENCHMARKS if not args.patterns or any(p in n for p in args.patterns)]
+    print(f"Machine: {machine()}\n")
+    results = run(selected, args.repeat)
+
+    if args.save:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                stored = json.load(f).get('results', {})
+        stored.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump({'machine': machine(), 'results': stored}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline yet; run with --save to record one.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('machine') != machine():
+        print(f"\nNote: baseline was recorded on a different machine ({baseline.get('machine')})")
+    regressions = compare(results, baseline['results'], args.threshold, args.fast_threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Line-delimited JSON protocol between the table and out-of-process bots.
+
+Table -> bot:  {"id": 7, "observation": {...Observation fields...}}
+Bot -> table:  {"id": 7, "action": "call", "amount": 20}
+
+The table may also send {"id": 0, "hello": true} and expects
+{"id": 0, "name": "<bot name>"} back, which lets bots that dial in over TCP
+identify themselves.
+
+Run any bot class as a separate process (stdin/stdout by default):
+
+    python bot_protocol.py Coyote --name Alice
+    python bot_protocol.py bots.Coyote:Coyote --name Alice --connect 127.0.0.1:9999
+"""
+import argparse
+import json
+import socket
+import sys
+import time
+
+from observation import Observation
+
+
+def encode_observation(observation: Observation) -> dict:
+    data = observation._asdict()
+    data['action_history'] = [dict(a) for a in observation.action_history]
+    return data
+
+
+def decode_observation(data: dict) -> Observation:
+    fields = dict(data)
+    for key in ('hole_cards', 'community_cards', 'names', 'stacks', 'bets', 'folded', 'acted'):
+        if key in fields:
+            fields[key] = tuple(fields[key])
+    fields['action_history'] = tuple(fields['action_history'])
+    return Observation(**fields)
+
+
+def handle_message(bot, message: dict) -> dict:
+    """Answer one table message with `bot`."""
+    if message.get('hello'):
+        return {'id': message['id'], 'name': bot.name}
+    observation = decode_observation(message['observation'])
+    # Keep the bot's own attributes in sync for bots that read self.chips / self.hand
+    bot.chips = observation.chips
+    bot.hand = list(observation.hole_cards)
+    bot.current_bet = observation.bets[observation.seat]
+    action, amount = bot.make_decision(observation)
+    return {'id': message['id'], 'action': action, 'amount': amount}
+
+
+def serve(bot, infile, outfile, delay: float = 0.0):
+    """Answer table messages from `infile` on `outfile` until EOF."""
+    for line in infile:
+        if not line.strip():
+            continue
+        if delay:
+            time.sleep(delay)  # Stand-in for a slow bot
+        reply = handle_message(bot, json.loads(line))
+        outfile.write(json.dumps(reply) + "\n")
+        outfile.flush()
+
+
+def load_bot_class(spec: str):
+    """Registered bot name ('Coyote') or 'package.module:ClassName' -> class."""
+    from bots import load_bot
+    return load_bot(spec)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a bot over the table protocol")
+    parser.add_argument("bot", help="Bot name (e.g. Coyote) or class as module:Class")
+    parser.add_argument("--name", default=None)
+    parser.add_argument("--connect", metavar="HOST:PORT", default=None,
+                        help="Dial a table server instead of using stdin/stdout")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="Sleep this many seconds per decision (to test time budgets)")
+    args = parser.parse_args(argv)
+
+    bot_class = load_bot_class(args.bot)
+    bot = bot_class(name=args.name) if args.name else bot_class()
+
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        with socket.create_connection((host, int(port))) as sock:
+            with sock.makefile("r") as infile, sock.makefile("w") as outfile:
+                serve(bot, infile, outfile, args.delay)
+    else:
+        serve(bot, sys.stdin, sys.stdout, args.delay)
+
+
+if __name__ == "__main__":
+    main()
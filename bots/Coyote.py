@@ -1,7 +1,19 @@
 from .ParentBot import ParentBot
 from treys import Card
 import random
-from itertools import combinations
+
+# treys rank class -> Coyote post-flop score (high card scores its top rank, 0-12)
+POSTFLOP_CLASS_SCORES = {
+    0: 100,  # Royal flush
+    1: 100,  # Straight flush
+    2: 95,   # Four of a kind
+    3: 92,   # Full house
+    4: 90,   # Flush
+    5: 80,   # Straight
+    6: 70,   # Three of a kind
+    7: 60,   # Two pair
+    8: 50,   # Pair
+}
 
 class Coyote(ParentBot):
     """
@@ -18,43 +30,34 @@ class Coyote(ParentBot):
         self.folded_hands = 0  # Track conservative behavior
 
 
-    def make_decision(self, game_state):
-        hole = self.hand
-        community = game_state.community_cards
-        stage = game_state.stage
-        pot = game_state.pot
-        to_call = game_state.to_call.get(self.name, 0)
-        min_raise = game_state.min_raise
-        stacks = game_state.active_player_stacks
-        action_hist = game_state.action_history
+    def make_decision(self, observation):
+        hole = list(observation.hole_cards)
+        community = list(observation.community_cards)
+        stage = observation.stage
+        pot = observation.pot
+        to_call = observation.amount_to_call
+        min_raise = observation.min_raise
+        action_hist = observation.action_history
 
-        # --- Pre-flop: favor high, connected cards, but avoid risking too much of stack ---
+        # --- Pre-flop: play hands with a fair share of equity, but avoid risking too much of stack ---
         if stage == "pre-flop":
-            ranks = [Card.get_rank_int(c) for c in hole]
-            gap = abs(ranks[0] - ranks[1])
-            high_card = max(ranks)
-            low_card = min(ranks)
-            pair = ranks[0] == ranks[1]
-            suited = Card.get_suit_int(hole[0]) == Card.get_suit_int(hole[1])
-
-            # Score: high cards, small gap, pair, suited
-            score = high_card * 2 + (12 - gap) + (10 if pair else 0) + (2 if suited else 0)
-            if low_card < 5:
-                score -= 4
+            num_opponents = max(1, observation.num_active - 1)
+            # Equity relative to a fair share of the pot (1.0 = average hand)
+            score = self._preflop_equity(hole, num_opponents) * (num_opponents + 1)
 
             risk_limit = 0.3 * self.chips
             if to_call > risk_limit:
                 return ("fold", 0)
 
             # Aggressive with high score
-            if score >= 22:
+            if score >= 0.95:
                 # Dynamic raise: 40% of stack or min_raise, whichever is higher
                 raise_amt = max(int(0.4 * self.chips), min_raise)
                 if to_call == 0:
                     return ("raise", raise_amt)
                 else:
                     return ("call", to_call)
-            elif score >= 18:
+            elif score >= 0.8:
                 if to_call > 0:
                     return ("call", to_call)
                 else:
@@ -64,34 +67,14 @@ class Coyote(ParentBot):
             else:
                 return ("fold", 0)
 
-        # --- Post-flop: simple hand evaluation without treys Evaluator ---
-        all_cards = hole + community
-        best_score = 0
-        for combo in combinations(all_cards, 5):
-            ranks = sorted([Card.get_rank_int(c) for c in combo], reverse=True)
-            unique_ranks = set(ranks)
-            is_pair = len(unique_ranks) == 4
-            is_two_pair = len(unique_ranks) == 3
-            is_trips = len(unique_ranks) == 3 and max(ranks.count(r) for r in unique_ranks) == 3
-            is_straight = max(ranks) - min(ranks) == 4 and len(unique_ranks) == 5
-            is_flush = len(set(Card.get_suit_int(c) for c in combo)) == 1
-            score = 0
-            if is_flush and is_straight:
-                score = 100
-            elif is_flush:
-                score = 90
-            elif is_straight:
-                score = 80
-            elif is_trips:
-                score = 70
-            elif is_two_pair:
-                score = 60
-            elif is_pair:
-                score = 50
-            else:
-                score = max(ranks)
-            if score > best_score:
-                best_score = score
+        # --- Post-flop: score the made hand from its lookup-table rank class ---
+        best_score = None
+        if len(community) >= 3:
+            # Memoized per (hole, board) and extended street to street (HandCacheMixin)
+            best_score = POSTFLOP_CLASS_SCORES.get(
+                self._classify_hand(observation.hole_cards, observation.community_cards)[1])
+        if best_score is None:
+            best_score = max(Card.get_rank_int(c) for c in hole + community)  # High card
 
         risk_limit = 0.4 * self.chips
         if to_call > risk_limit:
@@ -1,43 +1,132 @@
 from treys import Card
-from typing import Tuple, List, Dict, Any
+from typing import Tuple, List, Dict, Any, Optional
 from abc import ABC, abstractmethod
+from collections import deque
+from hand_evaluator import evaluate_keys, hand_keys, rank_class
+from preflop import preflop_equity
 
 
-class ParentBot(ABC):
+class HandCacheMixin:
+    """
+    Memoized post-flop hand classification for bots.
+
+    _classify_hand(hole, board) caches (rank, rank class) per exact
+    (hole, board) in a bounded LRU, so asking again in the same street is a
+    dict lookup. On the turn and river it starts from the previous street's
+    cached keys and adds only the new card, instead of re-scoring every card.
+    Set `hand_cache_size` on the class to change the bound.
+    """
+
+    hand_cache_size = 256
+
+    def _classify_hand(self, hole_cards: List, board: List) -> Tuple[int, int]:
+        """
+        (treys rank, treys rank class) of hole cards plus a 3-5 card board.
+
+        Example usage:
+            rank, hand_class = self._classify_hand(observation.hole_cards,
+                                                   observation.community_cards)
+            if hand_class <= 7:  # Two pair or better
+                return ('raise', observation.min_raise)
+        """
+        cache = self.__dict__.get('_hand_cache')
+        if cache is None:
+            cache = self._hand_cache = {}
+        if type(hole_cards) is not tuple:
+            hole_cards = tuple(hole_cards)
+        if type(board) is not tuple:
+            board = tuple(board)
+        key = (hole_cards, board)
+        entry = cache.pop(key, None)
+        if entry is None:
+            previous = cache.get((hole_cards, board[:-1])) if len(board) > 3 else None
+            cards = hole_cards + board
+            if previous is not None:
+                # Turn/river: extend the previous street's keys by the new card
+                card_rank_key, card_suit_key = hand_keys(board[-1:])
+                rank_key = previous[0] + card_rank_key
+                suit_key = previous[1] + card_suit_key
+            else:
+                rank_key, suit_key = hand_keys(cards)
+            rank = evaluate_keys(rank_key, suit_key, cards)
+            entry = (rank_key, suit_key, rank, rank_class(rank))
+            if len(cache) >= self.hand_cache_size:
+                del cache[next(iter(cache))]  # Least recently used
+        cache[key] = entry  # (Re)insert as most recently used
+        return entry[2], entry[3]
+
+
+class ParentBot(HandCacheMixin, ABC):
+    # Most recent entries kept in game_history
+    game_history_size = 1000
+    # equity_cache.EquityCache used by _equity; None means the process-wide shared cache
+    equity_cache = None
+    # abstraction.CardAbstraction used by _bucket; None means the shared default directory
+    card_abstraction = None
+
     def __init__(self, name="Unnamed Bot"):
         self.name = name
         self.hand = []
         self.chips = 1000  # Starting stack
         self.current_bet = 0
-        self.game_history = []  # For learning bots
+        self.game_history = deque(maxlen=self.game_history_size)  # For learning bots
+        self.session_stats = None  # Optional session_stats.SessionStats shared by the table
 
     def receive_cards(self, cards):
         """Assign starting hand to bot"""
         self.hand = cards
 
     @abstractmethod
-    def make_decision(self, game_state: Dict[str, Any]) -> str:
+    def make_decision(self, observation) -> Tuple[str, int]:
         """
-        Make a poker decision based on current game state.
-        
+        Make a poker decision based on what this seat can see.
+
         Args:
-            game_state: Dictionary containing all game information:
-                - 'hole_cards': Your two cards [card1, card2]
-                - 'community_cards': Board cards (0-5 cards)
-                - 'pot_size': Current pot amount
-                - 'current_bet': Amount you need to call
-                - 'min_raise': Minimum raise amount
-                - 'betting_round': 'preflop', 'flop', 'turn', or 'river'
-                - 'position': Your seat position (0=button, 1=small blind, etc.)
-                - 'action_history': List of actions this round
-                - 'opponent_stacks': Other players' chip counts
-                - 'previous_hands': History for learning (optional)
-        
+            observation: Read-only Observation snapshot (see observation.py):
+                - hole_cards: Your two cards (hand)
+                - community_cards: Board cards (0-5 cards)
+                - stage: 'pre-flop', 'flop', 'turn' or 'river'
+                - pot: Current pot amount
+                - current_bet / amount_to_call: Street bet, and what you owe
+                - min_raise, small_blind, big_blind
+                - names / stacks / bets / folded: Public per-seat info
+                - seat, position, dealer_index: Where you sit
+                - action_history: Public actions this hand
+                - to_call / player_stacks / active_player_stacks: dict views
+                - legal_actions(): Legal moves and raise range (see rules.py)
+                - to_vector(): Flat NumPy features for ML bots
+            Opponents' hole cards are never included, and nothing in the
+            observation can change the engine's state.
+
         Returns:
-            str: One of 'fold', 'call', 'check', 'raise', or 'all-in'
+            (action, amount): action is one of 'fold', 'call', 'check',
+            'raise' (amount = raise on top of the call), 'call and raise'
+            (minimum raise) or 'all-in'. Illegal moves are coerced to the
+            nearest legal one by rules.validate_action.
         """
         pass
 
+    def make_decisions_batch(self, observations: List) -> List[Tuple[str, int]]:
+        """
+        Decide for many observations at once (used by game_engine.run_tables).
+
+        Override this together with batch_key() in bots whose per-call cost
+        dominates, e.g. neural nets: run_tables hands one bot of each batch
+        key every pending decision for that key, possibly from other tables
+        and other bot instances, so a batched implementation must only rely
+        on the observations (each carries its seat's name and cards).
+
+        Default: one make_decision call per observation.
+        """
+        return [self.make_decision(observation) for observation in observations]
+
+    def batch_key(self):
+        """
+        Bots with equal keys get their pending decisions batched together.
+        Default: this instance only, so make_decision sees only its own seats.
+        """
+        return self
+
     # ===== HELPER FUNCTIONS FOR PARTICIPANTS =====
     # These are optional utilities to help guide bot development
 
@@ -87,6 +176,75 @@ class ParentBot(ABC):
         
         return (strength, description)
 
+    def _preflop_equity(self, hole_cards: List, num_opponents: int = 1) -> float:
+        """
+        Helper: Preflop equity (0-1) against random hands, from a precomputed table.
+        O(1): the 169-class table is loaded once, on first use.
+
+        Example usage:
+            equity = self._preflop_equity(self.hand, num_opponents=3)
+            if equity > 1.2 / (3 + 1):  # Well above a fair share of the pot
+                return ('raise', game_state.min_raise)
+        """
+        return preflop_equity(hole_cards, num_opponents)
+
+    def _equity(self, hole_cards: List, community_cards: List, num_opponents: int = 1) -> float:
+        """
+        Helper: Pot share (0-1) against random hands on any street.
+        Pre-flop reads the 169-class table; later streets go through the
+        persistent equity cache (equity_cache.py), which is shared with every
+        other bot and process, so a spot seen before is a lookup, not a
+        simulation.
+
+        Example usage:
+            equity = self._equity(observation.hole_cards, observation.community_cards,
+                                  num_opponents=observation.num_active - 1)
+            to_call = observation.amount_to_call
+            if equity > to_call / (observation.pot + to_call):  # Calling is +EV
+                return ('call', to_call)
+        """
+        if len(community_cards) < 3:
+            return preflop_equity(hole_cards, num_opponents)
+        cache = self.equity_cache
+        if cache is None:
+            from equity_cache import shared_cache  # Opens the SQLite file on first use
+            cache = shared_cache()
+        return cache.equity(hole_cards, community_cards, num_opponents)
+
+    def _board_texture(self, community_cards: List) -> Optional[Dict[str, Any]]:
+        """
+        Helper: Texture of the board (paired, monotone, rainbow, flush/straight
+        possible, ...), from a precomputed per-canonical-board table
+        (isomorphism.py). None before the flop.
+
+        Example usage:
+            texture = self._board_texture(observation.community_cards)
+            if texture and texture['flush_possible'] and hand_class > 4:
+                return ('check', 0)  # Weaker than a flush on a three-suited board
+        """
+        if len(community_cards) < 3:
+            return None
+        from isomorphism import board_texture  # Builds the texture table on first use
+        return board_texture(community_cards)
+
+    def _bucket(self, hole_cards: List, community_cards: List) -> Optional[int]:
+        """
+        Helper: Card-abstraction bucket of the hand on this street (0 = weakest),
+        or None when no bucket table has been built for the street
+        (scripts/build_abstraction.py). O(1): a canonical index and one read
+        from a memory-mapped array.
+
+        Example usage:
+            bucket = self._bucket(observation.hole_cards, observation.community_cards)
+            if bucket is not None:
+                action = self.policy[observation.stage][bucket]  # Learned per bucket
+        """
+        abstraction = self.card_abstraction
+        if abstraction is None:
+            from abstraction import shared_abstraction  # NumPy-backed; only learning bots pay
+            abstraction = shared_abstraction()
+        return abstraction.bucket(hole_cards, community_cards)
+
     def _simple_postflop_eval(self, hole_cards: List, community_cards: List) -> Tuple[int, str]:
         """
         Helper: Basic post-flop evaluation.
@@ -138,6 +296,40 @@ class ParentBot(ABC):
             'last_action': action_history[-1] if action_history else None
         }
 
+    def _opponent_stats(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Helper: Session statistics for a player (VPIP, PFR, 3-bet, aggression
+        factor, bb/100), or None when no SessionStats is attached or the
+        player hasn't finished a hand yet. O(1), unlike re-scanning histories.
+
+        Example usage:
+            stats = self._opponent_stats(observation.names[seat])
+            if stats and stats['hands'] > 50 and stats['vpip'] > 0.5:
+                return ('call', observation.amount_to_call)  # Loose player; call lighter
+        """
+        if self.session_stats is None:
+            return None
+        s = self.session_stats.get(name)
+        return s.summary() if s is not None else None
+
+    def _opponent_ranges(self, observation):
+        """
+        Helper: Hand ranges of this hand's opponents (ranges.OpponentRanges),
+        narrowed by every action seen so far. Call it once per decision; it
+        only processes what's new since the last call.
+
+        Example usage:
+            ranges = self._opponent_ranges(observation)
+            for name, villain in ranges.live(observation).items():
+                eq = hand_vs_range(observation.hole_cards,
+                                   observation.community_cards, villain)['equity']
+        """
+        tracker = self.__dict__.get('_ranges')
+        if tracker is None:
+            from ranges import OpponentRanges  # NumPy-backed; only range bots pay for it
+            tracker = self._ranges = OpponentRanges()
+        return tracker.observe(observation)
+
     # ===== UTILITY FUNCTIONS =====
 
     def _describe_hole_cards(self, hole_cards: List) -> str:
@@ -0,0 +1,76 @@
+from .ParentBot import ParentBot
+import asyncio
+import json
+import sys
+
+import bot_protocol
+from bot_protocol import encode_observation
+
+
+class RemoteBot(ParentBot):
+    """
+    Seat proxy for a bot running in another process.
+
+    Decisions are forwarded over a line-delimited JSON stream (see
+    bot_protocol.py) and awaited, so RemoteBot only works with the asyncio
+    engine (async_engine.py). Replies carry the request id; a reply that
+    arrives after its decision timed out is discarded rather than being
+    mistaken for the next answer. A malformed reply raises ValueError, so the
+    engine falls back to the seat's default action.
+    """
+
+    def __init__(self, name="Remote", reader=None, writer=None, process=None):
+        super().__init__(name=name)
+        self.reader = reader
+        self.writer = writer
+        self.process = process
+        self._next_id = 1
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def spawn(cls, name, bot_spec, *extra_args):
+        """
+        Start `python bot_protocol.py <bot_spec> --name <name>` and talk to it
+        over stdin/stdout. Returns once the process has answered the hello, so
+        start-up time doesn't count against the first decision's budget.
+        """
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, bot_protocol.__file__, bot_spec, "--name", name, *extra_args,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+        bot = await cls.handshake(process.stdout, process.stdin)
+        bot.process = process
+        return bot
+
+    @classmethod
+    async def handshake(cls, reader, writer):
+        """Wrap a fresh connection, asking the bot for its name."""
+        writer.write(b'{"id": 0, "hello": true}\n')
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        return cls(name=reply['name'], reader=reader, writer=writer)
+
+    async def make_decision(self, observation):
+        async with self._lock:
+            request_id = self._next_id
+            self._next_id += 1
+            message = {'id': request_id, 'observation': encode_observation(observation)}
+            self.writer.write((json.dumps(message) + "\n").encode())
+            await self.writer.drain()
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    raise ConnectionError(f"{self.name} disconnected")
+                reply = json.loads(line)  # Bad JSON raises ValueError too
+                if not isinstance(reply, dict):
+                    raise ValueError(f"{self.name} sent a reply that isn't an object: {reply!r}")
+                if reply.get('id') == request_id:
+                    if 'action' not in reply or 'amount' not in reply:
+                        raise ValueError(f"{self.name} sent a reply without action and amount")
+                    return reply['action'], reply['amount']
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()  # Make sure the bot actually sees EOF
+        if self.process is not None:
+            await self.process.wait()
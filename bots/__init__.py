@@ -0,0 +1,42 @@
+"""
+Bot registry.
+
+Each bot lives in its own module, bots/<Name>.py, defining a class of the
+same name (bots/Coyote.py -> Coyote). Bots are discovered by file name and
+only imported when asked for, so listing or naming bots costs nothing:
+
+    from bots import available_bots, load_bot
+    available_bots()               # ['Coyote']
+    Coyote = load_bot("Coyote")
+"""
+import importlib
+import os
+from typing import List
+
+# Modules in this package that are not playable bots
+_NOT_BOTS = {"ParentBot", "RemoteBot"}
+
+
+def available_bots() -> List[str]:
+    """Names of the bots under bots/, without importing any of them."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    return sorted(name[:-3] for name in os.listdir(directory)
+                  if name.endswith(".py") and not name.startswith("_")
+                  and name[:-3] not in _NOT_BOTS)
+
+
+def load_bot(name: str):
+    """
+    Import and return a bot class.
+
+    Args:
+        name: A registered bot name ('Coyote'), or 'package.module:Class'
+            for bots that live elsewhere.
+    """
+    if ":" in name:
+        module_name, _, class_name = name.partition(":")
+    else:
+        if name not in available_bots():
+            raise ValueError(f"Unknown bot {name!r}; available: {', '.join(available_bots())}")
+        module_name, class_name = f"{__name__}.{name}", name
+    return getattr(importlib.import_module(module_name), class_name)
@@ -0,0 +1,122 @@
+"""
+Compact, reusable deck of treys card ints with seeded partial shuffles.
+
+FastDeck replaces treys.Deck inside the engine: it keeps one 52-card buffer
+for its whole life and only shuffles as far as cards are actually dealt
+(partial Fisher-Yates). deal_batch deals thousands of independent hands at
+once as NumPy arrays. Cards stay plain treys ints, so display.py and the
+evaluators work on them unchanged.
+
+NumPy is imported when the first deck is built rather than with the module,
+keeping `import game_engine` cheap for short-lived worker processes.
+"""
+from typing import TYPE_CHECKING, List, Tuple
+
+from treys import Deck
+
+if TYPE_CHECKING:
+    import numpy as np
+
+FULL_DECK = tuple(Deck.GetFullDeck())
+_full_deck_array = None
+
+
+def full_deck_array() -> "np.ndarray":
+    """FULL_DECK as an int64 NumPy array (also available as FULL_DECK_ARRAY)."""
+    global _full_deck_array
+    if _full_deck_array is None:
+        import numpy as np
+        _full_deck_array = np.array(FULL_DECK, dtype=np.int64)
+    return _full_deck_array
+
+
+def __getattr__(name):
+    if name == "FULL_DECK_ARRAY":
+        return full_deck_array()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class FastDeck:
+    """
+    A 52-card deck that reshuffles in place.
+
+    Each reset() restores the canonical card order and draws fresh uniforms
+    from a numpy.random.Generator; draw(n) then performs the next n steps of
+    Fisher-Yates. The same seed always deals the same cards.
+    """
+
+    __slots__ = ('rng', 'cards', 'position', '_uniforms')
+
+    def __init__(self, seed=None):
+        from numpy.random import default_rng
+        self.rng = default_rng(seed)
+        self.cards = list(FULL_DECK)
+        self.reset()
+
+    def reset(self, seed=None):
+        """Gather all cards and reshuffle; reseed first when `seed` is given."""
+        if seed is not None:
+            from numpy.random import default_rng
+            self.rng = default_rng(seed)
+        self.cards[:] = FULL_DECK
+        self.position = 0
+        self._uniforms = self.rng.random(len(FULL_DECK)).tolist()
+
+    def draw(self, n: int = 1) -> List[int]:
+        """Deal the next n cards (treys.Deck.draw compatible)."""
+        cards = self.cards
+        uniforms = self._uniforms
+        start = self.position
+        end = start + n
+        if end > len(cards):
+            raise ValueError(f"Cannot draw {n} cards, only {len(cards) - start} left")
+        remaining = len(cards) - start
+        for i in range(start, end):
+            j = i + int(uniforms[i] * remaining)
+            cards[i], cards[j] = cards[j], cards[i]
+            remaining -= 1
+        self.position = end
+        return cards[start:end]
+
+    def __len__(self):
+        return len(self.cards) - self.position
+
+
+def partial_shuffle_batch(deck: "np.ndarray", num_rows: int, k: int, rng) -> "np.ndarray":
+    """
+    First k cards of num_rows independent Fisher-Yates shuffles of `deck`.
+
+    Returns a (num_rows, k) array. Costs O(num_rows * k), independent of
+    how many cards are left undealt.
+    """
+    import numpy as np
+    m = len(deck)
+    if k > m:
+        raise ValueError(f"Cannot deal {k} cards from a deck of {m}")
+    order = np.tile(np.arange(m, dtype=np.intp), (num_rows, 1))
+    rows = np.arange(num_rows)
+    uniforms = rng.random((num_rows, k))
+    for i in range(k):
+        j = i + (uniforms[:, i] * (m - i)).astype(np.intp)
+        picked = order[rows, j]
+        order[rows, j] = order[rows, i]
+        order[rows, i] = picked
+    return deck[order[:, :k]]
+
+
+def deal_batch(num_deals: int, num_players: int, board_cards: int = 5,
+               seed=None, rng=None) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Deal num_deals independent hands at once.
+
+    Returns:
+        (holes, boards): int64 arrays of treys card ints shaped
+        (num_deals, num_players, 2) and (num_deals, board_cards).
+    """
+    import numpy as np
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    dealt = partial_shuffle_batch(full_deck_array(), num_deals, 2 * num_players + board_cards, rng)
+    holes = dealt[:, :2 * num_players].reshape(num_deals, num_players, 2)
+    boards = dealt[:, 2 * num_players:]
+    return holes, boards
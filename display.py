@@ -1,10 +1,29 @@
 from treys import Card
-from rich.console import Console
-from rich.table import Table
-from rich.text import Text
-from typing import List, Tuple
+import queue
+import sys
+import threading
+from collections import deque
+from typing import List, NamedTuple, Tuple
+
+# Rich is imported on first use, so headless runs (NullSink/BufferedSink)
+# never pay for it
+_console = None
+
+
+def get_console():
+    """The shared Rich console, created on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+def __getattr__(name):
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-console = Console()
 
 def card_to_rich_display(card_int: int, style: str = "ascii") -> str:
     """
@@ -80,6 +99,7 @@ class GameDisplay:
     @staticmethod
     def display_hands(players, dealer_position=0):
         """Display player hole cards and stacks with position indicators."""
+        from rich.table import Table
         table = Table(
             show_header=True,
             header_style="bold magenta",
@@ -111,11 +131,12 @@ class GameDisplay:
             stack_str = f"${player.chips:,}"
             table.add_row(player_name, stack_str, cards_str)
         
-        console.print(table)
+        get_console().print(table)
     
     @staticmethod
     def display_community(community_cards, stage_name="Community Cards"):
         """Display community cards."""
+        from rich.table import Table
         table = Table(
             show_header=True,
             header_style="bold yellow",
@@ -130,11 +151,13 @@ class GameDisplay:
         cards_str = " ".join([Card.int_to_pretty_str(c) for c in community_cards])
         table.add_row(cards_str)
         
-        console.print(table)
+        get_console().print(table)
     
     @staticmethod
     def display_hand_rankings(rankings: List[Tuple[str, int, str]], title: str = "", stage_name="Hand Rankings"):
         """Display player rankings with hand strength."""
+        from rich.table import Table
+        from rich.text import Text
         table = Table(
             title=f"[bold green]{title}[/bold green]",
             show_header=True,
@@ -161,11 +184,13 @@ class GameDisplay:
                 f"{hand_rank:,}"
             )
         
-        console.print(table)
+        get_console().print(table)
     
     @staticmethod
     def display_winning_percentages(percentages: dict, title: str = "Winning Chances"):
         """Display winning percentages for each player."""
+        from rich.table import Table
+        from rich.text import Text
         table = Table(
             title=f"[bold bright_magenta]{title}[/bold bright_magenta]",
             show_header=True,
@@ -195,23 +220,24 @@ class GameDisplay:
             
             table.add_row(player_name, percentage_text)
         
-        console.print(table)
+        get_console().print(table)
     
     @staticmethod
     def display_stage_header(stage_name: str):
         """Display a stage header with Rich formatting."""
-        console.rule(f"[bold yellow]{stage_name}[/bold yellow]")
+        get_console().rule(f"[bold yellow]{stage_name}[/bold yellow]")
     
     @staticmethod
     def wait_for_user(message: str = "Press Enter to continue..."):
         """Wait for user input with a custom message."""
-        console.print(f"\n[dim]{message}[/dim]", end="")
+        get_console().print(f"\n[dim]{message}[/dim]", end="")
         input()
     
     @staticmethod
     def display_game_summary(final_rankings, community_cards):
         """Display final game summary."""
-        console.rule("[bold bright_cyan]FINAL RESULTS[/bold bright_cyan]")
+        from rich.table import Table
+        get_console().rule("[bold bright_cyan]FINAL RESULTS[/bold bright_cyan]")
         
         GameDisplay.display_community(community_cards, "Community")
         GameDisplay.display_hand_rankings(final_rankings, "Final Hand Rankings")
@@ -230,13 +256,14 @@ class GameDisplay:
         winner_table.add_column("", style="bold bright_yellow", justify="center")
         winner_table.add_row(f"{winner[0]} wins with {winner[2]}")
         
-        console.print(winner_table)
+        get_console().print(winner_table)
     
     @staticmethod
     def display_actions(action_history, title="Player Actions"):
         """Display player actions in a formatted table."""
         if not action_history:
             return
+        from rich.table import Table
             
         table = Table(
             show_header=True,
@@ -254,5 +281,446 @@ class GameDisplay:
             amount_str = f"${action['amount']}" if action['amount'] > 0 else "-"
             table.add_row(action['player'], action['action'], amount_str)
         
-        console.print(f"\n[bold yellow]{title}[/bold yellow]")
-        console.print(table)
\ No newline at end of file
+        get_console().print(f"\n[bold yellow]{title}[/bold yellow]")
+        get_console().print(table)
+
+
+class NullSink:
+    """
+    Display sink that discards all output and never pauses.
+
+    The engine routes every message, table and pause through a sink, so
+    headless simulations pay nothing for display. Subclass and override
+    only the hooks you care about.
+    """
+
+    # The engine only computes equity when a sink asks for it
+    show_equity = False
+
+    def message(self, text: str):
+        """Plain-text line (what the engine used to print())."""
+        pass
+
+    def stage_header(self, stage_name: str):
+        pass
+
+    def hands(self, players, dealer_position=0):
+        pass
+
+    def community(self, community_cards, stage_name="Community Cards"):
+        pass
+
+    def game_summary(self, final_rankings, community_cards):
+        pass
+
+    def winning_percentages(self, percentages: dict):
+        pass
+
+    def pause(self, message: str = "Press Enter to continue..."):
+        pass
+
+    def begin_hand(self):
+        """Called before anything else is shown for a hand."""
+        pass
+
+    def end_hand(self):
+        """Called once the hand (and its button move) is complete."""
+        pass
+
+    def close(self):
+        """Flush pending output and release any renderer resources."""
+        pass
+
+
+class BufferedSink(NullSink):
+    """
+    Display sink that records plain-text lines in memory.
+
+    Useful for inspecting what happened in a headless run without paying
+    for terminal output.
+    """
+
+    def __init__(self, max_lines=None):
+        self.lines = []
+        self.max_lines = max_lines
+
+    def message(self, text: str):
+        self.lines.append(text)
+        if self.max_lines is not None and len(self.lines) > self.max_lines:
+            del self.lines[0]
+
+    def stage_header(self, stage_name: str):
+        self.message(f"--- {stage_name} ---")
+
+    def hands(self, players, dealer_position=0):
+        for p in players:
+            self.message(f"{p.name}: {p.chips} {cards_to_rich_string(p.hand)}")
+
+    def community(self, community_cards, stage_name="Community Cards"):
+        self.message(f"{stage_name}: {cards_to_rich_string(community_cards)}")
+
+    def game_summary(self, final_rankings, community_cards):
+        for name, rank, desc in final_rankings:
+            self.message(f"{name}: {desc} ({rank})")
+
+    def getvalue(self) -> str:
+        return "\n".join(self.lines)
+
+
+class RichSink(NullSink):
+    """
+    Display sink that renders through GameDisplay (the interactive default).
+
+    Args:
+        interactive: If False, pauses are skipped so output streams without
+            waiting for Enter.
+        show_equity: Show each player's winning chances after every deal.
+    """
+
+    def __init__(self, interactive=True, show_equity=False):
+        self.interactive = interactive
+        self.show_equity = show_equity
+
+    def message(self, text: str):
+        print(text)
+
+    def stage_header(self, stage_name: str):
+        GameDisplay.display_stage_header(stage_name)
+
+    def hands(self, players, dealer_position=0):
+        GameDisplay.display_hands(players, dealer_position)
+
+    def community(self, community_cards, stage_name="Community Cards"):
+        GameDisplay.display_community(community_cards, stage_name)
+
+    def game_summary(self, final_rankings, community_cards):
+        GameDisplay.display_game_summary(final_rankings, community_cards)
+
+    def winning_percentages(self, percentages: dict):
+        GameDisplay.display_winning_percentages(percentages)
+
+    def pause(self, message: str = "Press Enter to continue..."):
+        if self.interactive:
+            GameDisplay.wait_for_user(message)
+
+
+# ===== DISPLAY PIPELINE =====
+#
+# Spectating a long tournament through RichSink makes every hand build and
+# print several Tables synchronously. The sinks below let the engine run at
+# full speed while someone watches:
+#
+#   ThrottledSink  forwards only every Nth hand (other hands cost one check
+#                  per event, and equity is only computed for shown hands)
+#   ThreadedSink   queues events and renders them on a background thread
+#   PlainTextSink  cheap text renderer, one write per hand
+#   LiveSink       Rich Live dashboard redrawn at a fixed refresh rate
+#
+# make_sink() composes them; e.g. make_sink("plain", every=100, threaded=True).
+
+class SeatView(NamedTuple):
+    """Immutable snapshot of a player for renderers that run later or elsewhere."""
+    name: str
+    chips: int
+    hand: Tuple[int, ...]
+    folded: bool
+
+
+def snapshot_players(players) -> List[SeatView]:
+    return [SeatView(p.name, p.chips, tuple(p.hand), getattr(p, 'folded', False))
+            for p in players]
+
+
+class PlainTextSink(BufferedSink):
+    """
+    Plain-text renderer: formats events as text lines and writes each hand
+    to `stream` in a single write when the hand ends.
+
+    Args:
+        stream: File-like object to write to (defaults to sys.stdout).
+        interactive: If True, pauses flush the hand so far and wait for Enter.
+        show_equity: Also print each player's winning chances after every deal.
+    """
+
+    def __init__(self, stream=None, interactive=False, show_equity=False):
+        super().__init__()
+        self.stream = stream
+        self.interactive = interactive
+        self.show_equity = show_equity
+
+    def hands(self, players, dealer_position=0):
+        for i, p in enumerate(players):
+            button = " [D]" if i == dealer_position else ""
+            self.message(f"{p.name}{button}: {p.chips} {cards_to_rich_string(p.hand)}")
+
+    def winning_percentages(self, percentages: dict):
+        self.message("Equity: " + ", ".join(f"{name} {pct}%"
+                                            for name, pct in percentages.items()))
+
+    def flush(self):
+        if self.lines:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(self.lines) + "\n")
+            stream.flush()
+            self.lines = []
+
+    def pause(self, message: str = "Press Enter to continue..."):
+        if self.interactive:
+            self.flush()
+            input(message)
+
+    def end_hand(self):
+        self.flush()
+
+    def close(self):
+        self.flush()
+
+
+class ThrottledSink:
+    """
+    Forward only every `every`-th hand to `sink`; events of the other hands
+    are dropped before any formatting or equity work is done.
+
+    Attributes other than the sink hooks (e.g. getvalue) pass through to
+    the wrapped sink.
+    """
+
+    def __init__(self, sink, every: int = 1):
+        self._sink = sink
+        self.every = max(1, every)
+        self.hands_seen = 0
+        self._active = True
+
+    @property
+    def show_equity(self):
+        return self._active and self._sink.show_equity
+
+    def begin_hand(self):
+        self._active = self.hands_seen % self.every == 0
+        self.hands_seen += 1
+        if self._active:
+            self._sink.begin_hand()
+
+    def end_hand(self):
+        if self._active:
+            self._sink.end_hand()
+
+    def message(self, text: str):
+        if self._active:
+            self._sink.message(text)
+
+    def stage_header(self, stage_name: str):
+        if self._active:
+            self._sink.stage_header(stage_name)
+
+    def hands(self, players, dealer_position=0):
+        if self._active:
+            self._sink.hands(players, dealer_position)
+
+    def community(self, community_cards, stage_name="Community Cards"):
+        if self._active:
+            self._sink.community(community_cards, stage_name)
+
+    def game_summary(self, final_rankings, community_cards):
+        if self._active:
+            self._sink.game_summary(final_rankings, community_cards)
+
+    def winning_percentages(self, percentages: dict):
+        if self._active:
+            self._sink.winning_percentages(percentages)
+
+    def pause(self, message: str = "Press Enter to continue..."):
+        if self._active:
+            self._sink.pause(message)
+
+    def close(self):
+        self._sink.close()
+
+    def __getattr__(self, name):
+        return getattr(self._sink, name)
+
+
+class ThreadedSink:
+    """
+    Queue events and render them through `sink` on a background thread.
+
+    The engine only pays for snapshotting arguments and a queue put. When
+    the renderer falls more than `max_queue` events behind, new events are
+    dropped (and counted in `dropped`) rather than slowing the game down.
+    Pauses are not forwarded: the engine can't wait on a background
+    renderer. Call close() to drain the queue and stop the thread.
+    """
+
+    _STOP = object()
+
+    def __init__(self, sink, max_queue: int = 10000):
+        self._sink = sink
+        self.show_equity = sink.show_equity
+        self.dropped = 0
+        self._queue = queue.Queue(max_queue)
+        self._thread = threading.Thread(target=self._run, name="display", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        sink = self._sink
+        while True:
+            event = self._queue.get()
+            if event is self._STOP:
+                return
+            getattr(sink, event[0])(*event[1:])
+
+    def _put(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def begin_hand(self):
+        self._put(("begin_hand",))
+
+    def end_hand(self):
+        self._put(("end_hand",))
+
+    def message(self, text: str):
+        self._put(("message", text))
+
+    def stage_header(self, stage_name: str):
+        self._put(("stage_header", stage_name))
+
+    def hands(self, players, dealer_position=0):
+        self._put(("hands", snapshot_players(players), dealer_position))
+
+    def community(self, community_cards, stage_name="Community Cards"):
+        self._put(("community", list(community_cards), stage_name))
+
+    def game_summary(self, final_rankings, community_cards):
+        self._put(("game_summary", list(final_rankings), list(community_cards)))
+
+    def winning_percentages(self, percentages: dict):
+        self._put(("winning_percentages", dict(percentages)))
+
+    def pause(self, message: str = "Press Enter to continue..."):
+        pass
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+        self._sink.close()
+
+    def __getattr__(self, name):
+        return getattr(self._sink, name)
+
+
+class LiveSink(NullSink):
+    """
+    Rich Live dashboard: events only update an in-memory view of the table,
+    which Rich's refresh thread redraws `refresh_per_second` times a second,
+    however fast hands are played. Seats are read from the live player
+    objects at each redraw, so folds and stacks show up mid-hand; redraws
+    are throttled, so that costs nothing per action.
+
+    Args:
+        refresh_per_second: Redraw rate.
+        log_lines: How many recent messages to keep on screen.
+    """
+
+    def __init__(self, refresh_per_second: float = 4.0, log_lines: int = 12):
+        self.refresh_per_second = refresh_per_second
+        self.hands_played = 0
+        self.players = []  # The engine's player objects, read at render time
+        self.dealer = 0
+        self.stage = ""
+        self.board = []
+        self.log = deque(maxlen=log_lines)
+        self._live = None
+
+    def _start(self):
+        from rich.live import Live
+        self._live = Live(console=get_console(), refresh_per_second=self.refresh_per_second,
+                          get_renderable=self._render)
+        self._live.start()
+
+    def _render(self):
+        from rich.console import Group
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.text import Text
+
+        table = Table(title=f"Hand {self.hands_played} - {self.stage}",
+                      header_style="bold magenta", border_style="bright_blue")
+        table.add_column("Player", style="cyan", no_wrap=True, min_width=16)
+        table.add_column("Stack", style="green", justify="right", min_width=8)
+        table.add_column("Cards", no_wrap=True, min_width=8)
+        for i, seat in enumerate(snapshot_players(list(self.players))):
+            name = seat.name + (" [D]" if i == self.dealer else "")
+            cards = "folded" if seat.folded else cards_to_rich_string(seat.hand)
+            table.add_row(name, f"${seat.chips:,}", cards)
+        board = Text(f"Board: {cards_to_rich_string(list(self.board)) or '-'}", style="yellow")
+        log = Panel("\n".join(list(self.log)), title="Log", border_style="dim")
+        return Group(table, board, log)
+
+    def begin_hand(self):
+        if self._live is None:
+            self._start()
+        self.hands_played += 1
+        self.board = []
+
+    def message(self, text: str):
+        text = text.strip()
+        if text:
+            self.log.append(text)
+
+    def stage_header(self, stage_name: str):
+        self.stage = stage_name
+
+    def hands(self, players, dealer_position=0):
+        self.players = list(players)  # The engine's list shrinks when players bust
+        self.dealer = dealer_position
+
+    def community(self, community_cards, stage_name="Community Cards"):
+        self.board = list(community_cards)
+
+    def game_summary(self, final_rankings, community_cards):
+        if final_rankings:
+            name, _, desc = final_rankings[0]
+            self.log.append(f"Best hand: {name} with {desc}")
+
+    def close(self):
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+
+
+def make_sink(kind: str = "rich", interactive: bool = True, show_equity: bool = False,
+              every: int = 1, threaded: bool = False, refresh: float = 4.0):
+    """
+    Build a display sink by name: 'null', 'log', 'plain', 'rich' or 'live'.
+
+    Args:
+        kind: Renderer to use.
+        interactive: Pause for Enter between stages (rich/plain only).
+        show_equity: Show each player's winning chances after every deal.
+        every: Only render every Nth hand.
+        threaded: Render on a background thread (pauses are skipped). The
+            'live' dashboard already redraws on its own thread and reads the
+            players as they change, so it is never wrapped.
+        refresh: Redraws per second for the 'live' dashboard.
+    """
+    if kind == "null":
+        return NullSink()
+    if kind == "log":
+        sink = BufferedSink()
+    elif kind == "plain":
+        sink = PlainTextSink(interactive=interactive, show_equity=show_equity)
+    elif kind == "rich":
+        sink = RichSink(interactive=interactive, show_equity=show_equity)
+    elif kind == "live":
+        sink = LiveSink(refresh_per_second=refresh)
+    else:
+        raise ValueError(f"Unknown display sink: {kind!r}")
+    if threaded and kind != "live":
+        sink = ThreadedSink(sink)
+    if every > 1:
+        sink = ThrottledSink(sink, every)
+    return sink
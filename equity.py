@@ -0,0 +1,123 @@
+"""
+Monte Carlo / exact equity for Texas Hold'em.
+
+Cards are plain treys ints held in NumPy arrays, so whole batches of runouts
+are dealt and evaluated at once instead of looping in Python.
+"""
+from itertools import combinations
+from math import comb
+from typing import Dict, List
+
+import numpy as np
+
+from deck import FULL_DECK, partial_shuffle_batch
+from hand_evaluator import evaluate_batch
+
+
+def _deal_runouts(deck: np.ndarray, needed: int, num_samples: int, rng, exact_threshold: int):
+    """Return an (n, needed) array of card ints: every runout, or a random sample."""
+    if needed == 0:
+        return np.empty((1, 0), dtype=np.int64)
+    if comb(len(deck), needed) <= exact_threshold:
+        idx = np.array(list(combinations(range(len(deck)), needed)), dtype=np.intp)
+        return deck[idx]
+    return partial_shuffle_batch(deck, num_samples, needed, rng)
+
+
+def calculate_equity(hands: Dict[str, List[int]], community_cards: List[int] = (),
+                     num_samples: int = 20000, seed=None, exact_threshold: int = 2000,
+                     batch_size: int = 20000) -> Dict[str, Dict[str, float]]:
+    """
+    Estimate each player's chance to win the hand from here.
+
+    Args:
+        hands: {player name: [card1, card2]} for every player still in.
+        community_cards: 0-5 board cards already dealt.
+        num_samples: Monte Carlo runouts when enumeration is too large.
+        seed: Seed for the sampler (ignored when enumerating).
+        exact_threshold: Enumerate every runout when there are at most this
+            many (always true on the turn and river).
+        batch_size: Runouts evaluated per NumPy batch, bounding memory.
+
+    Returns:
+        {name: {'win': P(sole winner), 'tie': P(split), 'equity': pot share}}
+    """
+    names = list(hands)
+    holes = np.array([hands[n] for n in names], dtype=np.int64).reshape(len(names), 2)
+    board = np.array(list(community_cards), dtype=np.int64)
+    dead = set(holes.ravel().tolist()) | set(board.tolist())
+    deck = np.array([c for c in FULL_DECK if c not in dead], dtype=np.int64)
+
+    rng = np.random.default_rng(seed)
+    runouts = _deal_runouts(deck, 5 - len(board), num_samples, rng, exact_threshold)
+    n = len(runouts)
+
+    wins = np.zeros(len(names))
+    ties = np.zeros(len(names))
+    shares = np.zeros(len(names))
+    for start in range(0, n, batch_size):
+        chunk = runouts[start:start + batch_size]
+        boards = np.hstack([np.broadcast_to(board, (len(chunk), len(board))), chunk])
+        ranks = np.stack([
+            evaluate_batch(np.hstack([np.broadcast_to(hole, (len(chunk), 2)), boards]))
+            for hole in holes
+        ])                                                          # (players, runouts)
+        best = ranks == ranks.min(axis=0)
+        num_best = best.sum(axis=0)
+        wins += (best & (num_best == 1)).sum(axis=1)
+        ties += (best & (num_best > 1)).sum(axis=1)
+        shares += (best / num_best).sum(axis=1)
+
+    return {
+        name: {'win': float(wins[i] / n), 'tie': float(ties[i] / n),
+               'equity': float(shares[i] / n)}
+        for i, name in enumerate(names)
+    }
+
+
+def winning_percentages(hands: Dict[str, List[int]], community_cards: List[int] = (),
+                        **kwargs) -> Dict[str, float]:
+    """
+    Equity as rounded percentages, ready for GameDisplay.display_winning_percentages.
+    """
+    equity = calculate_equity(hands, community_cards, **kwargs)
+    return {name: round(e['equity'] * 100, 1) for name, e in equity.items()}
+
+
+def equity_vs_random(hole_cards: List[int], community_cards: List[int] = (),
+                     num_opponents: int = 1, num_samples: int = 2000, seed=None) -> float:
+    """
+    Pot share of one known hand against `num_opponents` random hands.
+
+    Unlike calculate_equity, the opponents' cards are unknown: every sample
+    deals them and the rest of the board from the remaining deck.
+
+    Args:
+        hole_cards: Two treys card ints.
+        community_cards: 0-5 board cards already dealt.
+        num_opponents: Random hands to beat.
+        num_samples: Monte Carlo deals.
+        seed: Seed for the sampler.
+    """
+    board = np.array(list(community_cards), dtype=np.int64)
+    dead = set(hole_cards) | set(board.tolist())
+    deck = np.array([c for c in FULL_DECK if c not in dead], dtype=np.int64)
+    needed = 5 - len(board) + 2 * num_opponents
+
+    rng = np.random.default_rng(seed)
+    dealt = partial_shuffle_batch(deck, num_samples, needed, rng)
+    boards = np.hstack([np.broadcast_to(board, (num_samples, len(board))),
+                        dealt[:, :5 - len(board)]])
+    villain_cards = dealt[:, 5 - len(board):]
+
+    hero = evaluate_batch(np.hstack([np.broadcast_to(np.array(hole_cards, dtype=np.int64),
+                                                     (num_samples, 2)), boards]))
+    villains = np.stack([
+        evaluate_batch(np.hstack([villain_cards[:, 2 * i:2 * i + 2], boards]))
+        for i in range(num_opponents)
+    ])                                                   # (opponents, samples)
+    best_villain = villains.min(axis=0)
+    ties = (villains == hero).sum(axis=0)
+    share = np.where(hero < best_villain, 1.0,
+                     np.where(hero == best_villain, 1.0 / (ties + 1), 0.0))
+    return float(share.mean())
@@ -0,0 +1,227 @@
+"""
+Persistent equity cache shared by bots, tables and worker processes.
+
+Equity of a hand against random opponents depends only on the cards, not on
+their suits' names or the order they were dealt, so queries are keyed by a
+canonical form: suits are relabelled in a fixed order (isomorphism.canonical_cards)
+and hole and board are sorted. AhKh on Qh7d2c and AsKs on Qs7c2h share one
+entry, as text ('AsKs|Qs7h2d'), next to the number of opponents.
+
+Entries live in an SQLite file under hand_evaluator.cache_dir(), in WAL mode
+so any number of processes can read while one writes. Values are a pure
+function of the key (the sampler is seeded from it), so two processes that
+miss on the same spot at once store the same answer. Each process keeps a
+small in-memory LRU in front of the file and batches its last-used updates.
+Every so many inserts (and on close) a process checks the file's size and
+evicts the least recently used entries beyond max_entries.
+
+    cache = shared_cache()
+    cache.equity(hole_cards, community_cards, num_opponents=2)   # 0-1
+"""
+import atexit
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from treys import Card
+
+from isomorphism import canonical_cards
+
+SCHEMA_VERSION = 1
+DEFAULT_MAX_ENTRIES = 200_000
+DEFAULT_SAMPLES = 2000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS equity (
+    cards TEXT NOT NULL,
+    opponents INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    equity REAL NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (cards, opponents)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS equity_used ON equity (used);
+"""
+
+_shared = None  # Process-wide EquityCache from shared_cache()
+
+
+# ===== CANONICAL KEYS =====
+
+def cache_key(hole_cards: List[int], board: List[int]) -> str:
+    """Canonical cards as text, e.g. 'AsKs|Qs7h2d' (the cache's content address)."""
+    hole, board = canonical_cards(hole_cards, board)
+    return "".join(map(Card.int_to_str, hole)) + "|" + "".join(map(Card.int_to_str, board))
+
+
+def _parse_key(cards: str) -> Tuple[List[int], List[int]]:
+    hole, board = cards.split("|")
+    return ([Card.new(hole[i:i + 2]) for i in range(0, len(hole), 2)],
+            [Card.new(board[i:i + 2]) for i in range(0, len(board), 2)])
+
+
+def default_path() -> str:
+    from hand_evaluator import cache_dir
+    return os.path.join(cache_dir(), f"equity_v{SCHEMA_VERSION}.sqlite")
+
+
+# ===== CACHE =====
+
+class EquityCache:
+    """
+    Equity against random opponents, memoized in memory and in SQLite.
+
+    Safe to use from several processes at once (each opens its own
+    connection, also after a fork). Not meant to be shared between threads.
+    """
+
+    def __init__(self, path: str = None, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 num_samples: int = DEFAULT_SAMPLES, memory_size: int = 4096,
+                 timeout: float = 30.0):
+        """
+        Args:
+            path: SQLite file (default: equity_v1.sqlite in the table cache
+                directory); ':memory:' for a private, non-persistent cache.
+            max_entries: Entries kept on disk before LRU eviction.
+            num_samples: Monte Carlo deals per computed entry. Stored entries
+                computed with fewer samples are recomputed.
+            memory_size: Entries kept in this process's in-memory LRU.
+            timeout: Seconds to wait for another process's write lock.
+        """
+        self.path = path or default_path()
+        self.max_entries = max_entries
+        self.num_samples = num_samples
+        self.memory_size = memory_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._memory = {}    # {(cards, opponents): equity}, oldest first
+        self._touched = {}   # {(cards, opponents): last used}, not yet written
+        self._inserted = 0   # Inserts since the last eviction check
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            # A connection must not be used across fork(); open one per process
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def equity(self, hole_cards: List[int], community_cards: List[int] = (),
+               num_opponents: int = 1) -> float:
+        """
+        Pot share (0-1) of a hand against `num_opponents` random hands,
+        from memory, then disk, then computed and stored.
+        """
+        key = (cache_key(hole_cards, community_cards), max(1, num_opponents))
+        value = self._memory.pop(key, None)
+        if value is None:
+            value = self._load(key)
+            if value is None:
+                self.misses += 1
+                value = self._compute(key)
+                self._store(key, value)
+            else:
+                self.hits += 1
+                self._touched[key] = time.time()
+            if len(self._memory) >= self.memory_size:
+                del self._memory[next(iter(self._memory))]  # Least recently used
+        else:
+            self.hits += 1
+            self._touched[key] = time.time()
+        self._memory[key] = value  # (Re)insert as most recently used
+        if len(self._touched) >= 256:
+            self.flush()
+        return value
+
+    def get(self, hole_cards: List[int], community_cards: List[int] = (),
+            num_opponents: int = 1) -> Optional[float]:
+        """Cached equity, or None (never computes)."""
+        key = (cache_key(hole_cards, community_cards), max(1, num_opponents))
+        value = self._memory.get(key)
+        return value if value is not None else self._load(key)
+
+    def _load(self, key) -> Optional[float]:
+        row = self._connection().execute(
+            "SELECT equity FROM equity WHERE cards = ? AND opponents = ? AND samples >= ?",
+            (key[0], key[1], self.num_samples)).fetchone()
+        return row[0] if row else None
+
+    def _compute(self, key) -> float:
+        from equity import equity_vs_random  # NumPy is only needed on a miss
+        hole, board = _parse_key(key[0])
+        seed = zlib.crc32(f"{key[0]}/{key[1]}".encode())
+        return equity_vs_random(hole, board, key[1], self.num_samples, seed=seed)
+
+    def _store(self, key, value: float):
+        self._connection().execute(
+            "INSERT INTO equity (cards, opponents, samples, equity, used) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (cards, opponents) DO UPDATE SET samples = excluded.samples, "
+            "equity = excluded.equity, used = excluded.used "
+            "WHERE excluded.samples > equity.samples",
+            (key[0], key[1], self.num_samples, value, time.time()))
+        self._inserted += 1
+        if self._inserted >= max(64, self.max_entries // 100):
+            self.evict()
+
+    def flush(self):
+        """Write this process's pending last-used times to disk."""
+        if self._touched:
+            self._connection().executemany(
+                "UPDATE equity SET used = max(used, ?) WHERE cards = ? AND opponents = ?",
+                [(used, cards, opponents) for (cards, opponents), used in self._touched.items()])
+            self._touched.clear()
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond max_entries; returns how many."""
+        self._inserted = 0
+        conn = self._connection()
+        excess = conn.execute("SELECT count(*) FROM equity").fetchone()[0] - self.max_entries
+        if excess <= 0:
+            return 0
+        self.flush()
+        conn.execute("DELETE FROM equity WHERE (cards, opponents) IN "
+                     "(SELECT cards, opponents FROM equity ORDER BY used LIMIT ?)", (excess,))
+        return excess
+
+    def clear(self):
+        """Remove every entry, on disk and in memory."""
+        self._memory.clear()
+        self._touched.clear()
+        self._connection().execute("DELETE FROM equity")
+
+    def stats(self) -> Dict:
+        """Entries on disk, file path and this process's hit/miss counts."""
+        entries = self._connection().execute("SELECT count(*) FROM equity").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {'path': self.path, 'entries': entries, 'hits': self.hits,
+                'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def close(self):
+        """Flush pending updates and close this process's connection."""
+        if self._conn is not None and self._pid == os.getpid():
+            if self._inserted:
+                self.evict()
+            self.flush()
+            self._conn.close()
+        self._conn = None
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM equity").fetchone()[0]
+
+
+def shared_cache() -> EquityCache:
+    """The process-wide cache at default_path(), flushed at exit."""
+    global _shared
+    if _shared is None:
+        _shared = EquityCache()
+        atexit.register(_shared.close)
+    return _shared
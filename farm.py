@@ -0,0 +1,170 @@
+import math
+import os
+import random
+import secrets
+from functools import partial
+from typing import Callable, Dict, List, Any
+
+from display import NullSink
+from game_engine import run_tournament
+from profiling import EngineStats
+from session_stats import SessionStats
+
+
+def bot_factory(bot_class, name: str, **kwargs) -> Callable:
+    """
+    Build a picklable factory that creates a fresh bot per shard.
+
+    `bot_class` may be a class or a registered bot name (see bots.load_bot);
+    names are only imported when the factory is first called, i.e. inside
+    the worker.
+
+    Example:
+        factories = [bot_factory("Coyote", "Alice"), bot_factory(Coyote, "Bob")]
+    """
+    if isinstance(bot_class, str):
+        return partial(_make_bot, bot_class, name=name, **kwargs)
+    return partial(bot_class, name=name, **kwargs)
+
+
+def _make_bot(bot_name: str, **kwargs):
+    from bots import load_bot
+    return load_bot(bot_name)(**kwargs)
+
+
+def shard_seed(seed, shard_index: int) -> int:
+    """Derive an independent, reproducible seed for one shard."""
+    return random.Random(f"{seed}:{shard_index}").getrandbits(64)
+
+
+def _run_shard(job) -> Dict[str, Any]:
+    """Worker entry point: play one independent table with fresh bots."""
+    factories, num_hands, seed, profile, player_stats = job
+    players = [factory() for factory in factories]
+    starting = {p.name: p.chips for p in players}
+    stats = EngineStats() if profile else None
+    tracker = SessionStats() if player_stats else None
+    if tracker is not None:
+        for p in players:
+            p.session_stats = tracker
+    result = run_tournament(players, num_hands, seed=seed, display=NullSink(), stats=stats,
+                            tracker=tracker)
+    result['net'] = {name: result['chips'][name] - chips for name, chips in starting.items()}
+    result['stats'] = stats
+    result['tracker'] = tracker
+    return result
+
+
+def _mean_ci(values: List[float], z: float = 1.96):
+    n = len(values)
+    mean = sum(values) / n
+    if n < 2:
+        return mean, (mean, mean)
+    var = sum((v - mean) ** 2 for v in values) / (n - 1)
+    half = z * math.sqrt(var / n)
+    return mean, (mean - half, mean + half)
+
+
+def _wilson_ci(wins: int, n: int, z: float = 1.96):
+    if n == 0:
+        return (0.0, 0.0)
+    p = wins / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return (center - half, center + half)
+
+
+def merge_results(shard_results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Merge per-shard results into per-bot totals.
+
+    A bot "wins" a shard when it finishes with the most chips at that table.
+    """
+    names = list(shard_results[0]['chips'])
+    nets = {name: [] for name in names}
+    table_wins = {name: 0 for name in names}
+    hands_won = {name: 0 for name in names}
+    hands_played = 0
+
+    for result in shard_results:
+        hands_played += result['hands_played']
+        for name in names:
+            nets[name].append(result['net'][name])
+            hands_won[name] += result['hands_won'][name]
+        top = max(result['chips'].values())
+        for name, chips in result['chips'].items():
+            if chips == top:
+                table_wins[name] += 1
+
+    n = len(shard_results)
+    summary = {}
+    for name in names:
+        mean, ci = _mean_ci(nets[name])
+        summary[name] = {
+            'shards': n,
+            'hands_played': hands_played,
+            'net_chips': sum(nets[name]),
+            'mean_net_chips': mean,
+            'net_chips_ci95': ci,
+            'hands_won': hands_won[name],
+            'win_rate': table_wins[name] / n,
+            'win_rate_ci95': _wilson_ci(table_wins[name], n),
+        }
+    return summary
+
+
+def run_farm(factories: List[Callable], num_shards: int, hands_per_shard: int,
+             seed=None, workers: int = None, stats: EngineStats = None,
+             tracker: SessionStats = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Play num_shards independent tables across a process pool and merge results.
+
+    Args:
+        factories: Picklable zero-argument callables returning fresh bots
+            (see bot_factory). Each shard seats one bot per factory.
+        num_shards: Number of independent tables to play.
+        hands_per_shard: Hand limit per table.
+        seed: Base seed; shard i uses shard_seed(seed, i). None draws a
+            fresh random base seed.
+        workers: Process count (default: all cores). 1 runs in-process.
+        stats: Optional profiling.EngineStats; every shard collects its own
+            and they are merged into this one (wall time is summed over
+            shards, i.e. per-process time).
+        tracker: Optional session_stats.SessionStats; per-shard trackers are
+            merged into it the same way.
+
+    Returns:
+        {bot name: stats dict} as built by merge_results, each also holding
+        the base 'seed' so the run can be reproduced.
+    """
+    if num_shards < 1:
+        raise ValueError(f"num_shards must be at least 1, got {num_shards}")
+    names = [factory().name for factory in factories]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Bot names must be unique per table, got {names}")
+    if seed is None:
+        seed = secrets.randbits(64)
+
+    jobs = [(factories, hands_per_shard, shard_seed(seed, i), stats is not None,
+             tracker is not None) for i in range(num_shards)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        results = [_run_shard(job) for job in jobs]
+    else:
+        # A few chunks per worker keeps IPC low while still balancing load
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, num_shards // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_shard, jobs, chunksize=chunksize))
+
+    for result in results:
+        if stats is not None:
+            stats.merge(result['stats'])
+        if tracker is not None:
+            tracker.merge(result['tracker'])
+    summary = merge_results(results)
+    for bot in summary.values():
+        bot['seed'] = seed
+    return summary
@@ -1,26 +1,57 @@
 from game_state import GameState
-from treys import Evaluator, Card, Deck
 from typing import List, Tuple, Dict, Any
-from bots.Coyote import Coyote
-from display import GameDisplay
-
-
-def run_betting_round(game_state):
+from deck import FastDeck
+from display import RichSink, NullSink
+from hand_evaluator import evaluate_hand, rank_description
+from observation import build_observation
+from pot import build_pots, settle_pots
+from rules import legal_actions, validate_action
+from profiling import TimedSink
+import random
+from time import perf_counter
+
+
+def _drive(steps, stats=None):
+    """
+    Run an engine step generator to completion, answering each decision
+    request (player, observation) with that player's make_decision.
+    With `stats` (profiling.EngineStats), every decision is timed per bot.
+    """
+    try:
+        request = next(steps)
+        if stats is None:
+            while True:
+                player, observation = request
+                request = steps.send(player.make_decision(observation))
+        while True:
+            player, observation = request
+            start = perf_counter()
+            decision = player.make_decision(observation)
+            stats.add_decision(player.name, perf_counter() - start)
+            request = steps.send(decision)
+    except StopIteration as stop:
+        return stop.value
+
+
+def run_betting_round(game_state, display=None):
+    """Play one betting round; returns True if the hand ended (everyone else folded)."""
+    if display is None:
+        display = RichSink()
+    return _drive(_betting_round_steps(game_state, display))
+
+
+def _betting_round_steps(game_state, display):
+    """
+    Betting round as a generator: yields (player, observation) whenever a
+    decision is needed and expects (action, amount) to be sent back.
+    """
     players = game_state.players
     num_players = len(players)
     dealer = game_state.dealer_index
     stage = game_state.stage
 
-    # --- Pot and betting setup ---
-    if not hasattr(game_state, 'pot'):
-        game_state.pot = 0
-    if not hasattr(game_state, 'min_raise'):
-        game_state.min_raise = 20
-    if not hasattr(game_state, 'current_bet'):
-        game_state.current_bet = 0
-
     # Determine blinds
-    if len([p for p in players if not p.folded]) == 2:
+    if game_state.num_active == 2:
         small_blind_index = (dealer + 1) % num_players
         big_blind_index = dealer
     else:
@@ -30,215 +61,391 @@ def run_betting_round(game_state):
     small_blind = players[small_blind_index]
     big_blind = players[big_blind_index]
 
-    # Pre-flop mandatory blinds
+    # Pre-flop mandatory blinds (a short stack posts what it has and is all-in)
     if stage == "pre-flop":
-        print(f"{small_blind.name} posts SMALL blind (mandatory raise).")
-        sb_amt = 10
-        small_blind.chips -= sb_amt
-        small_blind.current_bet = sb_amt
-        game_state.pot += sb_amt
-
-        print(f"{big_blind.name} posts BIG blind (mandatory raise).")
-        bb_amt = 20
-        big_blind.chips -= bb_amt
-        big_blind.current_bet = bb_amt
-        game_state.pot += bb_amt
-        game_state.current_bet = bb_amt
+        display.message(f"{small_blind.name} posts SMALL blind (mandatory raise).")
+        sb_amt = game_state.post_bet(small_blind, game_state.small_blind)
+        game_state.record_action(small_blind.name, 'small blind', sb_amt)
+
+        display.message(f"{big_blind.name} posts BIG blind (mandatory raise).")
+        bb_amt = game_state.post_bet(big_blind, game_state.big_blind)
+        game_state.current_bet = max(sb_amt, bb_amt)
+        game_state.record_action(big_blind.name, 'big blind', bb_amt)
 
         # Pre-flop first acting player
-        if len([p for p in players if not p.folded]) == 2:
+        if game_state.num_active == 2:
             current_index = small_blind_index
         else:
             current_index = (big_blind_index + 1) % num_players
     else:
         # Reset current_bet for all players for new stage
-        for p in players:
-            p.current_bet = 0
-        game_state.current_bet = 0
+        game_state.reset_bets()
         current_index = small_blind_index
         game_state.bet_holder = None  # No active raise yet
-
-    acted_players = set()
-    stage_over = False
-
-    while not stage_over:
+    game_state.min_raise = game_state.big_blind
+    game_state.acted = [False] * num_players  # Blinds don't count as acting
+
+    # The stage ends once every player who can still act (in the hand and not
+    # all-in) has acted on the current bet; `pending` counts the ones that
+    # haven't, so the check is O(1). Folded and all-in seats are skipped.
+    # `acted` marks who has acted since the last full raise: a short all-in
+    # makes them call or fold again but doesn't let them re-raise.
+    can_act = game_state.can_act
+    stacks = game_state.stacks
+    bets = game_state.bets
+    actors = [i for i in range(num_players) if can_act(i)]
+    pending = len(actors)
+    if pending == 0 or (pending == 1 and bets[actors[0]] >= game_state.current_bet):
+        # Nobody left to bet against: the board is just run out
+        return False
+
+    while pending > 0:
         player = players[current_index]
 
-        if player.folded:
+        if not can_act(current_index):
             current_index = (current_index + 1) % num_players
             continue
 
-        # End hand if only one player remains
-        active_players = [p for p in players if not p.folded]
-        if len(active_players) == 1:
-            winner = active_players[0]
-            print(f"\n{winner.name} wins the hand! Everyone else folded.")
-            # Award pot to winner
-            winner.chips += game_state.pot
-            print(f"{winner.name} wins the pot of {game_state.pot} chips!")
-            game_state.pot = 0
-            return True
-
-        # Calculate amount to call
-        to_call = game_state.current_bet - player.current_bet
-        min_raise = game_state.min_raise
+        legal = legal_actions(stacks[current_index], bets[current_index],
+                              game_state.current_bet, game_state.min_raise,
+                              not game_state.acted[current_index])
 
-        # Player decision
-        action, amount = player.make_decision(game_state)
-        print(f"{player.name} decides to {action.upper()}.")
+        # Player decision, from a read-only snapshot of what this seat may see,
+        # coerced to the nearest legal move
+        action, amount = yield player, build_observation(game_state, current_index)
+        action, amount = validate_action(legal, action, amount)
+        display.message(f"{player.name} decides to {action.upper()}.")
+        committed = 0
 
         if action == "fold":
-            player.folded = True
-            acted_players.add(player)
+            game_state.fold(player)
+            pending -= 1
         elif action == "call":
-            # Player matches current bet
-            call_amt = amount
-            if call_amt > 0:
-                player.chips -= call_amt
-                player.current_bet += call_amt
-                game_state.pot += call_amt
-            print(f"{player.name} CALLS for {call_amt} chips.")
+            # Player matches current bet (or goes all-in for less)
+            committed = game_state.post_bet(player, amount)
+            pending -= 1
+            display.message(f"{player.name} CALLS for {committed} chips.")
         elif action == "raise":
-            raise_amt = amount
-            to_call = game_state.current_bet - player.current_bet
-            total_amt = to_call + raise_amt
-            player.chips -= total_amt
-            player.current_bet += total_amt
-            game_state.pot += total_amt
+            # Player calls, then raises by `amount`
+            committed = game_state.post_bet(player, legal.to_call + amount)
             game_state.current_bet = player.current_bet
-            print(f"{player.name} RAISES to {player.current_bet} chips.")
-        elif action == "check":
-            print(f"{player.name} checks.")
-            acted_players.add(player)
-        elif action in ["raise", "call and raise"]:
-            # Player must call, then raise
-            to_call = game_state.current_bet - player.current_bet
-            raise_amt = min_raise
-            total_amt = to_call + raise_amt
-            player.chips -= total_amt
-            player.current_bet += total_amt
-            game_state.pot += total_amt
-            game_state.current_bet = player.current_bet
-            print(f"--- {player.name} RAISES --- for total {total_amt} chips (call {to_call} + raise {raise_amt})")
+            if amount >= game_state.min_raise:
+                # A full raise reopens the betting for everyone
+                game_state.min_raise = amount  # Re-raises must be at least this big
+                game_state.acted = [False] * num_players
             game_state.bet_holder = player
-            # Reset acted_players; only raiser has acted so far
-            acted_players = {player}
+            # Everyone who can still act and hasn't matched the new bet must respond
+            current_bet = game_state.current_bet
+            pending = sum(1 for i in range(num_players) if can_act(i) and bets[i] < current_bet)
+            display.message(f"--- {player.name} RAISES to {player.current_bet} chips ---")
+        else:
+            display.message(f"{player.name} checks.")
+            pending -= 1
+
+        game_state.acted[current_index] = True
+        game_state.record_action(player.name, action, committed)
+
+        # End hand if only one player remains
+        if game_state.num_active == 1:
+            return True
 
         # Advance turn
         current_index = (current_index + 1) % num_players
 
-        # Stage ends if all active players except bet_holder have acted
-        active_players = [p for p in players if not p.folded]
-        if all(p in acted_players or p == game_state.bet_holder for p in active_players):
-            stage_over = True
-
-    print(f"=== {stage.upper()} betting round is over ===")
+    display.message(f"=== {stage.upper()} betting round is over ===")
     return False
 
 
-def play_hand(players, dealer_index):
+def show_winning_percentages(players, community_cards, display):
+    """Send current equity of every live hand to the display sink, if it wants it."""
+    if not display.show_equity:
+        return
+    from equity import winning_percentages  # NumPy is only needed for this view
+    hands = {p.name: p.hand for p in players if not p.folded}
+    if len(hands) > 1:
+        display.winning_percentages(winning_percentages(hands, community_cards))
+
+
+def play_hand(players, dealer_index, display=None, seed=None, deck=None, recorder=None,
+              stats=None, tracker=None, blinds=None):
+    """
+    Play one hand and return the next dealer index.
+
+    Args:
+        players: Seated bots (mutated: chips, cards, eliminations).
+        dealer_index: Index of the dealer button.
+        display: Display sink for all output and pauses; defaults to an
+            interactive RichSink.
+        seed: Optional deck seed for reproducible deals.
+        deck: Optional FastDeck to reuse across hands (reset with `seed`).
+        recorder: Optional hand-history writer (see hand_history.py); every
+            recorded hand gets a seed so it can be replayed on its own.
+        stats: Optional profiling.EngineStats to collect timings into; the
+            hand's wall time is added too, so hands/sec is meaningful for
+            hand-by-hand callers like the interactive loop.
+        tracker: Optional session_stats.SessionStats to update with the
+            hand's actions and results.
+        blinds: Optional (small blind, big blind); defaults to GameState's 10/20.
+    """
+    if display is None:
+        display = RichSink()
+    if stats is None:
+        return _drive(_hand_steps(players, dealer_index, display, seed, deck, recorder, None,
+                                  tracker, blinds), None)
+    started = perf_counter()
+    next_dealer = _drive(_hand_steps(players, dealer_index, TimedSink(display, stats), seed,
+                                     deck, recorder, stats, tracker, blinds), stats)
+    # run_tournament drives _hand_steps itself and times the whole run, so no double count
+    stats.wall_time += perf_counter() - started
+    return next_dealer
+
+
+def _hand_steps(players, dealer_index, display, seed=None, deck=None, recorder=None,
+                stats=None, tracker=None, blinds=None):
+    """play_hand as a generator of decision requests (see _betting_round_steps)."""
+    if recorder is not None and seed is None:
+        seed = random.getrandbits(32)
+
     # === Setup deck and deal hole cards ===
-    deck = Deck()
+    if stats is not None:
+        stats.count('hands')
+        start = perf_counter()
+    if deck is None:
+        deck = FastDeck(seed)
+    else:
+        deck.reset(seed)
     for p in players:
-        p.hand = [deck.draw(1)[0], deck.draw(1)[0]]
+        p.hand = deck.draw(2)
         p.folded = False
         p.current_bet = 0
+    if stats is not None:
+        stats.add_phase('deal', perf_counter() - start)
 
     game_state = GameState(players)
     game_state.dealer_index = dealer_index
+    if blinds is not None:
+        game_state.small_blind, game_state.big_blind = blinds
     hand_over = False
+    if recorder is not None or tracker is not None:
+        seats = list(players)
+        chips_start = [p.chips for p in players]
+        start_dealer = dealer_index
 
     # Display initial hands
-    GameDisplay.display_stage_header("NEW HAND")
-    GameDisplay.display_hands(players, dealer_index)
+    display.begin_hand()
+    display.stage_header("NEW HAND")
+    display.hands(players, dealer_index)
+    show_winning_percentages(players, [], display)
 
     # === Betting rounds and community cards ===
     community_cards = []
 
     for stage in game_state.stages:
         game_state.reset_for_stage(stage)
+        display.message(f"\n=== Starting {stage.upper()} ===")
+        display.message(f"Active Players: {[p.name for p in players if not p.folded]}")
+        if stats is not None:
+            start = perf_counter()
         if stage == "flop":
-            community_cards = [deck.draw(1)[0] for _ in range(3)]
-            GameDisplay.display_stage_header("FLOP")
-            GameDisplay.display_community(community_cards, "Flop")
+            community_cards = deck.draw(3)
+            display.stage_header("FLOP")
+            display.community(community_cards, "Flop")
+            show_winning_percentages(players, community_cards, display)
         elif stage == "turn":
             community_cards.append(deck.draw(1)[0])
-            GameDisplay.display_stage_header("TURN")
-            GameDisplay.display_community(community_cards, "Turn")
+            display.stage_header("TURN")
+            display.community(community_cards, "Turn")
+            show_winning_percentages(players, community_cards, display)
         elif stage == "river":
             community_cards.append(deck.draw(1)[0])
-            GameDisplay.display_stage_header("RIVER")
-            GameDisplay.display_community(community_cards, "River")
-
-        hand_over = run_betting_round(game_state)
+            display.stage_header("RIVER")
+            display.community(community_cards, "River")
+            show_winning_percentages(players, community_cards, display)
+        game_state.community_cards = community_cards
 
-        # Track the dealer's name before eliminations
-        prev_dealer_name = players[game_state.dealer_index].name if players else None
-
-        # Remove broke players after each stage
-        broke_players = [p for p in players if p.chips <= 0]
-        for p in broke_players:
-            print(f"[ELIMINATED] {p.name} is out of chips and eliminated from the game!")
-            players.remove(p)
-
-        # After eliminations, update dealer_index to next player after previous dealer
-        if players and prev_dealer_name:
-            idx = next((i for i, p in enumerate(players) if p.name == prev_dealer_name), None)
-            if idx is not None:
-                dealer_index = (idx - 1) % len(players)
-            else:
-                dealer_index = 0
-            game_state.dealer_index = dealer_index
+        if stats is None:
+            hand_over = yield from _betting_round_steps(game_state, display)
+        else:
+            dealt = perf_counter()
+            stats.add_phase('deal', dealt - start)
+            hand_over = yield from _betting_round_steps(game_state, display)
+            stats.add_phase('betting', perf_counter() - dealt)
 
         # Show chip counts and wait for user
-        print("\nCurrent chip counts:")
+        display.message("\nCurrent chip counts:")
         for p in players:
-            print(f"{p.name}: {p.chips}")
-        GameDisplay.wait_for_user("Press Enter to continue to the next stage...")
-
-        # Prevent next stage if only one player remains
-        active_players = [p for p in players if not p.folded]
-        if hand_over or len(active_players) <= 1:
-            return dealer_index
-
-    # === Showdown and hand evaluation ===
-    active_players = [p for p in players if not p.folded]
-    if len(active_players) > 1:
-        evaluator = Evaluator()
+            display.message(f"{p.name}: {p.chips}")
+        display.pause("Press Enter to continue to the next stage...")
+
+        if hand_over:
+            break
+
+    # === Showdown and pot settlement ===
+    if stats is not None:
+        start = perf_counter()
+    live = [i for i, f in enumerate(game_state.folded) if not f]
+    pots = build_pots(game_state.contributions, game_state.folded)
+    if len(live) > 1:
         hand_ranks = []
-        for p in active_players:
-            rank = evaluator.evaluate(p.hand, community_cards)
-            desc = evaluator.class_to_string(evaluator.get_rank_class(rank))
-            hand_ranks.append((p, rank, desc))
+        ranks = {}
+        for i in live:
+            p = players[i]
+            rank = evaluate_hand(p.hand, community_cards)
+            ranks[i] = rank
+            hand_ranks.append((p, rank, rank_description(rank)))
         hand_ranks.sort(key=lambda x: x[1])
-        best_rank = hand_ranks[0][1]
-        winners = [p for p, r, d in hand_ranks if r == best_rank]
-        win_names = ", ".join([w.name for w in winners])
-        win_desc = hand_ranks[0][2]
-        # Split pot if tie
-        pot_share = game_state.pot // len(winners)
-        for w in winners:
-            w.chips += pot_share
-        GameDisplay.display_game_summary(
+        payouts = settle_pots(pots, ranks, dealer_index, len(players))
+        if stats is not None:
+            stats.count('evaluator_calls', len(live))
+        display.game_summary(
             [(p.name, r, d) for p, r, d in hand_ranks], community_cards
         )
-        print(
-            f"\n[WIN] {win_names} win(s) the pot of {game_state.pot} chips with {win_desc}!")
-        game_state.pot = 0
-    elif len(active_players) == 1:
-        winner = active_players[0]
-        winner.chips += game_state.pot
-        print(
+        descriptions = {p.name: d for p, r, d in hand_ranks}
+        for seat, won in payouts.items():
+            winner = players[seat]
+            game_state.award(winner, won)
+            display.message(
+                f"\n[WIN] {winner.name} wins {won} chips with {descriptions[winner.name]}!")
+    else:
+        winner = players[live[0]]
+        game_state.award(winner, game_state.pot)
+        display.message(
             f"\n[WIN] {winner.name} wins the pot of {game_state.pot} chips! (everyone else folded)")
-        game_state.pot = 0
+    game_state.pot = 0
+    if stats is not None:
+        stats.add_phase('showdown', perf_counter() - start)
+
+    if recorder is not None:
+        recorder.record_hand(seed, start_dealer, seats, chips_start,
+                             community_cards, game_state.action_history)
+    if tracker is not None:
+        tracker.record_hand(seats, chips_start, game_state.action_history, game_state.big_blind)
+
+    # Move the button to the next seat still playing, then remove broke players
+    n = len(players)
+    next_dealer = next((players[(dealer_index + k) % n] for k in range(1, n + 1)
+                        if players[(dealer_index + k) % n].chips > 0), None)
+    for p in [p for p in players if p.chips <= 0]:
+        display.message(f"[ELIMINATED] {p.name} is out of chips and eliminated from the game!")
+        game_state.eliminate(p)
+    dealer_index = players.index(next_dealer) if next_dealer is not None else 0
 
     # Pause before new hand
-    GameDisplay.wait_for_user("Press Enter to start a new hand...")
+    display.pause("Press Enter to start a new hand...")
 
     # Final dealer_index update and print
     if len(players) > 0:
-        print(f"\nDealer button moves to {players[dealer_index].name}.")
+        display.message(f"\nDealer button moves to {players[dealer_index].name}.")
     else:
-        print("\nNo players left to rotate dealer.")
-    print("\n=== Hand complete ===")
+        display.message("\nNo players left to rotate dealer.")
+    display.message("\n=== Hand complete ===")
+    display.end_hand()
     return dealer_index
+
+
+def run_tournament(players, num_hands, seed=None, display=None, recorder=None, stats=None,
+                   tracker=None):
+    """
+    Play up to num_hands hands headlessly and return a results summary.
+
+    All output and pauses go through the display sink (NullSink by default),
+    so nothing blocks on input(). Each hand gets its own deck seed drawn from
+    a generator seeded with `seed`, which makes whole runs reproducible.
+    Pass a hand-history writer as `recorder` to log every hand, and a
+    profiling.EngineStats as `stats` to time every phase and bot decision,
+    and a session_stats.SessionStats as `tracker` for per-bot VPIP, PFR,
+    aggression and bb/100.
+
+    Returns:
+        dict with 'hands_played', 'chips' ({name: final chips}) and
+        'hands_won' ({name: hands where the player gained chips}).
+    """
+    if display is None:
+        display = NullSink()
+    if stats is not None:
+        display = TimedSink(display, stats)
+    return _drive(_tournament_steps(players, num_hands, seed, display, recorder, stats, tracker),
+                  stats)
+
+
+def _tournament_steps(players, num_hands, seed, display, recorder=None, stats=None,
+                      tracker=None):
+    """run_tournament as a generator of decision requests (see _betting_round_steps)."""
+    started = perf_counter()
+    rng = random.Random(seed)
+    deck = FastDeck()
+    seated = list(players)
+    hands_won = {p.name: 0 for p in seated}
+    dealer_index = 0
+    hands_played = 0
+
+    while hands_played < num_hands and len(players) > 1:
+        before = [p.chips for p in seated]
+        dealer_index = yield from _hand_steps(players, dealer_index, display,
+                                              rng.getrandbits(32), deck, recorder, stats,
+                                              tracker)
+        hands_played += 1
+        for p, chips in zip(seated, before):
+            if p.chips > chips:
+                hands_won[p.name] += 1
+
+    if stats is not None:
+        stats.wall_time += perf_counter() - started
+    return {
+        'hands_played': hands_played,
+        'chips': {p.name: max(0, p.chips) if p in players else 0 for p in seated},
+        'hands_won': hands_won,
+    }
+
+
+def run_tables(tables, num_hands, seed=None, display=None):
+    """
+    Play many independent tables in lockstep, batching bot decisions.
+
+    Each round, every table advances to its next decision; the pending
+    decisions are grouped by bot.batch_key() and each group is answered by
+    one make_decisions_batch call. Bots that share a model (e.g. a neural
+    net) return the same batch key and so evaluate all their tables'
+    decisions in a single forward pass.
+
+    Args:
+        tables: List of player lists, one per table (each table needs its
+            own bot instances).
+        num_hands: Hand limit per table, as in run_tournament.
+        seed: Base seed; table i gets its own seed drawn from it.
+        display: Sink shared by all tables (NullSink by default).
+
+    Returns:
+        One run_tournament-style result dict per table.
+    """
+    if display is None:
+        display = NullSink()
+    rng = random.Random(seed)
+    runs = [_tournament_steps(players, num_hands, rng.getrandbits(32), display)
+            for players in tables]
+    results = [None] * len(runs)
+
+    pending = {}  # table index -> (player, observation)
+    for i, run in enumerate(runs):
+        try:
+            pending[i] = next(run)
+        except StopIteration as stop:
+            results[i] = stop.value
+
+    while pending:
+        groups = {}
+        for i, (player, _) in pending.items():
+            groups.setdefault(player.batch_key(), []).append(i)
+
+        answered = {}
+        for indices in groups.values():
+            bot = pending[indices[0]][0]
+            decisions = bot.make_decisions_batch([pending[i][1] for i in indices])
+            for i, decision in zip(indices, decisions):
+                try:
+                    answered[i] = runs[i].send(decision)
+                except StopIteration as stop:
+                    results[i] = stop.value
+        pending = answered
+
+    return results
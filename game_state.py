@@ -1,9 +1,84 @@
+from types import MappingProxyType
+
+from rules import legal_actions
+
+
+class _ToCallView:
+    """
+    Read-only mapping {player_name: amount to call} for players still in the hand.
+
+    Computed per lookup from the current bet and the seat's bet, so a raise
+    doesn't have to touch every seat.
+    """
+
+    __slots__ = ('_state',)
+
+    def __init__(self, state):
+        self._state = state
+
+    def __getitem__(self, name):
+        state = self._state
+        seat = state._seat_of[name]
+        if state.folded[seat]:
+            raise KeyError(name)
+        return max(0, state.current_bet - state.bets[seat])
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def __contains__(self, name):
+        seat = self._state._seat_of.get(name)
+        return seat is not None and not self._state.folded[seat]
+
+    def __iter__(self):
+        return iter(self._state._active_stacks)
+
+    def __len__(self):
+        return self._state.num_active
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+    def values(self):
+        return [self[name] for name in self]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
 
 
 class GameState:
+    """
+    Round/stage state for one hand.
+
+    Per-seat data lives in index-based lists (names, stacks, bets, folded,
+    all_in, contributions, acted) and the derived views (player_stacks,
+    active_player_stacks, to_call, player_positions) are kept up to date by
+    the event methods below, so reading them is O(1). The engine must go
+    through post_bet / fold / reset_bets / eliminate rather than mutating
+    players directly; those methods also keep the player objects in sync.
+
+    The dicts returned by the views are shared; treat them as read-only.
+    """
+
+    __slots__ = (
+        'players', '_dealer_index', 'bet_holder', 'stage', 'stages', 'active_players',
+        'pot', 'current_bet', 'min_raise', 'big_blind', 'small_blind', 'action_history',
+        'community_cards', 'eliminated_players', 'last_action', 'num_raises_this_round',
+        'num_players', 'betting_order', 'player_bet', 'opponent_stacks', 'player_position',
+        # Per-seat arrays and incrementally maintained views
+        'names', 'stacks', 'bets', 'folded', 'all_in', 'contributions', 'acted', 'num_active',
+        '_seat_of', '_stacks', '_active_stacks', '_to_call', '_positions',
+    )
+
     def __init__(self, players):
         self.players = players
-        self.dealer_index = 0
+        self._dealer_index = 0
         self.bet_holder = None  # Tracks last raiser
         self.stage = "pre-flop"
         self.stages = ["pre-flop", "flop", "turn", "river"]
@@ -25,28 +100,138 @@ class GameState:
         self.opponent_stacks = {}  # {player_name: chips}
         self.player_position = {}  # {player_name: position index}
 
+        self._to_call = _ToCallView(self)
+        self._rebuild_seats()
+
+    def _rebuild_seats(self):
+        """Recompute all per-seat arrays from the player objects (O(players))."""
+        players = self.players
+        self.names = [p.name for p in players]
+        self.stacks = [p.chips for p in players]
+        self.bets = [getattr(p, 'current_bet', 0) for p in players]
+        self.folded = [getattr(p, 'folded', False) for p in players]
+        self.all_in = [p.chips <= 0 for p in players]
+        self.contributions = [0] * len(players)  # Chips committed this hand, for side pots
+        self.acted = [False] * len(players)  # Acted since the street's last full raise
+        self.num_active = self.folded.count(False)
+        self.num_players = len(players)
+        self._seat_of = {name: i for i, name in enumerate(self.names)}
+        self._stacks = dict(zip(self.names, self.stacks))
+        self._active_stacks = {n: c for n, c, f in zip(self.names, self.stacks, self.folded) if not f}
+        self._positions = None
+
+    # ===== EVENTS =====
+
+    def seat_of(self, player) -> int:
+        return self._seat_of[player.name]
+
+    def post_bet(self, player, amount: int) -> int:
+        """
+        Move `amount` chips from a player's stack into the pot.
+
+        A player can never bet more than they have: the amount is capped at
+        their stack, and a player who puts in their last chip is all-in.
+        Returns the amount actually posted.
+        """
+        seat = self._seat_of[player.name]
+        amount = max(0, min(amount, player.chips))
+        player.chips -= amount
+        player.current_bet += amount
+        self.pot += amount
+        self.stacks[seat] = player.chips
+        self.bets[seat] = player.current_bet
+        self.contributions[seat] += amount
+        if player.chips == 0:
+            self.all_in[seat] = True
+        self._stacks[player.name] = player.chips
+        if not self.folded[seat]:
+            self._active_stacks[player.name] = player.chips
+        return amount
+
+    def can_act(self, seat: int) -> bool:
+        """Whether the seat still makes betting decisions (in the hand and not all-in)."""
+        return not self.folded[seat] and not self.all_in[seat]
+
+    def legal_actions(self, seat: int):
+        """The seat's legal moves right now (rules.LegalActions)."""
+        return legal_actions(self.stacks[seat], self.bets[seat], self.current_bet, self.min_raise,
+                             not self.acted[seat])
+
+    def award(self, player, amount: int):
+        """Pay `amount` chips to a player (the pot is settled by the caller)."""
+        player.chips += amount
+        seat = self._seat_of.get(player.name)
+        if seat is not None:
+            self.stacks[seat] = player.chips
+            self._stacks[player.name] = player.chips
+            if not self.folded[seat]:
+                self._active_stacks[player.name] = player.chips
+
+    def fold(self, player):
+        seat = self._seat_of[player.name]
+        player.folded = True
+        if not self.folded[seat]:
+            self.folded[seat] = True
+            self.num_active -= 1
+            del self._active_stacks[player.name]
+
+    def record_action(self, player_name, action, amount):
+        """Append a read-only {'player', 'action', 'amount', 'stage'} entry to the history."""
+        entry = MappingProxyType(
+            {'player': player_name, 'action': action, 'amount': amount, 'stage': self.stage})
+        self.action_history.append(entry)
+        self.last_action = entry
+
+    def reset_bets(self):
+        """Start a new street: clear every seat's bet and the current bet."""
+        for p in self.players:
+            p.current_bet = 0
+        self.bets = [0] * len(self.players)
+        self.acted = [False] * len(self.players)
+        self.current_bet = 0
+
+    def eliminate(self, player):
+        """Remove a broke player from the table (between hands; rare, so O(players))."""
+        self.players.remove(player)
+        self.eliminated_players.append(player)
+        self._rebuild_seats()
+
+    # ===== VIEWS =====
+
+    @property
+    def dealer_index(self):
+        return self._dealer_index
+
+    @dealer_index.setter
+    def dealer_index(self, value):
+        self._dealer_index = value
+        self._positions = None
+
     @property
     def pot_value(self):
         return self.pot
 
     @property
     def player_stacks(self):
-        return {p.name: p.chips for p in self.players}
+        return self._stacks
 
     @property
     def active_player_stacks(self):
-        return {p.name: p.chips for p in self.players if not getattr(p, 'folded', False)}
+        return self._active_stacks
 
     @property
     def to_call(self):
-        # Returns a dict of how much each player needs to call
-        return {p.name: max(0, self.current_bet - getattr(p, 'current_bet', 0)) for p in self.players if not getattr(p, 'folded', False)}
+        # How much each player still in the hand needs to call
+        return self._to_call
 
     @property
     def player_positions(self):
-        # Returns a dict of player positions relative to dealer
-        n = len(self.players)
-        return {p.name: (i - self.dealer_index) % n for i, p in enumerate(self.players)}
+        # Player positions relative to dealer; rebuilt only when the button or seats change
+        if self._positions is None:
+            n = len(self.names)
+            self._positions = {name: (i - self._dealer_index) % n
+                               for i, name in enumerate(self.names)}
+        return self._positions
 
     def update_betting_order(self, order):
         self.betting_order = order
@@ -55,7 +240,7 @@ class GameState:
         self.player_bet[player_name] = amount
 
     def update_opponent_stacks(self):
-        self.opponent_stacks = {p.name: p.chips for p in self.players if not getattr(p, 'folded', False)}
+        self.opponent_stacks = dict(self._active_stacks)
 
     def update_player_position(self):
         self.player_position = self.player_positions
@@ -64,9 +249,7 @@ class GameState:
     def reset_for_stage(self, stage):
         self.stage = stage
         self.bet_holder = None
-        print(f"\n=== Starting {stage.upper()} ===")
-        self.debug_active_players()
 
     def debug_active_players(self):
         active = [p.name for p in self.active_players if not getattr(p, 'folded', False)]
-        print(f"Active Players: {active}")
\ No newline at end of file
+        print(f"Active Players: {active}")
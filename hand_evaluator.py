@@ -0,0 +1,291 @@
+"""
+Lookup-table hand evaluator returning treys-compatible ranks (1 = royal flush,
+7462 = worst high card).
+
+A hand is reduced to two additive keys:
+  * rank key: sum of a per-rank weight chosen so that every multiset of up to
+    seven ranks (at most four of each) has a unique sum - a perfect hash.
+  * suit key: one octal digit per suit counting cards of that suit, which
+    tells us in one lookup whether (and in which suit) there is a flush.
+Non-flush hands index a rank-key table; flushes index a 13-bit rank-mask table.
+The tables are built once from treys' own 5-card lookups, cached to disk and
+memory-mapped, so a 7-card hand costs a handful of additions and one lookup
+instead of treys' 21 five-card evaluations.
+
+NumPy is only imported when the tables are first loaded.
+"""
+import os
+from bisect import bisect_left
+from itertools import combinations, combinations_with_replacement
+from typing import TYPE_CHECKING, List
+
+from treys.lookup import LookupTable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+TABLE_VERSION = 1
+
+# Per-rank weights (deuce..ace) whose sums over any <=7-card rank multiset are unique
+RANK_KEYS = (0, 1, 5, 22, 98, 453, 2031, 8698, 22854, 83661, 262349, 636345, 1479181)
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# treys suit bits (1, 2, 4, 8) -> octal digit for the suit key
+_SUIT_ONE = [0] * 16
+for _bit, _shift in ((1, 0), (2, 3), (4, 6), (8, 9)):
+    _SUIT_ONE[_bit] = 1 << _shift
+
+_CLASS_BOUNDS = sorted(LookupTable.MAX_TO_RANK_CLASS)
+
+_flush = None          # list: rank mask -> rank (0 when fewer than 5 bits)
+_flush_suit = None     # list: suit key -> treys suit bits << 12 (0 when no flush)
+_nonflush7 = None      # array: rank key of 7 cards -> rank (memory-mapped)
+_nonflush_small = None  # {5: {rank key: rank}, 6: {...}}
+_arrays = None         # NumPy copies of the above for evaluate_batch
+
+
+def cache_dir() -> str:
+    """Directory for generated tables ($TEXASHOLDEM_CACHE or ~/.cache/texasholdem)."""
+    return os.environ.get("TEXASHOLDEM_CACHE") or os.path.join(
+        os.path.expanduser("~"), ".cache", "texasholdem")
+
+
+# ===== TABLE GENERATION =====
+
+def _build_tables():
+    """Compute all lookup tables from treys' 5-card tables (about a second)."""
+    import numpy as np
+    table = LookupTable()
+
+    flush = np.zeros(1 << 13, dtype=np.int16)
+    for n in (5, 6, 7):
+        for ranks in combinations(range(13), n):
+            best = min(
+                table.flush_lookup[_prime_product(five)] for five in combinations(ranks, 5))
+            flush[sum(1 << r for r in ranks)] = best
+
+    flush_suit = np.zeros(1 << 12, dtype=np.int32)
+    for key in range(1 << 12):
+        for bit, shift in ((1, 0), (2, 3), (4, 6), (8, 9)):
+            if (key >> shift) & 7 >= 5:
+                flush_suit[key] = bit << 12
+
+    nonflush = {}
+    for n in (5, 6, 7):
+        keys, ranks = [], []
+        for multiset in combinations_with_replacement(range(13), n):
+            if any(multiset.count(r) > 4 for r in set(multiset)):
+                continue
+            keys.append(sum(RANK_KEYS[r] for r in multiset))
+            ranks.append(min(
+                table.unsuited_lookup[_prime_product(five)]
+                for five in combinations(multiset, 5)))
+        order = np.argsort(keys)
+        nonflush[n] = (np.array(keys, dtype=np.int64)[order],
+                       np.array(ranks, dtype=np.int16)[order])
+
+    keys7, ranks7 = nonflush[7]
+    nonflush7 = np.zeros(int(keys7[-1]) + 1, dtype=np.int16)
+    nonflush7[keys7] = ranks7
+
+    return {
+        'flush': flush,
+        'flush_suit': flush_suit,
+        'nonflush7': nonflush7,
+        'keys5': nonflush[5][0], 'ranks5': nonflush[5][1],
+        'keys6': nonflush[6][0], 'ranks6': nonflush[6][1],
+    }
+
+
+def _prime_product(ranks) -> int:
+    product = 1
+    for r in ranks:
+        product *= PRIMES[r]
+    return product
+
+
+def _table_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"hand_ranks_v{TABLE_VERSION}_{name}.npy")
+
+
+def _save_atomic(path: str, array: "np.ndarray"):
+    import tempfile
+    import numpy as np
+    # Write-then-rename so concurrent worker processes never see a partial file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def load_tables(directory: str = None, rebuild: bool = False):
+    """
+    Load the lookup tables, building and caching them on first use.
+
+    Called automatically by the evaluate functions; call it explicitly to
+    pay the one-off cost up front (e.g. before forking workers).
+    """
+    import numpy as np
+    global _flush, _flush_suit, _nonflush7, _nonflush_small, _arrays
+    directory = directory or cache_dir()
+    names = ('flush', 'flush_suit', 'nonflush7', 'keys5', 'ranks5', 'keys6', 'ranks6')
+
+    if rebuild or not all(os.path.exists(_table_path(directory, n)) for n in names):
+        os.makedirs(directory, exist_ok=True)
+        for name, array in _build_tables().items():
+            _save_atomic(_table_path(directory, name), array)
+
+    arrays = {n: np.load(_table_path(directory, n), mmap_mode='r').view(np.ndarray)
+              for n in names}
+    _flush = arrays['flush'].tolist()
+    _flush_suit = arrays['flush_suit'].tolist()
+    _nonflush7 = arrays['nonflush7']
+    _nonflush_small = {
+        n: dict(zip(arrays[f'keys{n}'].tolist(), arrays[f'ranks{n}'].tolist()))
+        for n in (5, 6)
+    }
+    arrays['rank_keys'] = np.array(RANK_KEYS, dtype=np.int64)
+    arrays['suit_one'] = np.array(_SUIT_ONE, dtype=np.int64)
+    _arrays = arrays
+    return arrays
+
+
+# ===== EVALUATION =====
+
+def evaluate(cards: List[int]) -> int:
+    """
+    Rank of the best 5-card hand among 5-7 treys card ints (lower is better).
+    """
+    if _flush is None:
+        load_tables()
+    rank_key = 0
+    suit_key = 0
+    for c in cards:
+        rank_key += RANK_KEYS[(c >> 8) & 0xF]
+        suit_key += _SUIT_ONE[(c >> 12) & 0xF]
+
+    suit = _flush_suit[suit_key]
+    if suit:
+        mask = 0
+        for c in cards:
+            if c & suit:
+                mask |= c >> 16
+        return _flush[mask]
+    if len(cards) == 7:
+        return int(_nonflush7[rank_key])
+    return _nonflush_small[len(cards)][rank_key]
+
+
+def hand_keys(cards: List[int]):
+    """(rank key, suit key) of some cards; keys of disjoint card sets add up."""
+    rank_key = 0
+    suit_key = 0
+    for c in cards:
+        rank_key += RANK_KEYS[(c >> 8) & 0xF]
+        suit_key += _SUIT_ONE[(c >> 12) & 0xF]
+    return rank_key, suit_key
+
+
+def evaluate_keys(rank_key: int, suit_key: int, cards: List[int]) -> int:
+    """
+    evaluate() for 5-7 cards whose keys are already known (see hand_keys),
+    e.g. the previous street's keys plus the new board card.
+    """
+    if _flush is None:
+        load_tables()
+    suit = _flush_suit[suit_key]
+    if suit:
+        mask = 0
+        for c in cards:
+            if c & suit:
+                mask |= c >> 16
+        return _flush[mask]
+    if len(cards) == 7:
+        return int(_nonflush7[rank_key])
+    return _nonflush_small[len(cards)][rank_key]
+
+
+def evaluate_showdown(holes: List[List[int]], board: List[int]) -> List[int]:
+    """
+    Ranks of several two-card hands on one complete 5-card board.
+
+    Same results as evaluate(hole + board) per hand, but the board's keys
+    are summed once, which matters in search rollouts.
+    """
+    if _flush is None:
+        load_tables()
+    board_rank = 0
+    board_suit = 0
+    for c in board:
+        board_rank += RANK_KEYS[(c >> 8) & 0xF]
+        board_suit += _SUIT_ONE[(c >> 12) & 0xF]
+    ranks = []
+    for a, b in holes:
+        suit = _flush_suit[board_suit + _SUIT_ONE[(a >> 12) & 0xF] + _SUIT_ONE[(b >> 12) & 0xF]]
+        if suit:
+            mask = 0
+            for c in board:
+                if c & suit:
+                    mask |= c >> 16
+            if a & suit:
+                mask |= a >> 16
+            if b & suit:
+                mask |= b >> 16
+            ranks.append(_flush[mask])
+        else:
+            ranks.append(int(_nonflush7[board_rank + RANK_KEYS[(a >> 8) & 0xF]
+                                        + RANK_KEYS[(b >> 8) & 0xF]]))
+    return ranks
+
+
+def evaluate_hand(hand: List[int], board: List[int]) -> int:
+    """Drop-in for treys Evaluator.evaluate(hand, board)."""
+    return evaluate(hand + board)
+
+
+def evaluate_batch(cards) -> "np.ndarray":
+    """
+    Evaluate an (n, k) array of treys card ints, k in 5..7, in one pass.
+
+    Returns an int16 array of n treys-compatible ranks.
+    """
+    import numpy as np
+    if _arrays is None:
+        load_tables()
+    cards = np.asarray(cards, dtype=np.int64)
+    k = cards.shape[1]
+
+    rank_key = _arrays['rank_keys'][(cards >> 8) & 0xF].sum(axis=1)
+    suit_key = _arrays['suit_one'][(cards >> 12) & 0xF].sum(axis=1)
+    suit = _arrays['flush_suit'][suit_key]
+
+    if k == 7:
+        ranks = _arrays['nonflush7'][rank_key]
+    else:
+        keys, values = _arrays[f'keys{k}'], _arrays[f'ranks{k}']
+        idx = np.minimum(np.searchsorted(keys, rank_key), len(keys) - 1)
+        ranks = values[idx]
+
+    has_flush = suit != 0
+    if has_flush.any():
+        flush_cards = cards[has_flush]
+        in_suit = (flush_cards & suit[has_flush, None]) != 0
+        mask = np.bitwise_or.reduce(np.where(in_suit, flush_cards >> 16, 0), axis=1)
+        ranks = ranks.copy()
+        ranks[has_flush] = _arrays['flush'][mask]
+    return ranks
+
+
+def rank_class(rank: int) -> int:
+    """treys rank class (0 = royal flush ... 9 = high card)."""
+    return LookupTable.MAX_TO_RANK_CLASS[_CLASS_BOUNDS[bisect_left(_CLASS_BOUNDS, rank)]]
+
+
+def rank_description(rank: int) -> str:
+    """Human-readable hand class, e.g. 'Full House'."""
+    return LookupTable.RANK_CLASS_TO_STRING[rank_class(rank)]
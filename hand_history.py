@@ -0,0 +1,267 @@
+"""
+Append-only, columnar hand-history store with deterministic replay.
+
+A history file is a magic header followed by blocks. Each block holds up to
+`block_size` hands as NumPy column arrays (one array per field, like a
+Parquet row group) serialized with np.savez and prefixed by a small struct
+header, so blocks can be skipped without decoding them:
+
+    hands:   hand_id, seed, dealer_index, num_seats, seat_start,
+             board (5 cards, 0-padded), num_board, pot, action_start, num_actions
+    seats:   seat_name, seat_hole (2 cards), seat_chips_start, seat_chips_end
+    actions: action_seat, action_stage, action_code, action_amount
+
+`pot` is the settled pot: every chip put in, less any uncalled bet that went
+back to its owner.
+
+Every hand is replayable on its own: replay_hand() rebuilds the seats from
+the record and re-runs play_hand with the recorded deck seed.
+"""
+import io
+import os
+import struct
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+MAGIC = b"THHIST01"
+BLOCK_HEADER = struct.Struct("<QQI")  # payload bytes, first hand id, hand count
+
+STAGES = ("pre-flop", "flop", "turn", "river")
+ACTIONS = ("small blind", "big blind", "fold", "check", "call", "raise", "call and raise")
+_STAGE_CODES = {s: i for i, s in enumerate(STAGES)}
+_ACTION_CODES = {a: i for i, a in enumerate(ACTIONS)}
+
+
+class HandHistoryWriter:
+    """
+    Streaming writer: buffers hands in column lists and flushes full blocks.
+
+    Pass it to play_hand / run_tournament as `recorder`. Opening an existing
+    file appends to it and continues its hand ids.
+
+    Example:
+        with HandHistoryWriter("session.thh") as recorder:
+            run_tournament(players, 100000, seed=7, recorder=recorder)
+    """
+
+    def __init__(self, path: str, block_size: int = 4096):
+        self.path = path
+        self.block_size = block_size
+        self.next_hand_id = 0
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            for first_id, count, _, _ in _scan_blocks(path):
+                self.next_hand_id = first_id + count
+            self._file = open(path, "ab")
+        else:
+            self._file = open(path, "wb")
+            self._file.write(MAGIC)
+        self._reset_buffers()
+
+    def _reset_buffers(self):
+        self._hands = {k: [] for k in ("hand_id", "seed", "dealer_index", "num_seats",
+                                       "seat_start", "board", "num_board", "pot",
+                                       "action_start", "num_actions")}
+        self._seats = {k: [] for k in ("seat_name", "seat_hole", "seat_chips_start",
+                                       "seat_chips_end")}
+        self._actions = {k: [] for k in ("action_seat", "action_stage", "action_code",
+                                         "action_amount")}
+
+    def record_hand(self, seed: int, dealer_index: int, seats: List, chips_start: List[int],
+                    community_cards: List[int], action_history: List[Dict[str, Any]]) -> int:
+        """
+        Buffer one finished hand; returns its hand id.
+
+        Args:
+            seats: Player objects in seat order as dealt (including any
+                eliminated during the hand).
+            chips_start: Each seat's stack before the blinds.
+        """
+        hand_id = self.next_hand_id
+        self.next_hand_id += 1
+        seat_of = {p.name: i for i, p in enumerate(seats)}
+
+        hands, seat_cols, action_cols = self._hands, self._seats, self._actions
+        hands["hand_id"].append(hand_id)
+        hands["seed"].append(seed)
+        hands["dealer_index"].append(dealer_index)
+        hands["num_seats"].append(len(seats))
+        hands["seat_start"].append(len(seat_cols["seat_name"]))
+        hands["board"].append(list(community_cards) + [0] * (5 - len(community_cards)))
+        hands["num_board"].append(len(community_cards))
+        hands["pot"].append(_settled_pot(action_history))
+        hands["action_start"].append(len(action_cols["action_seat"]))
+        hands["num_actions"].append(len(action_history))
+
+        for p, chips in zip(seats, chips_start):
+            seat_cols["seat_name"].append(p.name)
+            seat_cols["seat_hole"].append(list(p.hand))
+            seat_cols["seat_chips_start"].append(chips)
+            seat_cols["seat_chips_end"].append(p.chips)
+
+        for a in action_history:
+            action_cols["action_seat"].append(seat_of[a['player']])
+            action_cols["action_stage"].append(_STAGE_CODES[a['stage']])
+            action_cols["action_code"].append(_ACTION_CODES[a['action']])
+            action_cols["action_amount"].append(a['amount'])
+
+        if len(hands["hand_id"]) >= self.block_size:
+            self.flush()
+        return hand_id
+
+    def flush(self):
+        """Write buffered hands as one block."""
+        hands = self._hands
+        if not hands["hand_id"]:
+            return
+        columns = {
+            "hand_id": np.array(hands["hand_id"], dtype=np.uint64),
+            "seed": np.array(hands["seed"], dtype=np.uint64),
+            "dealer_index": np.array(hands["dealer_index"], dtype=np.uint8),
+            "num_seats": np.array(hands["num_seats"], dtype=np.uint8),
+            "seat_start": np.array(hands["seat_start"], dtype=np.uint32),
+            "board": np.array(hands["board"], dtype=np.int32).reshape(-1, 5),
+            "num_board": np.array(hands["num_board"], dtype=np.uint8),
+            "pot": np.array(hands["pot"], dtype=np.int64),
+            "action_start": np.array(hands["action_start"], dtype=np.uint32),
+            "num_actions": np.array(hands["num_actions"], dtype=np.uint16),
+            "seat_name": np.array(self._seats["seat_name"], dtype=str),
+            "seat_hole": np.array(self._seats["seat_hole"], dtype=np.int32).reshape(-1, 2),
+            "seat_chips_start": np.array(self._seats["seat_chips_start"], dtype=np.int64),
+            "seat_chips_end": np.array(self._seats["seat_chips_end"], dtype=np.int64),
+            "action_seat": np.array(self._actions["action_seat"], dtype=np.uint8),
+            "action_stage": np.array(self._actions["action_stage"], dtype=np.uint8),
+            "action_code": np.array(self._actions["action_code"], dtype=np.uint8),
+            "action_amount": np.array(self._actions["action_amount"], dtype=np.int64),
+        }
+        payload = io.BytesIO()
+        np.savez(payload, **columns)
+        data = payload.getvalue()
+        self._file.write(BLOCK_HEADER.pack(len(data), hands["hand_id"][0], len(hands["hand_id"])))
+        self._file.write(data)
+        self._file.flush()
+        self._reset_buffers()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _settled_pot(action_history: List[Dict[str, Any]]) -> int:
+    """Chips that were actually contested: everything put in, less the uncalled bet."""
+    put_in = {}
+    for a in action_history:
+        put_in[a['player']] = put_in.get(a['player'], 0) + a['amount']
+    top, second = (sorted(put_in.values(), reverse=True) + [0, 0])[:2]
+    # Whatever the biggest bettor put in beyond the next seat goes back to them
+    return sum(put_in.values()) - (top - second)
+
+
+def _scan_blocks(path: str):
+    """Yield (first_hand_id, count, payload_offset, payload_size) for each block."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a hand-history file")
+        while True:
+            header = f.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                return
+            size, first_id, count = BLOCK_HEADER.unpack(header)
+            yield first_id, count, f.tell(), size
+            f.seek(size, os.SEEK_CUR)
+
+
+class HandHistoryReader:
+    """
+    Read a history file block by block.
+
+    Iterating yields one dict per hand; read_block/get decode only the block
+    that is needed, so fetching one hand from a huge session is cheap.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.blocks = list(_scan_blocks(path))
+
+    def __len__(self):
+        return sum(count for _, count, _, _ in self.blocks)
+
+    def read_block(self, index: int) -> Dict[str, np.ndarray]:
+        """All column arrays of one block."""
+        _, _, offset, size = self.blocks[index]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read(size)
+        with np.load(io.BytesIO(data)) as columns:
+            return {name: columns[name] for name in columns.files}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index, (_, count, _, _) in enumerate(self.blocks):
+            columns = self.read_block(index)
+            for row in range(count):
+                yield _hand_from_columns(columns, row)
+
+    def get(self, hand_id: int) -> Dict[str, Any]:
+        """The record of one hand, by id."""
+        for index, (first_id, count, _, _) in enumerate(self.blocks):
+            if first_id <= hand_id < first_id + count:
+                return _hand_from_columns(self.read_block(index), hand_id - first_id)
+        raise KeyError(f"No hand {hand_id} in {self.path}")
+
+
+def _hand_from_columns(columns: Dict[str, np.ndarray], row: int) -> Dict[str, Any]:
+    seats = slice(int(columns["seat_start"][row]),
+                  int(columns["seat_start"][row]) + int(columns["num_seats"][row]))
+    acts = slice(int(columns["action_start"][row]),
+                 int(columns["action_start"][row]) + int(columns["num_actions"][row]))
+    names = columns["seat_name"][seats].tolist()
+    return {
+        'hand_id': int(columns["hand_id"][row]),
+        'seed': int(columns["seed"][row]),
+        'dealer_index': int(columns["dealer_index"][row]),
+        'names': names,
+        'hole_cards': columns["seat_hole"][seats].tolist(),
+        'chips_start': columns["seat_chips_start"][seats].tolist(),
+        'chips_end': columns["seat_chips_end"][seats].tolist(),
+        'community_cards': columns["board"][row][:int(columns["num_board"][row])].tolist(),
+        'pot': int(columns["pot"][row]),
+        'actions': [
+            {'player': names[seat], 'action': ACTIONS[code], 'amount': amount,
+             'stage': STAGES[stage]}
+            for seat, stage, code, amount in zip(
+                columns["action_seat"][acts].tolist(), columns["action_stage"][acts].tolist(),
+                columns["action_code"][acts].tolist(), columns["action_amount"][acts].tolist())
+        ],
+    }
+
+
+def replay_hand(record: Dict[str, Any], players: List, display=None, recorder=None) -> List:
+    """
+    Re-execute one recorded hand from its seed.
+
+    Args:
+        record: A hand dict from HandHistoryReader.
+        players: Bots to seat, matched to the record by name. Use fresh
+            instances of the same bot classes for a faithful replay.
+        display: Display sink (defaults to NullSink).
+        recorder: Optional writer to capture the replayed hand for comparison.
+
+    Returns:
+        The seated players, with chips as they ended the replayed hand.
+    """
+    from display import NullSink
+    from game_engine import play_hand
+
+    by_name = {p.name: p for p in players}
+    seated = [by_name[name] for name in record['names']]
+    for p, chips in zip(seated, record['chips_start']):
+        p.chips = chips
+    play_hand(list(seated), record['dealer_index'], display=display or NullSink(),
+              seed=record['seed'], recorder=recorder)
+    return seated
@@ -0,0 +1,362 @@
+"""
+Suit isomorphism: canonical forms and dense indices for hands and boards.
+
+Renaming suits never changes a hand's value, so AhKh on Qh7d2c and AsKs on
+Qs7c2h are the same situation. Grouping such hands shrinks every key space:
+1,326 starting hands become 169 classes, 22,100 flops 1,755, and 25.9M
+hole+flop pairs 1,286,792.
+
+HandIndexer maps cards to a dense index in [0, size) and back, for any
+sequence of rounds (e.g. (2, 3) = hole cards, then a flop). Order inside a
+round doesn't matter; which round a card belongs to does. It follows the
+per-suit construction of Waugh's "A Fast and Optimal Hand Isomorphism
+Algorithm": each suit's cards are indexed as one rank set per round, suits
+are sorted, and suits with identical shapes are combined as a multiset.
+Indexing costs O(cards) with no tables beyond a few hundred offsets.
+
+    canonical_index(hole, board)     # hole + whole board as one round
+    num_canonical(3)                 # 1286792 hole+flop classes
+    board_texture(board)             # {'paired': ..., 'monotone': ..., ...}
+
+Board textures for every canonical 3-, 4- and 5-card board are computed once
+and cached as small arrays under hand_evaluator.cache_dir().
+"""
+import os
+from bisect import bisect_right
+from functools import lru_cache
+from math import comb
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+from treys import Card
+
+if TYPE_CHECKING:
+    import numpy as np
+
+TEXTURE_VERSION = 1
+
+# treys suit bits (s, h, d, c) -> suit number; canonical suit 0 is spades
+_SUIT_BITS = (1, 2, 4, 8)
+_SUIT_NUMBER = {bit: i for i, bit in enumerate(_SUIT_BITS)}
+_CARDS = [[Card.new(r + s) for s in "shdc"] for r in Card.STR_RANKS]  # [rank][suit] -> int
+
+# Per-board texture columns, all uint8
+TEXTURE_FIELDS = ('high', 'pairs', 'max_rank_count', 'max_suit', 'connected')
+
+_textures = {}  # board size -> structured array indexed by board_index
+
+
+# ===== CANONICAL CARDS =====
+
+def canonical_cards(hole_cards: List[int], board: List[int]) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Suit-isomorphic form of (hole, board) as treys ints.
+
+    Each suit is described by its ranks in the hole and on the board; suits
+    are sorted by that description and renamed s, h, d, c in order. Suits
+    with equal descriptions are interchangeable, so the result is the same
+    for every relabelling of the input. Hole and board come back sorted,
+    highest card first.
+    """
+    ranks = {bit: ([], []) for bit in _SUIT_BITS}
+    for group, cards in enumerate((hole_cards, board)):
+        for c in cards:
+            ranks[(c >> 12) & 0xF][group].append((c >> 8) & 0xF)
+    for hole_ranks, board_ranks in ranks.values():
+        hole_ranks.sort(reverse=True)
+        board_ranks.sort(reverse=True)
+    order = sorted(_SUIT_BITS, key=ranks.__getitem__, reverse=True)
+    suit_map = {bit: i for i, bit in enumerate(order)}
+    hole = sorted((_CARDS[(c >> 8) & 0xF][suit_map[(c >> 12) & 0xF]] for c in hole_cards),
+                  reverse=True)
+    board = sorted((_CARDS[(c >> 8) & 0xF][suit_map[(c >> 12) & 0xF]] for c in board),
+                   reverse=True)
+    return tuple(hole), tuple(board)
+
+
+# ===== INDEXING =====
+
+def _colex(positions: List[int]) -> int:
+    """Colexicographic rank of a set of distinct non-negative ints."""
+    return sum(comb(p, k + 1) for k, p in enumerate(sorted(positions)))
+
+
+# Per 13-bit rank mask: set bits, their count and the set's colex rank
+_RANKS_OF = [[]]
+_POPCOUNT = [0]
+_COLEX13 = [0]
+for _mask in range(1, 1 << 13):
+    _high = _mask.bit_length() - 1
+    _rest = _mask ^ (1 << _high)
+    _RANKS_OF.append(_RANKS_OF[_rest] + [_high])
+    _POPCOUNT.append(_POPCOUNT[_rest] + 1)
+    _COLEX13.append(_COLEX13[_rest] + comb(_high, _POPCOUNT[_rest] + 1))
+
+
+def _uncolex(index: int, size: int) -> List[int]:
+    """The `size`-element set with colexicographic rank `index`, ascending."""
+    positions = []
+    for k in range(size, 0, -1):
+        p = k - 1
+        while comb(p + 1, k) <= index:
+            p += 1
+        positions.append(p)
+        index -= comb(p, k)
+    return positions[::-1]
+
+
+def _shapes(rounds: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+    """Every per-suit shape: cards of one suit per round, at most 13 in total."""
+    shapes = [()]
+    for n in rounds:
+        shapes = [s + (k,) for s in shapes for k in range(min(n, 13 - sum(s)) + 1)]
+    return shapes
+
+
+class HandIndexer:
+    """
+    Dense index of suit-isomorphic hands for a fixed sequence of rounds.
+
+    Example usage:
+        flop = HandIndexer((2, 3))
+        i = flop.index([hole_cards, board])     # 0 <= i < flop.size
+        hole, board = flop.unindex(i)           # a canonical representative
+    """
+
+    def __init__(self, rounds: Sequence[int]):
+        self.rounds = tuple(rounds)
+        if sum(self.rounds) > 52:
+            raise ValueError(f"Cannot deal {sum(self.rounds)} cards")
+        shapes = _shapes(self.rounds)
+        # Per-suit indices of a shape: one rank set per round, mixed radix
+        self._radices = {}
+        self._shape_size = {}
+        for shape in shapes:
+            radices, left = [], 13
+            for k in shape:
+                radices.append(comb(left, k))
+                left -= k
+            self._radices[shape] = radices
+            self._shape_size[shape] = _product(radices)
+
+        # Configurations: the four suits' shapes, sorted descending, adding up to the rounds
+        self._configs = {}    # config -> (offset, [(shape, suits with it, combinations)])
+        self._offsets = []
+        self._config_list = []
+        offset = 0
+        for config in self._enumerate_configs(shapes):
+            groups = []
+            for shape in config:
+                if groups and groups[-1][0] == shape:
+                    groups[-1][1] += 1
+                else:
+                    groups.append([shape, 1])
+            groups = [(shape, m, comb(self._shape_size[shape] + m - 1, m)) for shape, m in groups]
+            self._configs[config] = (offset, groups)
+            self._offsets.append(offset)
+            self._config_list.append(config)
+            offset += _product(g[2] for g in groups)
+        self.size = offset
+
+    def _enumerate_configs(self, shapes):
+        ordered = sorted(shapes, reverse=True)
+        target = self.rounds
+
+        def extend(prefix, remaining, start):
+            if len(prefix) == 4:
+                if not any(remaining):
+                    yield tuple(prefix)
+                return
+            for i in range(start, len(ordered)):
+                shape = ordered[i]
+                if all(k <= r for k, r in zip(shape, remaining)):
+                    yield from extend(prefix + [shape],
+                                      tuple(r - k for r, k in zip(remaining, shape)), i)
+
+        return extend([], target, 0)
+
+    def index(self, cards_by_round: Sequence[Sequence[int]]) -> int:
+        """
+        Index of a hand given as one list of treys ints per round.
+
+        Raises ValueError if the round sizes don't match or a card repeats.
+        """
+        if len(cards_by_round) != len(self.rounds):
+            raise ValueError(f"Expected {len(self.rounds)} rounds, got {len(cards_by_round)}")
+        masks = [[0] * len(self.rounds) for _ in range(4)]
+        for r, (cards, n) in enumerate(zip(cards_by_round, self.rounds)):
+            if len(cards) != n:
+                raise ValueError(f"Round {r} needs {n} cards, got {len(cards)}")
+            for c in cards:
+                masks[_SUIT_NUMBER[(c >> 12) & 0xF]][r] |= 1 << ((c >> 8) & 0xF)
+
+        suits = []
+        for suit_masks in masks:
+            shape, index, used = [], 0, 0
+            for mask in suit_masks:
+                if mask & used:
+                    raise ValueError("Duplicate card")
+                k = _POPCOUNT[mask]
+                if used:
+                    # Renumber ranks densely over those earlier rounds left free
+                    positions = [rank - _POPCOUNT[used & ((1 << rank) - 1)]
+                                 for rank in _RANKS_OF[mask]]
+                    index = index * comb(13 - _POPCOUNT[used], k) + _colex(positions)
+                else:
+                    index = index * comb(13, k) + _COLEX13[mask]
+                shape.append(k)
+                used |= mask
+            suits.append((tuple(shape), index))
+        suits.sort(reverse=True)
+
+        config = tuple(shape for shape, _ in suits)
+        entry = self._configs.get(config)
+        if entry is None:
+            raise ValueError("Duplicate card")
+        offset, groups = entry
+        local, i = 0, 0
+        for shape, m, size in groups:
+            # Multiset of m suit indices (descending) -> m strictly decreasing ints
+            local = local * size + _colex([suits[i + k][1] + m - 1 - k for k in range(m)])
+            i += m
+        return offset + local
+
+    def unindex(self, index: int) -> List[List[int]]:
+        """
+        A canonical hand (one list of treys ints per round, highest first)
+        with the given index.
+        """
+        if not 0 <= index < self.size:
+            raise IndexError(f"Index {index} out of range for {self.size} hands")
+        c = bisect_right(self._offsets, index) - 1
+        config = self._config_list[c]
+        _, groups = self._configs[config]
+        local = index - self._offsets[c]
+        group_indices = []
+        for _, _, size in reversed(groups):
+            local, digit = divmod(local, size)
+            group_indices.append(digit)
+        group_indices.reverse()
+
+        rounds = [[] for _ in self.rounds]
+        suit = 0
+        for (shape, m, _), digit in zip(groups, group_indices):
+            strict = sorted(_uncolex(digit, m), reverse=True)
+            for k, j in enumerate(strict):
+                self._decode_suit(shape, j - (m - 1 - k), suit, rounds)
+                suit += 1
+        for cards in rounds:
+            cards.sort(reverse=True)
+        return rounds
+
+    def _decode_suit(self, shape, index: int, suit: int, rounds: List[List[int]]):
+        radices = self._radices[shape]
+        digits = []
+        for radix in reversed(radices):
+            index, digit = divmod(index, radix)
+            digits.append(digit)
+        digits.reverse()
+        free = list(range(13))
+        for r, (k, digit) in enumerate(zip(shape, digits)):
+            ranks = [free[p] for p in _uncolex(digit, k)]
+            rounds[r].extend(_CARDS[rank][suit] for rank in ranks)
+            free = [rank for rank in free if rank not in ranks]
+
+
+def _product(values) -> int:
+    result = 1
+    for v in values:
+        result *= v
+    return result
+
+
+@lru_cache(maxsize=None)
+def indexer(rounds: Tuple[int, ...]) -> HandIndexer:
+    """Shared HandIndexer for a rounds tuple (built once per process)."""
+    return HandIndexer(rounds)
+
+
+def canonical_index(hole_cards: List[int], board: List[int] = ()) -> int:
+    """
+    Dense index of (hole, board) up to suit isomorphism, the board taken as
+    one unordered round: 0-168 pre-flop, below num_canonical(len(board)) after.
+    """
+    if not board:
+        return indexer((2,)).index([hole_cards])
+    return indexer((2, len(board))).index([hole_cards, board])
+
+
+def num_canonical(board_size: int = 0) -> int:
+    """Number of canonical (hole, board) classes for a board size."""
+    return indexer((2, board_size) if board_size else (2,)).size
+
+
+def board_index(board: List[int]) -> int:
+    """Dense index of a board up to suit isomorphism (0-1754 for flops)."""
+    return indexer((len(board),)).index([board])
+
+
+# ===== BOARD TEXTURE =====
+
+def _texture_row(board: List[int]) -> Tuple[int, ...]:
+    ranks = [Card.get_rank_int(c) for c in board]
+    rank_counts = [ranks.count(r) for r in set(ranks)]
+    suit_counts = [sum(1 for c in board if (c >> 12) & 0xF == bit) for bit in _SUIT_BITS]
+    mask = 0
+    for r in ranks:
+        mask |= 1 << r
+    mask = (mask << 1) | (mask >> 12 & 1)  # Ace also plays low (bit 0)
+    connected = max(bin(mask >> low & 0x1F).count("1") for low in range(10))
+    return (max(ranks), sum(1 for n in rank_counts if n >= 2), max(rank_counts),
+            max(suit_counts), connected)
+
+
+def _texture_path(directory: str, board_size: int) -> str:
+    return os.path.join(directory, f"board_texture_v{TEXTURE_VERSION}_{board_size}.npy")
+
+
+def texture_table(board_size: int, directory: str = None) -> "np.ndarray":
+    """
+    Texture of every canonical board of a size (3-5), indexed by board_index.
+
+    A structured uint8 array with fields TEXTURE_FIELDS:
+      high            highest rank (0 = deuce, 12 = ace)
+      pairs           ranks appearing at least twice
+      max_rank_count  most cards of one rank (2 = pair, 3 = trips, ...)
+      max_suit        most cards of one suit (3 on a monotone flop)
+      connected       most distinct ranks inside any five-rank straight window
+    Built on first use (a few seconds for rivers) and cached on disk.
+    """
+    table = _textures.get(board_size)
+    if table is not None:
+        return table
+    import numpy as np
+    from hand_evaluator import _save_atomic, cache_dir
+    directory = directory or cache_dir()
+    path = _texture_path(directory, board_size)
+    if not os.path.exists(path):
+        boards = indexer((board_size,))
+        dtype = np.dtype([(name, np.uint8) for name in TEXTURE_FIELDS])
+        rows = [_texture_row(boards.unindex(i)[0]) for i in range(boards.size)]
+        os.makedirs(directory, exist_ok=True)
+        _save_atomic(path, np.array(rows, dtype=dtype))
+    table = _textures[board_size] = np.load(path, mmap_mode='r')
+    return table
+
+
+def board_texture(board: List[int]) -> Dict[str, int]:
+    """
+    Texture features of a 3-5 card board, from the precomputed table.
+
+    Example usage:
+        texture = board_texture(observation.community_cards)
+        if texture['monotone'] or texture['straight_possible']:
+            return ('check', 0)  # Draw-heavy board; slow down
+    """
+    row = texture_table(len(board))[board_index(board)]
+    texture = {name: int(row[name]) for name in TEXTURE_FIELDS}
+    texture['paired'] = texture['pairs'] > 0
+    texture['monotone'] = texture['max_suit'] == len(board)
+    texture['rainbow'] = texture['max_suit'] == 1
+    texture['flush_possible'] = texture['max_suit'] >= 3
+    texture['straight_possible'] = texture['connected'] >= 3
+    return texture
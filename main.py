@@ -1,18 +1,191 @@
-from bots.Coyote import Coyote
-from game_engine import play_hand
-
-
-def main():
-    players = [
-        Coyote(name="Alice"),
-        Coyote(name="Bob"),
-        Coyote(name="Charlie"),
-        Coyote(name="David"),
-        Coyote(name="Erika")
-    ]
+import argparse
+import time
+
+from display import make_sink
+from farm import bot_factory, run_farm
+from game_engine import play_hand, run_tournament
+from profiling import EngineStats
+from session_stats import SessionStats
+
+
+PLAYER_FACTORIES = [
+    bot_factory("Coyote", "Alice"),
+    bot_factory("Coyote", "Bob"),
+    bot_factory("Coyote", "Charlie"),
+    bot_factory("Coyote", "David"),
+    bot_factory("Coyote", "Erika"),
+]
+
+
+def make_players():
+    return [factory() for factory in PLAYER_FACTORIES]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Texas Hold'em bot table")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run a fast simulation with no pauses")
+    parser.add_argument("--hands", type=int, default=1000,
+                        help="Number of hands to play in headless mode")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for reproducible deals")
+    parser.add_argument("--sink", choices=["null", "log", "plain", "rich", "live"], default=None,
+                        help="Where game output goes (default: rich, or null when headless)")
+    parser.add_argument("--every", type=int, default=1, metavar="N",
+                        help="Headless: only render every Nth hand")
+    parser.add_argument("--background", action="store_true",
+                        help="Headless: render on a background thread so output never "
+                             "slows the game down")
+    parser.add_argument("--refresh", type=float, default=4.0, metavar="HZ",
+                        help="Redraws per second for --sink live")
+    parser.add_argument("--equity", action="store_true",
+                        help="Show each player's winning chances after every deal (rich sink)")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="Headless: append every hand to this hand-history file "
+                             "(not with --shards)")
+    parser.add_argument("--replay", metavar="PATH", default=None,
+                        help="Replay one hand (see --hand-id) from a hand-history file")
+    parser.add_argument("--hand-id", type=int, default=0,
+                        help="Hand to replay with --replay")
+    parser.add_argument("--shards", type=int, default=None,
+                        help="Headless: play this many independent tables in a process pool")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for --shards (default: all cores) or --mtt "
+                             "(default: 1; each worker costs ~2 ms per round, so it pays "
+                             "off from about 2 tables, ~20 entrants, per worker on "
+                             "separate cores)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Headless: print per-phase timings and per-bot decision latency")
+    parser.add_argument("--profile-out", metavar="PATH", default=None,
+                        help="Headless: also run under cProfile and save the stats to PATH "
+                             "(pstats format; view with snakeviz, flameprof, etc.; "
+                             "not with --shards)")
+    parser.add_argument("--mtt", type=int, default=None, metavar="ENTRANTS",
+                        help="Run a multi-table tournament with this many Coyote entrants "
+                             "(uses --workers and --seed)")
+    parser.add_argument("--table-size", type=int, default=9,
+                        help="Seats per table for --mtt")
+    parser.add_argument("--player-stats", action="store_true",
+                        help="Headless: print per-bot VPIP, PFR, 3-bet, aggression and bb/100")
+    parser.add_argument("--player-stats-out", metavar="PATH", default=None,
+                        help="Headless: also save the per-bot statistics to PATH as JSON")
+    args = parser.parse_args(argv)
+    if args.shards:
+        # Shards play in separate processes with no display; per-shard profiles
+        # and player statistics are merged, but these can't be
+        unsupported = [("--record", args.record), ("--profile-out", args.profile_out),
+                       ("--sink", args.sink), ("--every", args.every != 1),
+                       ("--background", args.background), ("--refresh", args.refresh != 4.0),
+                       ("--equity", args.equity)]
+        for flag, given in unsupported:
+            if given:
+                parser.error(f"{flag} cannot be combined with --shards")
+    return args
+
+
+def print_stats(args, stats, tracker):
+    """Print (and save, if asked) the engine profile and per-bot statistics."""
+    if stats is not None:
+        print()
+        print(stats.format())
+    if tracker is not None:
+        print()
+        print(tracker.format())
+        if args.player_stats_out:
+            tracker.save(args.player_stats_out)
+            print(f"\nPlayer statistics written to {args.player_stats_out}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    players = make_players()
+
+    if args.replay:
+        from hand_history import HandHistoryReader, replay_hand
+        record = HandHistoryReader(args.replay).get(args.hand_id)
+        display = make_sink(args.sink or "rich", interactive=False, show_equity=args.equity)
+        replay_hand(record, make_players(), display=display)
+        display.close()
+        if args.sink == "log":
+            print(display.getvalue())
+        return
+
+    if args.mtt:
+        from mtt import Tournament, field
+        result = Tournament(field("Coyote", args.mtt), table_size=args.table_size,
+                            seed=args.seed).run(workers=args.workers or 1)
+        print(f"{args.mtt} entrants, {result['hands_played']} hands in {result['wall_time']:.2f}s "
+              f"(reached blind level {result['level'] + 1})")
+        by_place = sorted(result['finish'].items(), key=lambda x: x[1])
+        for name, place in by_place[:10]:
+            print(f"{place:>4}. {name}: {result['prizes'][name]:,.0f}")
+        for cls, s in result['by_bot'].items():
+            print(f"{cls}: {s['entries']} entries, mean finish percentile "
+                  f"{s['mean_finish_percentile']:.1%}, {s['cashes']} cashes, ROI {s['roi']:+.1%}")
+        return
+
+    if args.headless and args.shards:
+        stats = EngineStats() if args.profile else None
+        tracker = SessionStats() if args.player_stats or args.player_stats_out else None
+        start = time.perf_counter()
+        summary = run_farm(PLAYER_FACTORIES, args.shards, args.hands, seed=args.seed,
+                           workers=args.workers, stats=stats, tracker=tracker)
+        elapsed = time.perf_counter() - start
+        hands = next(iter(summary.values()))['hands_played']
+        seed = next(iter(summary.values()))['seed']
+        print(f"Played {hands} hands on {args.shards} tables in {elapsed:.2f}s "
+              f"({hands / max(elapsed, 1e-9):,.0f} hands/sec, seed {seed})")
+        for name, s in sorted(summary.items(), key=lambda x: -x[1]['mean_net_chips']):
+            lo, hi = s['net_chips_ci95']
+            wlo, whi = s['win_rate_ci95']
+            print(f"{name}: net {s['mean_net_chips']:+.1f}/table [{lo:+.1f}, {hi:+.1f}], "
+                  f"win rate {s['win_rate']:.1%} [{wlo:.1%}, {whi:.1%}]")
+        print_stats(args, stats, tracker)
+        return
+
+    if args.headless:
+        display = make_sink(args.sink or "null", interactive=False, every=args.every,
+                            threaded=args.background, refresh=args.refresh)
+        recorder = None
+        if args.record:
+            from hand_history import HandHistoryWriter
+            recorder = HandHistoryWriter(args.record)
+        stats = EngineStats() if args.profile or args.profile_out else None
+        profiler = None
+        if args.profile_out:
+            import cProfile
+            profiler = cProfile.Profile()
+        tracker = SessionStats() if args.player_stats or args.player_stats_out else None
+        if tracker is not None:
+            for p in players:
+                p.session_stats = tracker
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        result = run_tournament(players, args.hands, seed=args.seed, display=display,
+                                recorder=recorder, stats=stats, tracker=tracker)
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile_out)
+        elapsed = time.perf_counter() - start
+        display.close()
+        if recorder is not None:
+            recorder.close()
+        if args.sink == "log":
+            print(display.getvalue())
+        hands = result['hands_played']
+        print(f"Played {hands} hands in {elapsed:.2f}s ({hands / max(elapsed, 1e-9):,.0f} hands/sec)")
+        for name, chips in sorted(result['chips'].items(), key=lambda x: -x[1]):
+            print(f"{name}: {chips} chips, won {result['hands_won'][name]} hands")
+        print_stats(args, stats, tracker)
+        if profiler is not None:
+            print(f"\ncProfile stats written to {args.profile_out}")
+        return
+
+    display = make_sink(args.sink or "rich", show_equity=args.equity)
     dealer_index = 0
     while True:
-        dealer_index = play_hand(players, dealer_index)
+        dealer_index = play_hand(players, dealer_index, display=display, seed=None)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,542 @@
+"""
+Multi-table tournament (MTT) manager.
+
+Seats a field of entrants at tables of `table_size`, then plays the
+tournament in rounds: every table plays `hands_per_round` hands, busted
+players are given their finishing places, and tables are broken and
+balanced before the next round. With workers > 1 the tables stay resident
+in long-lived worker processes: each round only seeds, names and stacks
+cross the pipes, and a bot is pickled only when balancing moves it to a
+table held by another worker. Blinds
+rise every `hands_per_level` hands on a schedule. The last player standing
+wins; prizes follow a payout table, and if the tournament is stopped early
+(max_hands) the remaining stacks are paid by ICM.
+
+    result = Tournament(field("Coyote", 1000), seed=1).run(workers=4)
+    result['finish']      # {name: place}
+    result['prizes']      # {name: prize}
+
+Run from the command line with `python main.py --mtt 1000`.
+"""
+import math
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from display import NullSink
+from farm import bot_factory
+from game_engine import play_hand
+
+# (small blind, big blind) per level; past the last level blinds keep doubling
+DEFAULT_SCHEDULE = (
+    (10, 20), (15, 30), (25, 50), (50, 100), (75, 150), (100, 200), (150, 300),
+    (200, 400), (300, 600), (400, 800), (500, 1000), (750, 1500), (1000, 2000),
+    (1500, 3000), (2000, 4000), (3000, 6000), (5000, 10000),
+)
+
+
+def blinds_at(schedule: Sequence[Tuple[int, int]], level: int) -> Tuple[int, int]:
+    """Blinds for a level (0-based), doubling past the end of the schedule."""
+    if level < len(schedule):
+        return tuple(schedule[level])
+    small, big = schedule[-1]
+    factor = 2 ** (level - len(schedule) + 1)
+    return (small * factor, big * factor)
+
+
+def default_payouts(entrants: int, prize_pool: int, paid_fraction: float = 0.15) -> List[int]:
+    """
+    Prize per place (index 0 = winner): the top `paid_fraction` of the field
+    is paid, with prizes proportional to 1/place. Sums to prize_pool.
+    """
+    paid = max(1, min(entrants, int(entrants * paid_fraction)))
+    weights = [1.0 / place for place in range(1, paid + 1)]
+    total = sum(weights)
+    prizes = [int(prize_pool * w / total) for w in weights]
+    prizes[0] += prize_pool - sum(prizes)
+    return prizes
+
+
+def icm(stacks: Sequence[int], prizes: Sequence[float], samples: int = 20000,
+        seed=None) -> List[float]:
+    """
+    Independent Chip Model equity of each stack (Malmuth-Harville).
+
+    Each remaining player finishes first with probability proportional to
+    their stack, then the rest are ranked the same way among themselves.
+    Exact (dynamic programming over who has already finished) for up to 12
+    players; sampled finishing orders for larger fields.
+
+    Returns:
+        Expected prize per stack, in input order.
+    """
+    n = len(stacks)
+    prizes = list(prizes[:n])
+    if not prizes or n == 0:
+        return [0.0] * n
+    if n <= 12:
+        return _icm_exact(stacks, prizes)
+    return _icm_sampled(stacks, prizes, samples, random.Random(seed))
+
+
+def _icm_exact(stacks, prizes):
+    n = len(stacks)
+    total = sum(stacks)
+    equity = [0.0] * n
+    # prob[mask]: probability that exactly the players in `mask` took the top places
+    prob = {0: 1.0}
+    for place, prize in enumerate(prizes):
+        nxt = {}
+        for mask, p in prob.items():
+            left = total - sum(stacks[i] for i in range(n) if mask >> i & 1)
+            if left <= 0:
+                continue
+            for i in range(n):
+                if not mask >> i & 1 and stacks[i] > 0:
+                    q = p * stacks[i] / left
+                    equity[i] += q * prize
+                    m = mask | 1 << i
+                    nxt[m] = nxt.get(m, 0.0) + q
+        prob = nxt
+    return equity
+
+
+def _icm_sampled(stacks, prizes, samples, rng):
+    n = len(stacks)
+    equity = [0.0] * n
+    paid = len(prizes)
+    for _ in range(samples):
+        # Harville order: repeatedly draw the next finisher weighted by stack;
+        # equivalently sort by Exp(1)/stack
+        keys = sorted((rng.expovariate(1.0) / s if s > 0 else math.inf, i)
+                      for i, s in enumerate(stacks))
+        for place in range(paid):
+            equity[keys[place][1]] += prizes[place]
+    return [e / samples for e in equity]
+
+
+def field(bots, entrants: int, **kwargs) -> List[Callable]:
+    """
+    Bot factories for a field of `entrants`, cycling through `bots` (bot
+    classes or registered names) and naming them e.g. 'Coyote-0042'.
+    """
+    if isinstance(bots, (str, type)):
+        bots = [bots]
+    factories = []
+    for i in range(entrants):
+        bot = bots[i % len(bots)]
+        label = bot if isinstance(bot, str) else bot.__name__
+        factories.append(bot_factory(bot, f"{label}-{i + 1:04d}", **kwargs))
+    return factories
+
+
+class Table:
+    """One table's seats and button; seat order is play order."""
+
+    __slots__ = ('table_id', 'players', 'dealer_index')
+
+    def __init__(self, table_id: int, players: List):
+        self.table_id = table_id
+        self.players = players
+        self.dealer_index = 0
+
+    def __len__(self):
+        return len(self.players)
+
+    def take_player(self):
+        """Remove the player due to post the big blind next (so nobody skips blinds)."""
+        n = len(self.players)
+        seat = (self.dealer_index + (2 if n > 2 else 1)) % n
+        player = self.players.pop(seat)
+        if seat < self.dealer_index:
+            self.dealer_index -= 1
+        if self.players:
+            self.dealer_index %= len(self.players)
+        else:
+            self.dealer_index = 0
+        return player
+
+    def seat_player(self, player):
+        """Seat a player just before the button (they post blinds last this orbit)."""
+        self.players.insert(self.dealer_index, player)
+        if len(self.players) > 1:
+            self.dealer_index += 1
+
+
+def _play_table_round(players, dealer_index, num_hands, blinds, seed):
+    """Play up to num_hands hands at one table; returns (players, dealer, busts, hands)."""
+    rng = random.Random(seed)
+    display = NullSink()
+    busts = []  # (hand number, chips before that hand, name)
+    hands = 0
+    for hand in range(num_hands):
+        if len(players) < 2:
+            break
+        before = {p.name: p.chips for p in players}
+        dealer_index = play_hand(players, dealer_index, display=display,
+                                 seed=rng.getrandbits(32), blinds=blinds)
+        hands += 1
+        if len(players) < len(before):
+            left = {p.name for p in players}
+            busts.extend((hand, chips, name) for name, chips in before.items() if name not in left)
+    return players, dealer_index, busts, hands
+
+
+# ===== TABLE HOSTS =====
+
+class _TableHost:
+    """The tables one process holds, with their bot objects."""
+
+    def __init__(self):
+        self.tables = {}  # {table_id: Table}
+
+    def play(self, jobs, layout=None, incoming=()):
+        """
+        Reseat (when `layout` is given, see arrange()) and play one round.
+
+        Args:
+            jobs: (table_id, num_hands, blinds, seed) per table to play.
+
+        Returns:
+            (names in seat order, stacks, dealer_index, busts, hands) per job.
+        """
+        if layout is not None:
+            self.arrange(layout, incoming)
+        results = []
+        for table_id, num_hands, blinds, seed in jobs:
+            table = self.tables[table_id]
+            table.players, table.dealer_index, busts, hands = _play_table_round(
+                table.players, table.dealer_index, num_hands, blinds, seed)
+            results.append(([p.name for p in table.players], [p.chips for p in table.players],
+                            table.dealer_index, busts, hands))
+        return results
+
+    def arrange(self, layout, incoming=()):
+        """
+        Rebuild the tables from `layout` ({table_id: (names in seat order,
+        dealer_index)}), seating this host's players and the `incoming` ones;
+        players left out of the layout are dropped.
+        """
+        by_name = {p.name: p for t in self.tables.values() for p in t.players}
+        by_name.update((p.name, p) for p in incoming)
+        self.tables = {}
+        for table_id, (names, dealer_index) in layout.items():
+            table = self.tables[table_id] = Table(table_id, [by_name[n] for n in names])
+            table.dealer_index = dealer_index
+
+    def release(self, names):
+        """The named players, leaving for another host's tables."""
+        wanted = set(names)
+        return [p for t in self.tables.values() for p in t.players if p.name in wanted]
+
+
+class _LocalHost:
+    """A _TableHost in this process, behind the same send/recv calls as _ProcessHost."""
+
+    def __init__(self):
+        self.host = _TableHost()
+        self._result = None
+
+    def send(self, method: str, *args):
+        self._result = getattr(self.host, method)(*args)
+
+    def recv(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class _ProcessHost:
+    """A _TableHost in its own long-lived process, driven over a pipe."""
+
+    def __init__(self):
+        import multiprocessing
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve_tables, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, method: str, *args):
+        self.conn.send((method, args))
+
+    def recv(self):
+        ok, value = self.conn.recv()
+        if not ok:
+            raise value
+        return value
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass  # Already gone
+        self.process.join()
+        self.conn.close()
+
+
+def _serve_tables(conn):
+    """Worker process loop: run _TableHost methods until told to stop."""
+    host = _TableHost()
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        method, args = message
+        try:
+            conn.send((True, getattr(host, method)(*args)))
+        except Exception as e:
+            conn.send((False, e))
+
+
+class Tournament:
+    """
+    A multi-table freezeout.
+
+    Args:
+        factories: One zero-argument bot factory per entrant (see field());
+            names must be unique.
+        table_size: Maximum players per table.
+        starting_stack: Chips each entrant starts with.
+        schedule: Blind levels as (small, big) pairs.
+        hands_per_level: Hands (per table) between blind increases.
+        hands_per_round: Hands each table plays between balancing steps.
+        buy_in: Entry fee; the prize pool is entrants * buy_in.
+        payouts: Prize per place; defaults to default_payouts().
+        seed: Seed for seating and every table's deals.
+    """
+
+    def __init__(self, factories: List[Callable], table_size: int = 9,
+                 starting_stack: int = 1500, schedule=DEFAULT_SCHEDULE,
+                 hands_per_level: int = 20, hands_per_round: int = 5, buy_in: int = 100,
+                 payouts: Optional[List[int]] = None, seed=None):
+        if table_size < 2:
+            raise ValueError("table_size must be at least 2")
+        self.factories = factories
+        self.table_size = table_size
+        self.starting_stack = starting_stack
+        self.schedule = schedule
+        self.hands_per_level = hands_per_level
+        self.hands_per_round = hands_per_round
+        self.prize_pool = buy_in * len(factories)
+        self.payouts = payouts if payouts is not None else default_payouts(
+            len(factories), self.prize_pool)
+        self.seed = seed
+
+    # ===== SEATING =====
+
+    def _seat(self, players, rng) -> List[Table]:
+        players = list(players)
+        rng.shuffle(players)
+        num_tables = math.ceil(len(players) / self.table_size)
+        # Deal seats round-robin so table sizes differ by at most one
+        return [Table(i, players[i::num_tables]) for i in range(num_tables)]
+
+    def _balance(self, tables: List[Table]) -> List[Table]:
+        """Break surplus tables, then even out table sizes (max - min <= 1)."""
+        tables = [t for t in tables if len(t)]
+        remaining = sum(len(t) for t in tables)
+        needed = max(1, math.ceil(remaining / self.table_size))
+        while len(tables) > needed:
+            # Break the shortest table, seating its players at the shortest others
+            tables.sort(key=len)
+            broken = tables.pop(0)
+            while len(broken):
+                min(tables, key=len).seat_player(broken.take_player())
+        while True:
+            largest = max(tables, key=len)
+            smallest = min(tables, key=len)
+            if len(largest) - len(smallest) <= 1:
+                return tables
+            smallest.seat_player(largest.take_player())
+
+    # ===== RUN =====
+
+    def run(self, workers: int = 1, max_hands: Optional[int] = None) -> Dict:
+        """
+        Play the tournament to the end (or until tables have played
+        `max_hands` hands each, then pay the remaining stacks by ICM).
+
+        Args:
+            workers: Processes for playing tables concurrently (1 = in-process).
+                Each round costs about 2 ms per worker (a pipe round trip
+                and the process switch) while a table plays its round in
+                about 3 ms, so on a multi-core machine workers pay off from
+                roughly 2 tables (~20 entrants) per worker. On a single core
+                they only add that overhead. No more workers are started
+                than there are tables.
+            max_hands: Optional per-table hand limit.
+
+        Returns:
+            dict with 'finish' ({name: place}), 'prizes' ({name: prize}),
+            'hands_played' (all tables), 'rounds', 'level' (final blind
+            level, 0-based), 'final_table_icm' ({name: ICM equity when the
+            final table formed}), 'by_bot' (per bot class: entries, mean
+            finish percentile, prizes, ROI) and 'wall_time'.
+        """
+        started = time.perf_counter()
+        rng = random.Random(self.seed)
+        players = [factory() for factory in self.factories]
+        names = [p.name for p in players]
+        if len(set(names)) != len(names):
+            raise ValueError("Entrant names must be unique")
+        for p in players:
+            p.chips = self.starting_stack
+        bot_class = {p.name: type(p).__name__ for p in players}
+
+        tables = self._seat(players, rng)
+        remaining = len(players)
+        finish = {}
+        final_table_icm = None
+        hands_played = 0
+        hands_elapsed = 0
+        rounds = 0
+        level = 0
+
+        # The bots live in the hosts; from here on the tables here hold names
+        # only, mirroring the hosts' seating, and `chips` their stacks
+        num_hosts = min(workers, len(tables)) if workers > 1 else 1
+        host_of = {t.table_id: i % num_hosts for i, t in enumerate(tables)}
+        chips = {p.name: p.chips for p in players}
+        incoming = [[] for _ in range(num_hosts)]
+        for t in tables:
+            incoming[host_of[t.table_id]].extend(t.players)
+            t.players = [p.name for p in t.players]
+        layouts = self._layouts(tables, host_of, num_hosts)
+        hosts = []
+        try:
+            hosts = [_ProcessHost() if num_hosts > 1 else _LocalHost() for _ in range(num_hosts)]
+            while remaining > 1 and (max_hands is None or hands_elapsed < max_hands):
+                if final_table_icm is None and len(tables) == 1:
+                    final_table_icm = self._icm_of(tables[0].players, chips)
+                level = hands_elapsed // self.hands_per_level
+                blinds = blinds_at(self.schedule, level)
+                num_hands = self.hands_per_round
+                if max_hands is not None:
+                    num_hands = min(num_hands, max_hands - hands_elapsed)
+                jobs = [[] for _ in hosts]
+                for t in tables:
+                    jobs[host_of[t.table_id]].append(
+                        (t.table_id, num_hands, blinds, rng.getrandbits(64)))
+                for i, host in enumerate(hosts):
+                    if jobs[i] or layouts[i] is not None:
+                        host.send('play', jobs[i], layouts[i], incoming[i])
+                results = {}
+                for i, host in enumerate(hosts):
+                    if jobs[i] or layouts[i] is not None:
+                        results.update(zip((job[0] for job in jobs[i]), host.recv()))
+
+                busts = []
+                for table in tables:
+                    seated, stacks, dealer_index, table_busts, hands = results[table.table_id]
+                    table.players = seated
+                    table.dealer_index = dealer_index
+                    chips.update(zip(seated, stacks))
+                    busts.extend(table_busts)
+                    hands_played += hands
+                # Earlier busts finish lower; in the same hand, bigger stacks finish higher
+                busts.sort()
+                for _, _, name in busts:
+                    finish[name] = remaining
+                    remaining -= 1
+                hands_elapsed += num_hands
+                rounds += 1
+                layouts = [None] * num_hosts
+                incoming = [[] for _ in range(num_hosts)]
+                if remaining > 1:
+                    before = self._layouts(tables, host_of, num_hosts)
+                    tables = self._balance(tables)
+                    layouts = self._layouts(tables, host_of, num_hosts)
+                    self._move_players(hosts, host_of, tables, before, incoming)
+                    # Hosts whose seating didn't change are left alone
+                    layouts = [new if new != old else None for new, old in zip(layouts, before)]
+        finally:
+            for host in hosts:
+                host.close()
+
+        survivors = [name for t in tables for name in t.players]
+        prizes = {name: 0.0 for name in names}
+        if len(survivors) == 1:
+            finish[survivors[0]] = 1
+        else:
+            # Stopped early: rank survivors by chips, pay them by ICM
+            survivors.sort(key=lambda name: -chips[name])
+            for place, name in enumerate(survivors, 1):
+                finish[name] = place
+            for name, equity in zip(survivors, icm([chips[n] for n in survivors], self.payouts,
+                                                   seed=self.seed)):
+                prizes[name] = equity
+        for name, place in finish.items():
+            if place > len(survivors) and place <= len(self.payouts):
+                prizes[name] = self.payouts[place - 1]
+        if len(survivors) == 1:
+            prizes[survivors[0]] = self.payouts[0]
+
+        return {
+            'finish': finish,
+            'prizes': prizes,
+            'hands_played': hands_played,
+            'rounds': rounds,
+            'level': level,
+            'final_table_icm': final_table_icm or {},
+            'by_bot': self._by_bot(finish, prizes, bot_class),
+            'wall_time': time.perf_counter() - started,
+        }
+
+    @staticmethod
+    def _layouts(tables, host_of, num_hosts) -> List[Dict]:
+        """Per host, {table_id: (names in seat order, dealer_index)} of its tables."""
+        layouts = [{} for _ in range(num_hosts)]
+        for t in tables:
+            layouts[host_of[t.table_id]][t.table_id] = (list(t.players), t.dealer_index)
+        return layouts
+
+    @staticmethod
+    def _move_players(hosts, host_of, tables, before, incoming):
+        """Fetch players that balancing moved across hosts into `incoming` (per host)."""
+        was_on = {name: i for i, layout in enumerate(before)
+                  for names, _ in layout.values() for name in names}
+        leaving = [[] for _ in hosts]
+        for t in tables:
+            for name in t.players:
+                if was_on[name] != host_of[t.table_id]:
+                    leaving[was_on[name]].append(name)
+        for i, host in enumerate(hosts):
+            if leaving[i]:
+                host.send('release', leaving[i])
+        for i, host in enumerate(hosts):
+            if leaving[i]:
+                for player in host.recv():
+                    for t in tables:
+                        if player.name in t.players:
+                            incoming[host_of[t.table_id]].append(player)
+                            break
+
+    def _icm_of(self, names, chips) -> Dict[str, float]:
+        return dict(zip(names, icm([chips[n] for n in names], self.payouts, seed=self.seed)))
+
+    def _by_bot(self, finish, prizes, bot_class) -> Dict[str, Dict]:
+        entrants = len(finish)
+        buy_in = self.prize_pool / entrants if entrants else 0
+        groups = {}
+        for name, place in finish.items():
+            g = groups.setdefault(bot_class[name], {'entries': 0, 'percentile_sum': 0.0,
+                                                    'prizes': 0.0, 'cashes': 0})
+            g['entries'] += 1
+            # 1.0 = won, 0.0 = first out
+            g['percentile_sum'] += (entrants - place) / max(1, entrants - 1)
+            g['prizes'] += prizes[name]
+            g['cashes'] += prizes[name] > 0
+        return {
+            cls: {
+                'entries': g['entries'],
+                'mean_finish_percentile': g['percentile_sum'] / g['entries'],
+                'cashes': g['cashes'],
+                'prizes': g['prizes'],
+                'roi': g['prizes'] / (g['entries'] * buy_in) - 1 if buy_in else 0.0,
+            }
+            for cls, g in groups.items()
+        }
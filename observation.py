@@ -0,0 +1,168 @@
+"""
+Read-only, per-decision view of the game handed to bots.
+
+Bots get an Observation instead of the live GameState: it is an immutable
+NamedTuple of tuples holding only what the acting player may legally know
+(their own hole cards, the board, public stacks/bets/folds and the public
+action history), so a bot can neither peek at opponents' cards nor corrupt
+the engine. Observations are cheap to build and can be stacked into NumPy
+feature arrays for ML bots.
+"""
+from typing import NamedTuple, Tuple
+
+from rules import legal_actions
+
+STAGES = ("pre-flop", "flop", "turn", "river")
+_SUIT_INDEX = {1: 0, 2: 1, 4: 2, 8: 3}
+
+
+class Observation(NamedTuple):
+    name: str                       # Acting player
+    seat: int                       # Acting player's index in the seat tuples
+    hole_cards: Tuple[int, ...]     # Own two treys cards
+    community_cards: Tuple[int, ...]
+    stage: str                      # 'pre-flop', 'flop', 'turn' or 'river'
+    pot: int
+    current_bet: int                # Highest bet this street
+    min_raise: int
+    small_blind: int
+    big_blind: int
+    dealer_index: int
+    names: Tuple[str, ...]          # Per seat, in table order
+    stacks: Tuple[int, ...]
+    bets: Tuple[int, ...]           # Chips put in this street
+    folded: Tuple[bool, ...]
+    action_history: Tuple           # Read-only action mappings, oldest first
+    acted: Tuple[bool, ...] = ()    # Per seat: acted since the street's last full raise
+
+    # ===== CONVENIENCE VIEWS (computed on access) =====
+
+    @property
+    def hand(self):
+        return list(self.hole_cards)
+
+    @property
+    def chips(self) -> int:
+        return self.stacks[self.seat]
+
+    @property
+    def amount_to_call(self) -> int:
+        return max(0, self.current_bet - self.bets[self.seat])
+
+    @property
+    def num_active(self) -> int:
+        return self.folded.count(False)
+
+    @property
+    def pot_value(self):
+        return self.pot
+
+    @property
+    def to_call(self):
+        # {player_name: amount to call} for players still in the hand (GameState compatible)
+        return {n: max(0, self.current_bet - b)
+                for n, b, f in zip(self.names, self.bets, self.folded) if not f}
+
+    @property
+    def player_stacks(self):
+        return dict(zip(self.names, self.stacks))
+
+    @property
+    def active_player_stacks(self):
+        return {n: c for n, c, f in zip(self.names, self.stacks, self.folded) if not f}
+
+    @property
+    def player_positions(self):
+        n = len(self.names)
+        return {name: (i - self.dealer_index) % n for i, name in enumerate(self.names)}
+
+    @property
+    def position(self) -> int:
+        """Own position relative to the dealer (0 = button)."""
+        return (self.seat - self.dealer_index) % len(self.names)
+
+    def legal_actions(self):
+        """This seat's legal moves (rules.LegalActions)."""
+        seat = self.seat
+        return legal_actions(self.stacks[seat], self.bets[seat], self.current_bet, self.min_raise,
+                             not (self.acted and self.acted[seat]))
+
+    def to_vector(self, max_seats: int = 10):
+        """Flat float32 feature vector; see observation_vector."""
+        return observation_vector(self, max_seats)
+
+
+def build_observation(game_state, seat: int) -> Observation:
+    """Snapshot what the player in `seat` may see right now."""
+    player = game_state.players[seat]
+    return Observation(
+        player.name,
+        seat,
+        tuple(player.hand),
+        tuple(game_state.community_cards),
+        game_state.stage,
+        game_state.pot,
+        game_state.current_bet,
+        game_state.min_raise,
+        game_state.small_blind,
+        game_state.big_blind,
+        game_state.dealer_index,
+        tuple(game_state.names),
+        tuple(game_state.stacks),
+        tuple(game_state.bets),
+        tuple(game_state.folded),
+        tuple(game_state.action_history),
+        tuple(game_state.acted),
+    )
+
+
+# ===== FEATURE VECTORS FOR ML BOTS =====
+
+def card_index(card: int) -> int:
+    """0-51 index of a treys card (rank * 4 + suit)."""
+    return ((card >> 8) & 0xF) * 4 + _SUIT_INDEX[(card >> 12) & 0xF]
+
+
+def vector_size(max_seats: int = 10) -> int:
+    return 2 + 5 + 1 + 5 + 3 * max_seats
+
+
+def observation_vector(obs: Observation, max_seats: int = 10):
+    """
+    Encode an observation as a float32 vector of length vector_size(max_seats).
+
+    Layout: own hole card indices (2), board card indices (5, -1 when not
+    dealt), stage index, then pot / current bet / amount to call / min raise /
+    own stack in big blinds, then per seat - rotated so the acting player is
+    first and padded to max_seats - stack and street bet in big blinds and
+    an in-hand flag.
+    """
+    import numpy as np  # Only ML bots pay for NumPy
+
+    vec = np.zeros(vector_size(max_seats), dtype=np.float32)
+    bb = float(obs.big_blind)
+    vec[0:2] = [card_index(c) for c in obs.hole_cards]
+    vec[2:7] = -1
+    vec[2:2 + len(obs.community_cards)] = [card_index(c) for c in obs.community_cards]
+    vec[7] = STAGES.index(obs.stage)
+    vec[8:13] = (obs.pot / bb, obs.current_bet / bb, obs.amount_to_call / bb,
+                 obs.min_raise / bb, obs.chips / bb)
+
+    n = len(obs.names)
+    order = [(obs.seat + i) % n for i in range(min(n, max_seats))]
+    base = 13
+    vec[base:base + len(order)] = [obs.stacks[s] / bb for s in order]
+    vec[base + max_seats:base + max_seats + len(order)] = [obs.bets[s] / bb for s in order]
+    vec[base + 2 * max_seats:base + 2 * max_seats + len(order)] = [
+        0.0 if obs.folded[s] else 1.0 for s in order]
+    return vec
+
+
+def observations_to_array(observations, max_seats: int = 10):
+    """Stack many observations into an (n, vector_size) float32 array."""
+    import numpy as np
+
+    out = np.empty((len(observations), vector_size(max_seats)), dtype=np.float32)
+    for i, obs in enumerate(observations):
+        out[i] = observation_vector(obs, max_seats)
+    return out
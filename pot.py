@@ -0,0 +1,99 @@
+"""
+Pot manager: main/side pot construction and showdown settlement.
+
+The engine records how many chips each seat put in over the whole hand
+(GameState.contributions). At the end of the hand those contributions are
+split into pots in one pass over the seats sorted by contribution, and each
+pot is paid to the best hand among the players still eligible for it:
+
+    pots = build_pots(contributions, folded)
+    payouts = settle_pots(pots, ranks, dealer_index)
+
+Chips are always conserved: folded players' chips stay in the pots as dead
+money, an uncalled bet comes back as a pot its owner alone is eligible for,
+and chips that don't split evenly go one at a time to the tied winners
+closest to the left of the button.
+"""
+from typing import Dict, List, Optional, Sequence
+
+
+def build_pots(contributions: Sequence[int], folded: Sequence[bool]) -> List[Dict]:
+    """
+    Split per-seat hand contributions into a main pot and side pots.
+
+    Args:
+        contributions: Chips each seat committed this hand.
+        folded: Per seat, whether that seat has folded.
+
+    Returns:
+        List of {'amount': int, 'eligible': [seat, ...]} from the main pot
+        outwards. Only players who haven't folded are eligible.
+    """
+    n = len(contributions)
+    order = sorted(range(n), key=contributions.__getitem__)
+    pots = []
+    starts = []  # Per pot, how many live seats had dropped out below it
+    prev_level = 0
+    # Live seats by contribution; each pot is eligible to a suffix of this list
+    eligible = [s for s in order if not folded[s]]
+    live_passed = 0
+    for i, seat in enumerate(order):
+        level = contributions[seat]
+        if level > prev_level:
+            amount = (level - prev_level) * (n - i)
+            if pots and (starts[-1] == live_passed or live_passed == len(eligible)):
+                # Same live players as the last slice (or only dead money above
+                # every live bet): still the same pot
+                pots[-1]['amount'] += amount
+            else:
+                pots.append({'amount': amount, 'eligible': eligible[live_passed:]})
+                starts.append(live_passed)
+            prev_level = level
+        if not folded[seat]:
+            live_passed += 1
+    return pots
+
+
+def settle_pots(pots: List[Dict], ranks: Dict[int, int], dealer_index: int,
+                num_seats: Optional[int] = None) -> Dict[int, int]:
+    """
+    Pay every pot to its best eligible hand.
+
+    Args:
+        pots: Output of build_pots (each pot's eligible seats include all of
+            the next pot's).
+        ranks: {seat: hand rank} for every player at showdown (lower is
+            better, as with treys).
+        dealer_index: Button seat; odd chips go to tied winners in seat
+            order starting left of the button.
+        num_seats: Table size for the odd-chip order (defaults to the
+            highest seat seen + 1).
+
+    Returns:
+        {seat: chips won}, summing to the total of all pots.
+    """
+    if num_seats is None:
+        num_seats = 1 + max((max(p['eligible']) for p in pots), default=0)
+    payouts = {}
+    # Each pot's eligible list extends the next one's, so walking from the
+    # last side pot inwards only ever adds contenders: O(players) overall
+    best = None
+    winners = []
+    seen = 0
+    for pot in reversed(pots):
+        eligible = pot['eligible']
+        for s in eligible[:len(eligible) - seen]:
+            rank = ranks[s]
+            if best is None or rank < best:
+                best = rank
+                winners = [s]
+            elif rank == best:
+                winners.append(s)
+        seen = len(eligible)
+        share, odd = divmod(pot['amount'], len(winners))
+        for s in winners:
+            payouts[s] = payouts.get(s, 0) + share
+        if odd:
+            for s in sorted(winners, key=lambda s: (s - dealer_index - 1) % num_seats)[:odd]:
+                payouts[s] += 1
+    return payouts
@@ -0,0 +1,66 @@
+"""
+Precomputed preflop equity for the 169 starting-hand classes.
+
+The table lives in data/preflop_equity.npz and is generated by
+scripts/build_preflop_table.py. Classes are laid out on the usual 13x13 grid
+(rank 0 = deuce, 12 = ace): pairs on the diagonal, suited hands at
+[high][low], offsuit hands at [low][high].
+"""
+import os
+from typing import List
+
+from treys import Card
+
+MAX_OPPONENTS = 9
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preflop_equity.npz")
+
+_equity = None  # nested list: [class index][num_opponents - 1] -> equity
+
+
+def class_index(rank1: int, rank2: int, suited: bool) -> int:
+    """Grid index (0-168) of a starting hand given its two ranks."""
+    high, low = max(rank1, rank2), min(rank1, rank2)
+    if suited and high != low:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def hand_class(hole_cards: List[int]) -> int:
+    """Grid index (0-168) of two treys hole cards."""
+    c1, c2 = hole_cards
+    return class_index(Card.get_rank_int(c1), Card.get_rank_int(c2),
+                       Card.get_suit_int(c1) == Card.get_suit_int(c2))
+
+
+def class_label(index: int) -> str:
+    """Conventional name of a class, e.g. 'AKs', 'T9o', '77'."""
+    a, b = divmod(index, 13)
+    high, low = max(a, b), min(a, b)
+    label = Card.STR_RANKS[high] + Card.STR_RANKS[low]
+    if high == low:
+        return label
+    return label + ("s" if a > b else "o")
+
+
+def load_table(path: str = TABLE_PATH):
+    """Load (and cache) the equity table; returns the raw (169, 9) array."""
+    global _equity
+    import numpy as np  # Only needed once, when the table is first used
+    with np.load(path) as data:
+        table = data["equity"]
+    _equity = table.tolist()
+    return table
+
+
+def preflop_equity(hole_cards: List[int], num_opponents: int = 1) -> float:
+    """
+    Share of the pot a hand wins at showdown against random hands (0-1).
+
+    Args:
+        hole_cards: Two treys card ints.
+        num_opponents: Opponents still in the hand, clamped to 1-9.
+    """
+    if _equity is None:
+        load_table()
+    num_opponents = min(max(num_opponents, 1), MAX_OPPONENTS)
+    return _equity[hand_class(hole_cards)][num_opponents - 1]
@@ -0,0 +1,162 @@
+"""
+Engine instrumentation: per-phase timers, per-bot decision latency, counters.
+
+Pass an EngineStats as `stats` to play_hand / run_tournament (or run
+`python main.py --headless --profile`) to collect:
+
+- time per phase: deal, betting, decision, showdown, display
+- a latency histogram per bot (power-of-two microsecond buckets)
+- counters: hands, decisions, showdown evaluator calls
+
+Phases nest rather than partition: 'betting' includes the bots' 'decision'
+time, and 'display' is also counted in whichever phase produced the output.
+With stats=None the engine skips every timer, so instrumentation costs a
+single `is None` check per call site when disabled.
+"""
+import time
+from typing import Dict
+
+PHASES = ("deal", "betting", "decision", "showdown", "display")
+
+perf_counter = time.perf_counter
+
+
+class LatencyHistogram:
+    """Log2-bucketed latency histogram; bucket i holds [2**(i-1), 2**i) microseconds."""
+
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.buckets = [0] * 40
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.buckets[min(int(seconds * 1e6).bit_length(), 39)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram"):
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound (seconds) of the bucket holding the q-th percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        target = q / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min((1 << i) / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_us': self.total / self.count * 1e6 if self.count else 0.0,
+            'p50_us': self.percentile(50) * 1e6,
+            'p99_us': self.percentile(99) * 1e6,
+            'max_us': self.max * 1e6,
+        }
+
+
+class EngineStats:
+    """Accumulates timings and counters from one or more engine runs."""
+
+    def __init__(self):
+        self.phase_time = dict.fromkeys(PHASES, 0.0)
+        self.decisions = {}  # {bot name: LatencyHistogram}
+        self.counters = {'hands': 0, 'decisions': 0, 'evaluator_calls': 0}
+        self.wall_time = 0.0
+
+    def add_phase(self, phase: str, seconds: float):
+        self.phase_time[phase] += seconds
+
+    def add_decision(self, name: str, seconds: float):
+        hist = self.decisions.get(name)
+        if hist is None:
+            hist = self.decisions[name] = LatencyHistogram()
+        hist.add(seconds)
+        self.counters['decisions'] += 1
+        self.phase_time['decision'] += seconds
+
+    def count(self, key: str, n: int = 1):
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def merge(self, other: "EngineStats"):
+        """Fold another run's stats into this one (e.g. from several tables)."""
+        for phase, seconds in other.phase_time.items():
+            self.phase_time[phase] = self.phase_time.get(phase, 0.0) + seconds
+        for name, hist in other.decisions.items():
+            self.decisions.setdefault(name, LatencyHistogram()).merge(hist)
+        for key, n in other.counters.items():
+            self.count(key, n)
+        self.wall_time += other.wall_time
+
+    def summary(self) -> Dict:
+        """
+        Plain-dict view of everything collected.
+
+        Returns:
+            dict with 'wall_time', 'hands_per_sec', 'phases' ({phase: seconds}),
+            'counters' and 'decisions' ({bot name: latency summary}).
+        """
+        hands = self.counters['hands']
+        return {
+            'wall_time': self.wall_time,
+            'hands_per_sec': hands / self.wall_time if self.wall_time else 0.0,
+            'phases': dict(self.phase_time),
+            'counters': dict(self.counters),
+            'decisions': {name: h.summary() for name, h in self.decisions.items()},
+        }
+
+    def format(self) -> str:
+        """Human-readable report, slowest bots first."""
+        s = self.summary()
+        wall = s['wall_time'] or 1e-9
+        lines = [f"Hands: {s['counters']['hands']} in {s['wall_time']:.2f}s "
+                 f"({s['hands_per_sec']:,.0f} hands/sec)",
+                 f"Decisions: {s['counters']['decisions']}, "
+                 f"showdown evaluator calls: {s['counters']['evaluator_calls']}",
+                 "", "Phase          time (s)   % of wall"]
+        for phase, seconds in s['phases'].items():
+            lines.append(f"{phase:<14}{seconds:>9.3f}{seconds / wall:>11.1%}")
+        lines += ["", "Bot            decisions   mean us    p50 us    p99 us    max us"]
+        for name, d in sorted(s['decisions'].items(), key=lambda x: -x[1]['mean_us']):
+            lines.append(f"{name:<14}{d['count']:>10}{d['mean_us']:>10.1f}{d['p50_us']:>10.1f}"
+                         f"{d['p99_us']:>10.1f}{d['max_us']:>10.1f}")
+        return "\n".join(lines)
+
+
+class TimedSink:
+    """Display sink wrapper that charges every call to the 'display' phase."""
+
+    def __init__(self, sink, stats: EngineStats):
+        self._sink = sink
+        self._stats = stats
+
+    @property
+    def show_equity(self):
+        # Read through on every access: ThrottledSink turns it on and off per hand
+        return getattr(self._sink, 'show_equity', False)
+
+    def __getattr__(self, name):
+        attr = getattr(self._sink, name)
+        if not callable(attr):
+            return attr
+        stats = self._stats
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                stats.phase_time['display'] += perf_counter() - start
+        return timed
@@ -0,0 +1,374 @@
+"""
+Opponent hand ranges: 1326-combo weight arrays with Bayesian narrowing.
+
+A HandRange holds one weight per two-card combo (NumPy float array indexed
+like COMBOS). Bots start each opponent at a uniform range, remove blockers
+(their own cards and the board) and multiply in the likelihood of every
+action the opponent takes given each combo's strength:
+
+    ranges = OpponentRanges()
+    ranges.observe(observation)        # incremental: only new actions/cards
+    villain = ranges[name]
+    hand_vs_range(observation.hole_cards, observation.community_cards, villain)
+
+Strength is a combo's percentile among the live combos: preflop by its
+class's equity against a random hand (preflop.py), post-flop by its hand
+rank on the current board (one evaluate_batch call per street). Equity
+against a range is exact when enumeration is cheap (the river, narrow turn
+ranges) and otherwise sampled in one batch with a bounded standard error,
+about 1.5 ms per opponent; see hand_vs_range().
+"""
+from itertools import combinations
+from math import comb
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from deck import FULL_DECK, partial_shuffle_batch
+from hand_evaluator import evaluate_batch
+from preflop import class_index, class_label
+
+NUM_COMBOS = 1326
+
+DECK = np.array(FULL_DECK, dtype=np.int64)
+_CARD_INDEX = {c: i for i, c in enumerate(FULL_DECK)}
+
+# COMBO_INDEX[i]: deck indices of combo i's two cards; COMBOS[i]: the treys ints
+COMBO_INDEX = np.array(list(combinations(range(52), 2)), dtype=np.intp)
+COMBOS = DECK[COMBO_INDEX]
+# CARD_COMBOS[card]: the 51 combos containing a deck index, for blocker removal
+CARD_COMBOS = np.array([np.nonzero((COMBO_INDEX == c).any(axis=1))[0] for c in range(52)])
+# Preflop class (0-168, as in preflop.py) of every combo
+COMBO_CLASS = np.array([class_index((a >> 8) & 0xF, (b >> 8) & 0xF, bool(a & b & 0xF000))
+                        for a, b in COMBOS.tolist()], dtype=np.intp)
+
+# Community cards showing during each stage's betting
+BOARD_SIZE = {"pre-flop": 0, "flop": 3, "turn": 4, "river": 5}
+
+# Weight every raise keeps however weak the hand (bluffs)
+BLUFF_FLOOR = 0.05
+
+_preflop_strength = None
+
+
+def card_indices(cards: Sequence[int]) -> List[int]:
+    """Deck indices (0-51) of treys card ints."""
+    return [_CARD_INDEX[c] for c in cards]
+
+
+def combo_index(card1: int, card2: int) -> int:
+    """Index (0-1325) of a two-card combo, in either card order."""
+    a, b = sorted((_CARD_INDEX[card1], _CARD_INDEX[card2]))
+    return a * (103 - a) // 2 + b - a - 1
+
+
+# ===== STRENGTH =====
+
+def _percentile(values: np.ndarray, live: np.ndarray) -> np.ndarray:
+    """Percentile (0 = weakest, 1 = strongest) of each value among values[live]; higher is stronger."""
+    ranked = np.sort(values[live])
+    n = len(ranked)
+    below = np.searchsorted(ranked, values, side='left')
+    equal = np.searchsorted(ranked, values, side='right') - below
+    return (below + 0.5 * (equal - 1)) / max(1, n - 1)
+
+
+def preflop_strength() -> np.ndarray:
+    """Percentile of every combo by preflop equity against one random hand."""
+    global _preflop_strength
+    if _preflop_strength is None:
+        from preflop import load_table
+        equity = np.asarray(load_table())[:, 0]
+        _preflop_strength = _percentile(equity[COMBO_CLASS], np.ones(NUM_COMBOS, dtype=bool))
+    return _preflop_strength
+
+
+def board_strength(board: Sequence[int]) -> np.ndarray:
+    """
+    Percentile of every combo's made hand on a 3-5 card board, among the
+    combos the board doesn't block (blocked combos get 0).
+    """
+    board = list(board)
+    live = np.ones(NUM_COMBOS, dtype=bool)
+    live[CARD_COMBOS[card_indices(board)].ravel()] = False
+    rows = np.hstack([COMBOS[live], np.broadcast_to(np.array(board, dtype=np.int64),
+                                                    (int(live.sum()), len(board)))])
+    # treys ranks: lower is better, so negate for "higher is stronger"
+    ranks = np.zeros(NUM_COMBOS, dtype=np.int64)
+    ranks[live] = -evaluate_batch(rows).astype(np.int64)
+    strength = _percentile(ranks, live)
+    strength[~live] = 0.0
+    return strength
+
+
+def action_likelihood(action: str, strength: np.ndarray, size: float = 0.0) -> np.ndarray:
+    """
+    Default model of P(action | combo) from combo strength percentiles.
+
+    Raises favour strong hands (more so the bigger they are relative to the
+    pot, `size`) but keep a bluffing floor; calls favour the middle and top
+    of the range; checks thin out the very strongest (who would often bet);
+    folds favour weak hands. Override per bot by passing your own
+    likelihood to HandRange.update / OpponentRanges.
+    """
+    s = strength
+    if action in ("raise", "bet", "call and raise", "all-in", "allin"):
+        return BLUFF_FLOOR + (1 - BLUFF_FLOOR) * s ** (1.5 + min(size, 2.0))
+    if action == "call":
+        return 0.1 + 0.9 * np.minimum(1.0, 1.6 * s) * (1 - 0.5 * s ** 4)
+    if action == "check":
+        return 1 - 0.6 * s ** 3
+    if action == "fold":
+        return 1 - s
+    return np.ones_like(s)
+
+
+# ===== RANGES =====
+
+class HandRange:
+    """Weights over the 1326 combos; only relative weights matter."""
+
+    __slots__ = ('weights',)
+
+    def __init__(self, weights: Optional[np.ndarray] = None):
+        self.weights = np.ones(NUM_COMBOS) if weights is None else np.asarray(weights, dtype=float)
+
+    @classmethod
+    def from_labels(cls, labels) -> "HandRange":
+        """Range of whole starting-hand classes, e.g. 'AA,KK,AKs,AQo' or a list of labels."""
+        if isinstance(labels, str):
+            labels = labels.replace(" ", "").split(",")
+        wanted = {label for label in labels if label}
+        mask = np.array([class_label(c) in wanted for c in range(169)])
+        return cls(mask[COMBO_CLASS].astype(float))
+
+    @classmethod
+    def top(cls, fraction: float) -> "HandRange":
+        """The strongest `fraction` of combos by preflop equity."""
+        return cls((preflop_strength() >= 1 - fraction).astype(float))
+
+    def copy(self) -> "HandRange":
+        return HandRange(self.weights.copy())
+
+    def __len__(self):
+        """Number of combos with non-zero weight."""
+        return int(np.count_nonzero(self.weights))
+
+    def remove(self, cards: Sequence[int]):
+        """Zero every combo holding one of `cards` (blockers)."""
+        if len(cards):
+            self.weights[CARD_COMBOS[card_indices(cards)].ravel()] = 0.0
+
+    def update(self, likelihood: np.ndarray):
+        """Bayesian update: multiply in P(observation | combo) for every combo."""
+        self.weights *= likelihood
+
+    def probabilities(self) -> np.ndarray:
+        total = self.weights.sum()
+        return self.weights / total if total > 0 else self.weights
+
+    def combos(self) -> Dict[tuple, float]:
+        """{(card1, card2): probability} for the live combos."""
+        p = self.probabilities()
+        live = np.nonzero(p)[0]
+        return dict(zip(map(tuple, COMBOS[live].tolist()), p[live].tolist()))
+
+    def class_weights(self) -> Dict[str, float]:
+        """Probability mass per starting-hand class, e.g. {'AA': 0.02, ...}."""
+        mass = np.bincount(COMBO_CLASS, weights=self.probabilities(), minlength=169)
+        return {class_label(c): float(m) for c, m in enumerate(mass) if m > 0}
+
+
+class OpponentRanges:
+    """
+    Per-opponent ranges for one bot, updated incrementally from observations.
+
+    observe() resets every opponent to a uniform range when a new hand
+    starts, then applies only the action_history entries and board cards it
+    hasn't seen yet. Board strengths are computed once per street.
+
+    Args:
+        likelihood: fn(action, strength, size) -> weights; defaults to
+            action_likelihood.
+    """
+
+    def __init__(self, likelihood=action_likelihood):
+        self.likelihood = likelihood
+        self.ranges = {}  # {name: HandRange}
+        self._hand = None
+        self._seen_actions = 0
+        self._seen_board = 0
+        self._pot = 0
+        self._strength = {}  # {board tuple: strength array}
+
+    def __getitem__(self, name: str) -> HandRange:
+        return self.ranges[name]
+
+    def _strength_for(self, board) -> np.ndarray:
+        key = tuple(board)
+        strength = self._strength.get(key)
+        if strength is None:
+            strength = preflop_strength() if not key else board_strength(key)
+            self._strength[key] = strength
+        return strength
+
+    def observe(self, observation) -> "OpponentRanges":
+        hole = list(observation.hole_cards)
+        history = observation.action_history
+        hand = (tuple(hole), observation.dealer_index)
+        if hand != self._hand or len(history) < self._seen_actions:
+            self._hand = hand
+            self._seen_actions = 0
+            self._seen_board = 0
+            self._pot = 0
+            self._strength = {}
+            self.ranges = {}
+            for seat, name in enumerate(observation.names):
+                if seat != observation.seat:
+                    r = HandRange()
+                    r.remove(hole)
+                    self.ranges[name] = r
+
+        board = list(observation.community_cards)
+        if len(board) > self._seen_board:
+            for r in self.ranges.values():
+                r.remove(board[self._seen_board:])
+            self._seen_board = len(board)
+
+        for entry in history[self._seen_actions:]:
+            action = entry['action']
+            amount = entry['amount']
+            r = self.ranges.get(entry['player'])
+            if r is not None and action not in ("small blind", "big blind"):
+                strength = self._strength_for(board[:BOARD_SIZE[entry['stage']]])
+                r.update(self.likelihood(action, strength, amount / self._pot if self._pot else 1.0))
+            self._pot += amount
+        self._seen_actions = len(history)
+        return self
+
+    def live(self, observation) -> Dict[str, HandRange]:
+        """Ranges of the opponents who haven't folded."""
+        return {name: self.ranges[name] for seat, name in enumerate(observation.names)
+                if name in self.ranges and not observation.folded[seat]}
+
+
+# ===== EQUITY =====
+
+def _live_combos(weights: np.ndarray, dead: Sequence[int]):
+    w = weights.copy()
+    if len(dead):
+        w[CARD_COMBOS[card_indices(dead)].ravel()] = 0.0
+    live = np.nonzero(w)[0]
+    if not len(live):
+        raise ValueError("Range has no combos left after removing dead cards")
+    return live, w[live]
+
+
+def _all_runouts(dead: Sequence[int], need: int) -> np.ndarray:
+    """(R, need) deck indices of every runout that avoids the dead cards."""
+    if need == 0:
+        return np.empty((1, 0), dtype=np.intp)
+    remaining = np.setdiff1d(np.arange(52), card_indices(dead))
+    return remaining[np.array(list(combinations(range(len(remaining)), need)), dtype=np.intp)]
+
+
+def hand_vs_range(hole_cards: Sequence[int], board: Sequence[int], villain: HandRange,
+                  samples: int = 2000, seed=None, rng=None) -> Dict[str, float]:
+    """
+    Equity of a hand against a range.
+
+    Exact when enumerating costs no more evaluations than sampling: every
+    live villain combo is scored on every remaining runout in one batched
+    evaluation. That is always the case on the river (at most 1,081 hands),
+    and on the turn against ranges of up to 2 * samples / 46 combos.
+    Otherwise `samples` deals are drawn, each an independent runout and
+    villain combo by weight; the fifth or less that share a card are
+    dropped. The standard error is then at most 0.5 / sqrt(kept deals),
+    under 0.013 with the default 2,000 (about 0.011 measured for AKs against
+    a uniform range), at about 1.5 ms per call. A full turn enumeration
+    would cost ~46,000 evaluations (6 ms or more), so wide turn ranges are
+    sampled too; pass a larger `samples` to trade time for accuracy.
+
+    Returns:
+        {'win', 'tie', 'equity'} for the hand, weighted by the range.
+    """
+    hole = list(hole_cards)
+    board = list(board)
+    need = 5 - len(board)
+    live, w = _live_combos(villain.weights, hole + board)
+    if need and len(live) * comb(50 - len(board), need) > 2 * samples:
+        # Runouts from the cards hero and the board leave, combos by weight,
+        # independently; pairs sharing a card are dropped, which leaves each
+        # kept pair exactly as likely as in a real deal
+        rng = rng or np.random.default_rng(seed)
+        remaining = np.setdiff1d(np.arange(52), card_indices(hole + board))
+        runouts = partial_shuffle_batch(remaining, samples, need, rng)
+        combos = live[rng.choice(len(live), samples, p=w / w.sum())]
+        keep = ~(COMBO_INDEX[combos][:, :, None] == runouts[:, None, :]).any(axis=(1, 2))
+        runouts, combos = runouts[keep], combos[keep]
+        n = len(runouts)
+        boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (n, len(board))),
+                            DECK[runouts]])
+        hero = evaluate_batch(np.hstack([np.broadcast_to(np.array(hole, dtype=np.int64), (n, 2)),
+                                         boards]))
+        villain_ranks = evaluate_batch(np.hstack([COMBOS[combos], boards]))
+        win = float(np.mean(hero < villain_ranks))
+        tie = float(np.mean(hero == villain_ranks))
+        return {'win': win, 'tie': tie, 'equity': win + tie / 2}
+
+    runouts = _all_runouts(hole + board, need)
+    num_runouts, n = len(runouts), len(live)
+    boards = np.hstack([np.broadcast_to(np.array(board, dtype=np.int64), (num_runouts, len(board))),
+                        DECK[runouts]])
+
+    hero = evaluate_batch(np.hstack([np.broadcast_to(np.array(hole, dtype=np.int64),
+                                                     (num_runouts, 2)), boards]))
+    rows = np.concatenate([np.broadcast_to(COMBOS[live], (num_runouts, n, 2)),
+                           np.broadcast_to(boards[:, None, :], (num_runouts, n, 5))], axis=2)
+    # Combos sharing a card with the runout can't be held on that runout; they
+    # are scored as a dummy valid hand and then given no weight
+    idx = COMBO_INDEX[live]
+    blocked = (idx[None, :, :, None] == runouts[:, None, None, :]).any(axis=(2, 3))
+    rows[blocked] = rows[~blocked][0]
+    villain_ranks = evaluate_batch(rows.reshape(-1, 7)).reshape(num_runouts, n)
+    weight = np.where(blocked, 0.0, w[None, :])
+    total = weight.sum()
+    win = (weight * (hero[:, None] < villain_ranks)).sum() / total
+    tie = (weight * (hero[:, None] == villain_ranks)).sum() / total
+    return {'win': float(win), 'tie': float(tie), 'equity': float(win + tie / 2)}
+
+
+def range_vs_range(hero: HandRange, villain: HandRange, board: Sequence[int] = (),
+                   samples: int = 2000, seed=None, rng=None) -> Dict[str, float]:
+    """
+    Monte Carlo equity of one range against another: draws combo pairs by
+    weight (rejecting pairs that share a card) and a random runout for each.
+
+    Returns:
+        {'win', 'tie', 'equity'} for `hero`.
+    """
+    board = list(board)
+    rng = rng or np.random.default_rng(seed)
+    live1, w1 = _live_combos(hero.weights, board)
+    live2, w2 = _live_combos(villain.weights, board)
+    a = live1[rng.choice(len(live1), samples, p=w1 / w1.sum())]
+    b = live2[rng.choice(len(live2), samples, p=w2 / w2.sum())]
+    ok = ~(COMBO_INDEX[a][:, :, None] == COMBO_INDEX[b][:, None, :]).any(axis=(1, 2))
+    a, b = a[ok], b[ok]
+    if not len(a):
+        raise ValueError("Ranges never hold disjoint combos")
+
+    need = 5 - len(board)
+    boards = np.broadcast_to(np.array(board, dtype=np.int64), (len(a), len(board)))
+    if need:
+        keys = rng.random((len(a), 52))
+        rows = np.arange(len(a))[:, None]
+        keys[:, card_indices(board)] = 2.0
+        keys[rows, COMBO_INDEX[a]] = 2.0
+        keys[rows, COMBO_INDEX[b]] = 2.0
+        boards = np.hstack([boards, DECK[np.argpartition(keys, need - 1, axis=1)[:, :need]]])
+    r1 = evaluate_batch(np.hstack([COMBOS[a], boards]))
+    r2 = evaluate_batch(np.hstack([COMBOS[b], boards]))
+    win = float(np.mean(r1 < r2))
+    tie = float(np.mean(r1 == r2))
+    return {'win': win, 'tie': tie, 'equity': win + tie / 2}
@@ -0,0 +1,124 @@
+"""
+No-limit betting rules shared by the engine, bots and search code.
+
+legal_actions() turns a seat's compact state (stack, chips already bet this
+street, the street's current bet and minimum raise, and whether betting is
+open to it) into the set of legal moves in O(1); validate_action() maps whatever a bot returned onto the
+nearest legal move. The engine applies every decision through these, so a
+bot can never bet chips it doesn't have or check when facing a bet.
+
+Amount conventions (as everywhere in the engine):
+  * ('call', n): n is the chips the call costs (capped at the stack).
+  * ('raise', n): n is the raise on top of the call, so the seat puts in
+    to_call + n and the street bet rises by n.
+  * ('fold', 0) and ('check', 0).
+"""
+from typing import List, NamedTuple, Sequence, Tuple
+
+FOLD = "fold"
+CHECK = "check"
+CALL = "call"
+RAISE = "raise"
+
+# Other names bots may use, mapped onto the four canonical actions
+RAISE_ALIASES = ("raise", "bet", "call and raise", "all-in", "allin")
+
+
+class LegalActions(NamedTuple):
+    to_call: int     # Chips a call costs (capped at the stack; 0 when nothing is owed)
+    can_check: bool  # Nothing is owed
+    can_raise: bool  # Chips remain after calling
+    min_raise: int   # Smallest raise increment (less than the minimum only when all-in)
+    max_raise: int   # Largest raise increment: the rest of the stack
+
+    @property
+    def can_call(self) -> bool:
+        return self.to_call > 0
+
+    @property
+    def all_in(self) -> Tuple[str, int]:
+        """The move that puts the whole stack in."""
+        if self.can_raise:
+            return (RAISE, self.max_raise)
+        return (CALL, self.to_call) if self.to_call else (CHECK, 0)
+
+    def actions(self) -> List[str]:
+        """Names of the legal actions."""
+        names = [FOLD, CHECK if self.can_check else CALL]
+        if self.can_raise:
+            names.append(RAISE)
+        return names
+
+    def enumerate(self, raise_sizes: Sequence[int] = ()) -> List[Tuple[str, int]]:
+        """
+        Concrete moves for search: fold (only when facing a bet), check or
+        call, the minimum raise, any extra raise increments in
+        `raise_sizes` that are legal, and all-in.
+        """
+        moves = [(CHECK, 0)] if self.can_check else [(FOLD, 0), (CALL, self.to_call)]
+        if self.can_raise:
+            sizes = {self.min_raise, self.max_raise}
+            sizes.update(s for s in raise_sizes if self.min_raise <= s <= self.max_raise)
+            moves.extend((RAISE, s) for s in sorted(sizes))
+        return moves
+
+
+def legal_actions(stack: int, bet: int, current_bet: int, min_raise: int,
+                  reopened: bool = True) -> LegalActions:
+    """
+    Legal moves for a seat.
+
+    Args:
+        stack: Chips behind (not yet bet).
+        bet: Chips the seat has already put in this street.
+        current_bet: Highest bet this street.
+        min_raise: Minimum raise increment (the big blind, or the last
+            full raise this street if larger).
+        reopened: False when the seat already acted since the last full
+            raise, so only a short all-in has raised the bet since: it may
+            call or fold but not raise again.
+    """
+    owed = current_bet - bet
+    if owed < 0:
+        owed = 0
+    to_call = owed if owed < stack else stack
+    rest = stack - to_call
+    if rest > 0 and reopened:
+        return LegalActions(to_call, owed == 0, True, min_raise if min_raise < rest else rest, rest)
+    return LegalActions(to_call, owed == 0, False, 0, 0)
+
+
+def validate_action(legal: LegalActions, action, amount) -> Tuple[str, int]:
+    """
+    Map a bot's (action, amount) onto a legal move.
+
+    - Raises (and 'bet', 'call and raise', 'all-in') are clamped into
+      [min_raise, max_raise]; 'call and raise' means a minimum raise and
+      'all-in' a maximum one. A raise that isn't possible becomes a call
+      (or a check when nothing is owed).
+    - A call always costs exactly to_call; a call of nothing is a check.
+    - A check when facing a bet, and anything unrecognised, is a fold
+      when facing a bet and a check otherwise.
+    """
+    if action in RAISE_ALIASES:
+        if not legal.can_raise:
+            return (CALL, legal.to_call) if legal.to_call else (CHECK, 0)
+        if action == "call and raise":
+            amount = legal.min_raise
+        elif action in ("all-in", "allin"):
+            amount = legal.max_raise
+        else:
+            try:
+                amount = int(amount)
+            except (TypeError, ValueError):
+                amount = legal.min_raise
+        if amount < legal.min_raise:
+            amount = legal.min_raise
+        elif amount > legal.max_raise:
+            amount = legal.max_raise
+        return (RAISE, amount)
+    if action == CALL and legal.to_call:
+        return (CALL, legal.to_call)
+    if action == FOLD or not legal.can_check:
+        return (FOLD, 0)
+    return (CHECK, 0)
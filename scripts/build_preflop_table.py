@@ -0,0 +1,80 @@
+"""
+Regenerate data/preflop_equity.npz.
+
+For each of the 169 starting-hand classes, estimates pot share at showdown
+against 1-9 random opponents by Monte Carlo. Runs are reproducible: the same
+--seed and --samples always produce the same table.
+
+    python scripts/build_preflop_table.py --samples 20000 --seed 2024
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from treys import Card, Deck  # noqa: E402
+
+from hand_evaluator import evaluate_batch  # noqa: E402
+from preflop import MAX_OPPONENTS, TABLE_PATH, class_label  # noqa: E402
+
+
+def representative(index: int):
+    """Two concrete treys cards for a class (suits don't matter beyond suitedness)."""
+    a, b = divmod(index, 13)
+    high, low = max(a, b), min(a, b)
+    suited = a > b
+    r1, r2 = Card.STR_RANKS[high], Card.STR_RANKS[low]
+    return [Card.new(r1 + "s"), Card.new(r2 + ("s" if suited else "h"))]
+
+
+def class_equity(hole, samples: int, rng) -> np.ndarray:
+    """Pot share of `hole` against 1..MAX_OPPONENTS random opponents."""
+    deck = np.array([c for c in Deck.GetFullDeck() if c not in hole], dtype=np.int64)
+    needed = 5 + 2 * MAX_OPPONENTS
+    idx = np.argpartition(rng.random((samples, len(deck))), needed - 1, axis=1)[:, :needed]
+    dealt = deck[idx]
+    board = dealt[:, :5]
+
+    hero = evaluate_batch(np.hstack([np.broadcast_to(hole, (samples, 2)), board]))
+    villains = np.stack([
+        evaluate_batch(np.hstack([dealt[:, 5 + 2 * i:7 + 2 * i], board]))
+        for i in range(MAX_OPPONENTS)
+    ])                                                   # (opponents, samples)
+
+    equity = np.empty(MAX_OPPONENTS)
+    for n in range(1, MAX_OPPONENTS + 1):
+        best_villain = villains[:n].min(axis=0)
+        ties = (villains[:n] == hero).sum(axis=0)
+        share = np.where(hero < best_villain, 1.0,
+                         np.where(hero == best_villain, 1.0 / (ties + 1), 0.0))
+        equity[n - 1] = share.mean()
+    return equity
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=20000, help="Runouts per class")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--out", default=TABLE_PATH)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    table = np.zeros((169, MAX_OPPONENTS), dtype=np.float32)
+    start = time.perf_counter()
+    for index in range(169):
+        table[index] = class_equity(representative(index), args.samples, rng)
+    labels = np.array([class_label(i) for i in range(169)])
+
+    np.savez_compressed(args.out, equity=table, labels=labels,
+                        samples=args.samples, seed=args.seed)
+    print(f"Wrote {args.out} in {time.perf_counter() - start:.1f}s")
+    best = np.argsort(-table[:, 0])[:5]
+    print("Best heads-up:", ", ".join(f"{labels[i]} {table[i, 0]:.3f}" for i in best))
+
+
+if __name__ == "__main__":
+    main()
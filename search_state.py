@@ -0,0 +1,401 @@
+"""
+Compact, cloneable hand state for search bots (MCTS, CFR-style lookahead).
+
+SearchState holds one hand as flat per-seat lists and scalars - stacks,
+street bets, hand contributions, fold/all-in/acted flags, hole cards, the board
+and a deck with a cursor - and plays it forward with the same betting rules
+as the engine (rules.py) and the same pot settlement (pot.py). It never
+touches bots, GameState or the display, so it can be copied and rolled
+forward thousands of times inside make_decision:
+
+    state = SearchState.from_observation(observation)
+    state.determinize(rng)                     # guess opponents' cards and the runout
+    for move in state.legal_actions().enumerate():
+        state.apply(*move)
+        value = state.rollout(rng)[observation.seat]
+        state.undo()
+
+apply() records just enough to reverse itself, so undo() is O(1) except
+when it crosses a street (O(players)); clone() copies a handful of lists.
+"""
+import random
+
+from deck import FULL_DECK
+from hand_evaluator import evaluate_showdown
+from pot import build_pots, settle_pots
+from rules import CALL, CHECK, FOLD, RAISE, legal_actions
+
+STAGES = ("pre-flop", "flop", "turn", "river")
+_STREET_CARDS = (0, 3, 1, 1)  # Board cards dealt when each street starts
+
+
+class SearchState:
+    """One hand in progress, as plain lists; see the module docstring."""
+
+    __slots__ = (
+        'num_seats', 'dealer', 'small_blind', 'big_blind',
+        'stacks', 'bets', 'contrib', 'folded', 'all_in', 'acted', 'hole', 'board', 'deck', 'cursor',
+        'street', 'current_bet', 'min_raise', 'to_act', 'pending', 'num_live', 'num_actors',
+        'terminal', '_undo',
+    )
+
+    def __init__(self, stacks, hole, dealer=0, small_blind=10, big_blind=20, deck=None):
+        """
+        A fresh hand with blinds posted and the first player to act set.
+
+        Args:
+            stacks: Chips per seat before the blinds.
+            hole: Two cards per seat.
+            deck: Cards still to be dealt, in dealing order (defaults to the
+                rest of the deck in canonical order; see determinize()).
+        """
+        n = len(stacks)
+        self.num_seats = n
+        self.dealer = dealer
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.stacks = list(stacks)
+        self.bets = [0] * n
+        self.contrib = [0] * n
+        self.folded = [False] * n
+        self.all_in = [s <= 0 for s in stacks]
+        self.acted = [False] * n  # Acted since the street's last full raise
+        self.hole = [tuple(h) for h in hole]
+        self.board = []
+        if deck is None:
+            seen = {c for h in self.hole for c in h}
+            deck = [c for c in FULL_DECK if c not in seen]
+        self.deck = list(deck)
+        self.cursor = 0
+        self.street = 0
+        self.current_bet = 0
+        self.min_raise = big_blind
+        self.terminal = False
+        self._undo = []
+        self.num_live = n
+        self.num_actors = n - sum(self.all_in)
+
+        # Blinds, placed like the engine does (heads-up: the button posts the big blind)
+        sb = (dealer + 1) % n
+        bb = dealer if n == 2 else (dealer + 2) % n
+        self._post(sb, small_blind)
+        self._post(bb, big_blind)
+        self.current_bet = max(self.bets[sb], self.bets[bb])
+        self.num_actors = sum(1 for i in range(n) if not self.all_in[i])
+        self.pending = self.num_actors
+        self.to_act = sb if n == 2 else (bb + 1) % n
+        self._start_round()
+
+    @classmethod
+    def from_observation(cls, observation, rng=None):
+        """
+        The hand as the acting seat sees it. Opponents' hole cards and the
+        runout are unknown, so they are dealt at random (from `rng`, or a
+        fresh random.Random) from the unseen cards; call determinize() to
+        redraw them between rollouts.
+        """
+        state = cls.__new__(cls)
+        n = len(observation.names)
+        seat = observation.seat
+        state.num_seats = n
+        state.dealer = observation.dealer_index
+        state.small_blind = observation.small_blind
+        state.big_blind = observation.big_blind
+        state.stacks = list(observation.stacks)
+        state.bets = list(observation.bets)
+        state.folded = list(observation.folded)
+        state.all_in = [s <= 0 and not f for s, f in zip(observation.stacks, observation.folded)]
+        state.acted = list(observation.acted) or [False] * n
+        state.board = list(observation.community_cards)
+        state.street = STAGES.index(observation.stage)
+        state.current_bet = observation.current_bet
+        state.min_raise = observation.min_raise
+        state.terminal = False
+        state._undo = []
+        state.num_live = state.folded.count(False)
+        state.num_actors = sum(1 for i in range(n) if not state.folded[i] and not state.all_in[i])
+        state.to_act = seat
+
+        # Whole-hand contributions and who still owes an action this street,
+        # both recovered from the public action history
+        contrib = [0] * n
+        seat_of = {name: i for i, name in enumerate(observation.names)}
+        acted = set()
+        for entry in observation.action_history:
+            s = seat_of.get(entry['player'])
+            if s is None:
+                continue
+            contrib[s] += entry['amount']
+            if entry['stage'] != observation.stage or entry['action'] in ('small blind', 'big blind'):
+                continue
+            if entry['action'] in (RAISE, 'call and raise', 'all-in', 'bet'):
+                acted = {s}
+            else:
+                acted.add(s)
+        state.contrib = contrib
+        state.pending = sum(1 for i in range(n)
+                            if not state.folded[i] and not state.all_in[i] and i not in acted)
+
+        state.hole = [()] * n
+        state.hole[seat] = tuple(observation.hole_cards)
+        state.deck = []
+        state.cursor = 0
+        state.determinize(rng or random.Random(), seat)
+        return state
+
+    # ===== COPYING AND SAMPLING =====
+
+    def clone(self):
+        """Independent copy (the undo history is not copied, so it can't undo past here)."""
+        other = SearchState.__new__(SearchState)
+        other.num_seats = self.num_seats
+        other.dealer = self.dealer
+        other.small_blind = self.small_blind
+        other.big_blind = self.big_blind
+        other.stacks = self.stacks[:]
+        other.bets = self.bets[:]
+        other.contrib = self.contrib[:]
+        other.folded = self.folded[:]
+        other.all_in = self.all_in[:]
+        other.acted = self.acted[:]
+        other.hole = self.hole[:]
+        other.board = self.board[:]
+        other.deck = self.deck  # Never mutated in place; determinize() replaces it
+        other.cursor = self.cursor
+        other.street = self.street
+        other.current_bet = self.current_bet
+        other.min_raise = self.min_raise
+        other.to_act = self.to_act
+        other.pending = self.pending
+        other.num_live = self.num_live
+        other.num_actors = self.num_actors
+        other.terminal = self.terminal
+        other._undo = []
+        return other
+
+    def determinize(self, rng, seat=None):
+        """
+        Redeal everything `seat` can't see: other seats' hole cards and the
+        cards still to come. With seat=None only the runout is redrawn.
+        """
+        known = set(self.board)
+        keep = [i == seat for i in range(self.num_seats)] if seat is not None else \
+            [True] * self.num_seats
+        for i, h in enumerate(self.hole):
+            if keep[i]:
+                known.update(h)
+        unseen = [c for c in FULL_DECK if c not in known]
+        rng.shuffle(unseen)
+        pos = 0
+        for i in range(self.num_seats):
+            if not keep[i]:
+                self.hole[i] = (unseen[pos], unseen[pos + 1])
+                pos += 2
+        self.deck = unseen[pos:]
+        self.cursor = 0
+
+    # ===== RULES =====
+
+    def legal_actions(self):
+        """Legal moves for the seat to act (rules.LegalActions)."""
+        s = self.to_act
+        return legal_actions(self.stacks[s], self.bets[s], self.current_bet, self.min_raise,
+                             not self.acted[s])
+
+    def apply(self, action: str, amount: int = 0):
+        """
+        Play a legal (action, amount) for the seat to act, as produced by
+        legal_actions().enumerate() or rules.validate_action.
+        """
+        s = self.to_act
+        stacks, bets, acted = self.stacks, self.bets, self.acted
+        if self._undo is not None:
+            self._undo.append((s, stacks[s], bets[s], self.contrib[s], self.folded[s],
+                               self.all_in[s], acted, acted[s], self.current_bet, self.min_raise,
+                               self.pending, self.num_live, self.num_actors, self.street,
+                               self.cursor, len(self.board), None))
+
+        if action == FOLD:
+            self.folded[s] = True
+            self.num_live -= 1
+            self.num_actors -= 1
+            self.pending -= 1
+        elif action == CHECK:
+            self.pending -= 1
+        elif action == CALL:
+            self._post(s, amount)
+            self.pending -= 1
+        else:  # RAISE
+            self._post(s, self.current_bet - bets[s] + amount)
+            self.current_bet = bets[s]
+            if amount >= self.min_raise:
+                # A full raise reopens the betting; the old list stays with the undo record
+                self.min_raise = amount
+                acted = self.acted = [False] * self.num_seats
+            # Everyone else who can still act must respond (a short all-in
+            # leaves every other seat owing chips too, but not free to re-raise)
+            self.pending = self.num_actors - (0 if self.all_in[s] else 1)
+        acted[s] = True
+
+        if self.num_live == 1:
+            self.terminal = True
+        elif self.pending <= 0:
+            self._end_round()
+        else:
+            self._advance()
+
+    def undo(self):
+        """Take back the last apply()."""
+        (s, stack, bet, contrib, folded, all_in, acted, was_acted, self.current_bet, self.min_raise,
+         self.pending, self.num_live, self.num_actors, street, self.cursor, board_len,
+         bets) = self._undo.pop()
+        if bets is not None:
+            self.bets = bets
+        self.acted = acted
+        acted[s] = was_acted
+        self.stacks[s] = stack
+        self.bets[s] = bet
+        self.contrib[s] = contrib
+        self.folded[s] = folded
+        self.all_in[s] = all_in
+        self.street = street
+        del self.board[board_len:]
+        self.to_act = s
+        self.terminal = False
+
+    # ===== OUTCOME =====
+
+    def payoffs(self, board=None):
+        """
+        Net chips won or lost by each seat over the whole hand, once the
+        state is terminal (showdown ranks use the dealt hole cards and
+        `board`, by default the dealt board).
+        """
+        contrib = self.contrib
+        n = self.num_seats
+        folded = self.folded
+        live = [i for i in range(n) if not folded[i]]
+        result = [-c for c in contrib]
+        if len(live) == 1:
+            result[live[0]] += sum(contrib)
+            return result
+        hole = self.hole
+        ranks = evaluate_showdown([hole[i] for i in live], board or self.board)
+        top = contrib[live[0]]
+        if all(contrib[i] == top for i in live) and max(contrib) == top:
+            # Everyone live put in the same: one pot, so skip building side pots
+            best = min(ranks)
+            winners = [i for i, r in zip(live, ranks) if r == best]
+            share, odd = divmod(sum(contrib), len(winners))
+            for i in winners:
+                result[i] += share
+            if odd:
+                dealer = self.dealer
+                for i in sorted(winners, key=lambda s: (s - dealer - 1) % n)[:odd]:
+                    result[i] += 1
+            return result
+        won = settle_pots(build_pots(contrib, folded), dict(zip(live, ranks)), self.dealer, n)
+        for i, chips in won.items():
+            result[i] += chips
+        return result
+
+    def rollout(self, rng, policy=None):
+        """
+        Play the hand out from here on a scratch copy and return its
+        payoffs(); this state is left untouched.
+
+        With no policy the hand is checked down: the rest of the board is
+        drawn at random from the undealt cards and the live hands go to
+        showdown, the usual cheap leaf estimate for MCTS. Otherwise
+        `policy(state, legal, rng) -> (action, amount)` picks every move
+        (random_policy is a simple example).
+        """
+        if policy is None:
+            board = self.board[:]
+            deck, base = self.deck, self.cursor
+            span = len(deck) - base
+            rand = rng.random
+            while len(board) < 5:
+                card = deck[base + int(rand() * span)]
+                if card not in board:
+                    board.append(card)
+            return self.payoffs(board)
+        state = self.clone()
+        state._undo = None  # Nothing to take back on a throwaway copy
+        while not state.terminal:
+            state.apply(*policy(state, state.legal_actions(), rng))
+        return state.payoffs()
+
+    # ===== INTERNALS =====
+
+    def _post(self, s, amount):
+        stack = self.stacks[s]
+        if amount >= stack:
+            amount = stack
+            if not self.all_in[s]:
+                self.all_in[s] = True
+                self.num_actors -= 1
+        self.stacks[s] = stack - amount
+        self.bets[s] += amount
+        self.contrib[s] += amount
+
+    def _advance(self):
+        """Move to_act to the next seat that can still act."""
+        n = self.num_seats
+        s = (self.to_act + 1) % n
+        folded, all_in = self.folded, self.all_in
+        while folded[s] or all_in[s]:
+            s = (s + 1) % n
+        self.to_act = s
+
+    def _start_round(self):
+        """Skip betting that can't happen; end the hand when nobody is left to bet."""
+        if self.num_actors == 0 or (self.num_actors == 1 and self._nobody_owes()):
+            self._run_out()
+        elif self.folded[self.to_act] or self.all_in[self.to_act]:
+            self._advance()
+
+    def _nobody_owes(self):
+        bets, current = self.bets, self.current_bet
+        return all(bets[i] >= current for i in range(self.num_seats)
+                   if not self.folded[i] and not self.all_in[i])
+
+    def _end_round(self):
+        """Close the street: reset bets and deal the next one (or reach showdown)."""
+        if self._undo is not None:
+            self._undo[-1] = self._undo[-1][:-1] + (self.bets,)
+        self.bets = [0] * self.num_seats
+        self.acted = [False] * self.num_seats
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        if self.street == 3:
+            self.terminal = True
+            return
+        self._deal_street()
+        if self.num_actors < 2:
+            self._run_out()
+            return
+        self.pending = self.num_actors
+        self.to_act = self.dealer
+        self._advance()
+
+    def _deal_street(self):
+        self.street += 1
+        k = _STREET_CARDS[self.street]
+        self.board.extend(self.deck[self.cursor:self.cursor + k])
+        self.cursor += k
+
+    def _run_out(self):
+        while self.street < 3:
+            self._deal_street()
+        self.terminal = True
+
+
+def random_policy(state, legal, rng):
+    """Mostly check or call, sometimes fold to a bet, occasionally min-raise or shove."""
+    r = rng.random()
+    if legal.can_raise and r < 0.15:
+        return (RAISE, legal.min_raise if r < 0.12 else legal.max_raise)
+    if not legal.can_check and r > 0.75:
+        return (FOLD, 0)
+    return (CHECK, 0) if legal.can_check else (CALL, legal.to_call)
@@ -0,0 +1,208 @@
+"""
+Streaming per-bot session statistics: VPIP, PFR, 3-bet, aggression, bb/100.
+
+Pass a SessionStats as `tracker` to play_hand / run_tournament (or run
+`python main.py --headless --player-stats`). After every hand the engine
+hands it the hand's actions and each seat's chip change; it updates a fixed
+set of counters per player name, so the cost is O(1) per action and memory
+is O(bots) however many hands are played. Results can be queried at any
+time, e.g. by a bot reading its opponents' tendencies:
+
+    tracker = SessionStats()
+    for p in players:
+        p.session_stats = tracker
+    run_tournament(players, 1_000_000, seed=1, tracker=tracker)
+    tracker.save("stats.json")
+
+Stats update at hand boundaries only: record_hand() runs once the pot is
+settled, so during a hand a bot sees every counter as of the previous
+hand's end, and the hand in progress is only in observation.action_history.
+(VPIP, PFR and 3-bet chances are per-hand facts, and bb/100 needs the
+result, so counting them before the hand ends would be premature anyway.)
+
+Definitions (pre-flop unless noted):
+  VPIP      hands where the player called or raised (blinds don't count)
+  PFR       hands where the player raised
+  3-bet     raised when first facing exactly one raise, out of the hands
+            where they faced one
+  AF        post-flop bets+raises divided by post-flop calls
+  bb/100    net chips per hand in big blinds, x100, with a running variance
+            (Welford) for its standard error
+"""
+import json
+import math
+from typing import Dict, List, Optional
+
+PREFLOP = "pre-flop"
+RAISES = ("raise", "call and raise")
+
+
+class PlayerStats:
+    """Counters for one player; ratios are computed on demand."""
+
+    __slots__ = ('hands', 'vpip_hands', 'pfr_hands', 'three_bet_chances', 'three_bets',
+                 'postflop_raises', 'postflop_calls', 'folds', 'net_bb', '_mean', '_m2')
+
+    def __init__(self):
+        self.hands = 0
+        self.vpip_hands = 0
+        self.pfr_hands = 0
+        self.three_bet_chances = 0
+        self.three_bets = 0
+        self.postflop_raises = 0
+        self.postflop_calls = 0
+        self.folds = 0
+        self.net_bb = 0.0
+        self._mean = 0.0  # Welford running mean / sum of squares of bb per hand
+        self._m2 = 0.0
+
+    def add_result(self, bb: float):
+        """Fold one hand's net result (in big blinds) into the running moments."""
+        self.hands += 1
+        self.net_bb += bb
+        delta = bb - self._mean
+        self._mean += delta / self.hands
+        self._m2 += delta * (bb - self._mean)
+
+    def merge(self, other: "PlayerStats"):
+        """Combine with counters from another run (parallel Welford update)."""
+        n = self.hands + other.hands
+        if n:
+            delta = other._mean - self._mean
+            self._m2 += other._m2 + delta * delta * self.hands * other.hands / n
+            self._mean += delta * other.hands / n
+        for name in self.__slots__[:-2]:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    @property
+    def vpip(self) -> float:
+        return self.vpip_hands / self.hands if self.hands else 0.0
+
+    @property
+    def pfr(self) -> float:
+        return self.pfr_hands / self.hands if self.hands else 0.0
+
+    @property
+    def three_bet(self) -> float:
+        return self.three_bets / self.three_bet_chances if self.three_bet_chances else 0.0
+
+    @property
+    def aggression_factor(self) -> float:
+        if self.postflop_calls:
+            return self.postflop_raises / self.postflop_calls
+        return float(self.postflop_raises)
+
+    @property
+    def bb_per_100(self) -> float:
+        return self._mean * 100
+
+    @property
+    def bb_per_100_stderr(self) -> float:
+        if self.hands < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self.hands - 1) / self.hands) * 100
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'hands': self.hands,
+            'vpip': self.vpip,
+            'pfr': self.pfr,
+            'three_bet': self.three_bet,
+            'aggression_factor': self.aggression_factor,
+            'bb_per_100': self.bb_per_100,
+            'bb_per_100_stderr': self.bb_per_100_stderr,
+            'net_bb': self.net_bb,
+            'counters': {name: getattr(self, name) for name in self.__slots__[:-3]},
+        }
+
+
+class SessionStats:
+    """Per-player PlayerStats for a session, keyed by player name."""
+
+    def __init__(self):
+        self.players = {}  # {name: PlayerStats}
+
+    def get(self, name: str) -> Optional[PlayerStats]:
+        """A player's stats so far, or None if they haven't played a hand yet."""
+        return self.players.get(name)
+
+    def _player(self, name: str) -> PlayerStats:
+        s = self.players.get(name)
+        if s is None:
+            s = self.players[name] = PlayerStats()
+        return s
+
+    def record_hand(self, seats: List, chips_start: List[int], action_history: List,
+                    big_blind: int):
+        """
+        Update counters from one finished hand (the only time they change).
+
+        Args:
+            seats: Player objects in seat order as dealt.
+            chips_start: Each seat's stack before the blinds.
+            action_history: The hand's {'player', 'action', 'amount', 'stage'}
+                entries, blinds included.
+            big_blind: Big blind for this hand (the bb/100 unit).
+        """
+        players = self.players
+        for p, chips in zip(seats, chips_start):
+            self._player(p.name).add_result((p.chips - chips) / big_blind)
+
+        raises = 0          # Pre-flop raises so far
+        vpip = set()
+        pfr = set()
+        faced_raise = set()  # Players who have had their 3-bet chance
+        for entry in action_history:
+            action = entry['action']
+            name = entry['player']
+            if entry['stage'] == PREFLOP:
+                if action == "small blind" or action == "big blind":
+                    continue
+                if raises == 1 and name not in faced_raise:
+                    faced_raise.add(name)
+                    s = players[name]
+                    s.three_bet_chances += 1
+                    if action in RAISES:
+                        s.three_bets += 1
+                if action in RAISES:
+                    raises += 1
+                    vpip.add(name)
+                    pfr.add(name)
+                elif action == "call":
+                    vpip.add(name)
+                elif action == "fold":
+                    players[name].folds += 1
+            elif action in RAISES:
+                players[name].postflop_raises += 1
+            elif action == "call":
+                players[name].postflop_calls += 1
+            elif action == "fold":
+                players[name].folds += 1
+        for name in vpip:
+            players[name].vpip_hands += 1
+        for name in pfr:
+            players[name].pfr_hands += 1
+
+    def merge(self, other: "SessionStats"):
+        """Fold another session's stats into this one (e.g. from other tables)."""
+        for name, s in other.players.items():
+            self._player(name).merge(s)
+
+    def summary(self) -> Dict[str, Dict]:
+        """{name: PlayerStats.summary()} for every player seen."""
+        return {name: s.summary() for name, s in self.players.items()}
+
+    def save(self, path: str):
+        """Export the summary as JSON."""
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    def format(self) -> str:
+        """Human-readable table, biggest winners first."""
+        lines = ["Player             hands   VPIP    PFR  3-bet     AF     bb/100"]
+        for name, s in sorted(self.players.items(), key=lambda x: -x[1].bb_per_100):
+            lines.append(f"{name:<14}{s.hands:>10}{s.vpip:>7.1%}{s.pfr:>7.1%}{s.three_bet:>7.1%}"
+                         f"{s.aggression_factor:>7.2f}{s.bb_per_100:>+9.1f} "
+                         f"±{1.96 * s.bb_per_100_stderr:.1f}")
+        return "\n".join(lines)
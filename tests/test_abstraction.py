@@ -0,0 +1,63 @@
+"""Card abstraction: a small pre-flop build, its lookups, and resuming from checkpoints."""
+import numpy as np
+import pytest
+from treys import Card
+
+from abstraction import CardAbstraction, build_street, class_size, equity_histograms
+from isomorphism import indexer
+
+
+def cards(text):
+    return [Card.new(c) for c in text.split()]
+
+
+def build(directory, **overrides):
+    params = dict(buckets=8, directory=str(directory), runouts=32, chunk_size=64, workers=1,
+                  seed=3, log=lambda message: None)
+    params.update(overrides)
+    return build_street("pre-flop", **params)
+
+
+def test_class_sizes_cover_every_deal():
+    hands = indexer((2,))
+    assert sum(class_size(hands.unindex(i)[0], []) for i in range(hands.size)) == 1326
+    assert class_size(cards("As Ah"), []) == 6
+    assert class_size(cards("As Ks"), []) == 4
+    assert class_size(cards("As Kh"), []) == 12
+
+
+def test_histograms_count_every_runout():
+    rng = np.random.default_rng(0)
+    counts = equity_histograms([(cards("As Ah"), cards("Kd 7c 2h")),
+                                (cards("7s 2d"), cards("Kd Kc 9h"))], runouts=40, rng=rng)
+    assert counts.shape == (2, 20)
+    assert counts.sum(axis=1).tolist() == [40, 40]
+    # Bins are equal-width equity ranges, so aces sit high and 7-2 sits low
+    assert counts[0, 15:].sum() > 30 and counts[1, :5].sum() > 30
+
+
+def test_build_and_lookup(tmp_path):
+    info = build(tmp_path)
+    assert (info['canonical_hands'], info['buckets']) == (169, 8)
+    assert info['bucket_equity'] == sorted(info['bucket_equity'])
+    assert sum(info['bucket_share']) == pytest.approx(1, abs=1e-4)
+
+    abstraction = CardAbstraction(str(tmp_path))
+    assert abstraction.available() == ["pre-flop"]
+    assert abstraction.bucket(cards("As Ah")) == abstraction.bucket(cards("Ad Ac"))
+    assert abstraction.bucket(cards("As Ah")) == 7
+    assert abstraction.bucket(cards("7s 2d")) <= 1
+    assert abstraction.bucket_equity("pre-flop", 7) > 0.75
+    assert abstraction.bucket(cards("As Ah"), cards("Kd 7c 2h")) is None  # Flop not built
+    assert abstraction.info("flop") is None
+
+
+def test_rebuild_resumes_from_checkpoints(tmp_path):
+    build(tmp_path)
+    first = np.load(tmp_path / "buckets_v1_pre-flop.npy")
+    messages = []
+    build(tmp_path, log=messages.append)
+    assert "3/3 chunks already done" in messages[0]
+    assert np.array_equal(np.load(tmp_path / "buckets_v1_pre-flop.npy"), first)
+    with pytest.raises(ValueError):
+        build(tmp_path, runouts=16)
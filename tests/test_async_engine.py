@@ -0,0 +1,124 @@
+"""Remote bots over the JSON-lines protocol, and the async time budget."""
+import asyncio
+import subprocess
+import sys
+
+import bot_protocol
+from async_engine import accept_remote_bots, play_tournament_async
+from bots.Coyote import Coyote
+from bots.ParentBot import ParentBot
+from bots.RemoteBot import RemoteBot
+from display import NullSink
+
+
+class CallingStation(ParentBot):
+    """Checks when it can and calls everything else, so the other seat always gets to act."""
+
+    def make_decision(self, observation):
+        if observation.amount_to_call:
+            return ("call", observation.amount_to_call)
+        return ("check", 0)
+
+
+class MessageLog(NullSink):
+    def __init__(self):
+        self.messages = []
+
+    def message(self, text):
+        self.messages.append(text)
+
+
+def test_slow_remote_bot_is_auto_folded_or_checked():
+    async def run():
+        slow = await RemoteBot.spawn("Slow", "Coyote", "--delay", "0.5")
+        seen = []
+        remote_decision = slow.make_decision
+
+        def recording(observation):
+            seen.append(observation)
+            return remote_decision(observation)
+
+        slow.make_decision = recording
+        log = MessageLog()
+        try:
+            result = await play_tournament_async([slow, CallingStation("Station")], 4, seed=3,
+                                                 display=log, decision_timeout=0.05)
+        finally:
+            slow.process.kill()  # Don't wait for it to work through the stale requests
+            await slow.close()
+        return seen, log.messages, result
+
+    seen, messages, result = asyncio.run(run())
+    timeouts = [m for m in messages if m.startswith("Slow timed out")]
+    assert len(timeouts) == len(seen) > 0
+    for observation, message in zip(seen, timeouts):
+        expected = "auto-fold" if observation.amount_to_call else "auto-check"
+        assert message.endswith(expected + "."), (observation.amount_to_call, message)
+    assert any(m.endswith("auto-fold.") for m in timeouts)
+    assert any(m.endswith("auto-check.") for m in timeouts)
+    assert sum(result['chips'].values()) == 2000
+
+
+# Answers the hello, then cycles through replies the table can't use
+MALFORMED_BOT = """
+import json, sys
+bad = [lambda i: [i, "call"], lambda i: {"id": i}, lambda i: {"id": i, "action": "call"},
+       lambda i: "not json"]
+for n, line in enumerate(sys.stdin):
+    message = json.loads(line)
+    if message.get("hello"):
+        reply = {"id": message["id"], "name": "Broken"}
+    else:
+        reply = bad[n % len(bad)](message["id"])
+    sys.stdout.write((reply if isinstance(reply, str) else json.dumps(reply)) + "\\n")
+    sys.stdout.flush()
+"""
+
+
+def test_malformed_remote_replies_fall_back_to_default_action():
+    async def run():
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", MALFORMED_BOT,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+        broken = await RemoteBot.handshake(process.stdout, process.stdin)
+        broken.process = process
+        log = MessageLog()
+        try:
+            result = await play_tournament_async([broken, CallingStation("Caller")], 6, seed=2,
+                                                 display=log, decision_timeout=5)
+        finally:
+            await broken.close()
+        return result, log.messages
+
+    result, messages = asyncio.run(run())
+    failures = [m for m in messages if m.startswith("Broken failed")]
+    assert len(failures) >= 4
+    assert all(m.endswith(("auto-fold.", "auto-check.")) for m in failures)
+    assert sum(result['chips'].values()) == 2000
+
+
+def test_remote_bot_plays_full_hands_over_socket():
+    async def run():
+        processes = []
+
+        def launch(address):
+            host, port = address
+            processes.append(subprocess.Popen([
+                sys.executable, bot_protocol.__file__, "Coyote", "--name", "Alice",
+                "--connect", f"{host}:{port}"]))
+
+        (remote,) = await asyncio.wait_for(accept_remote_bots(1, on_listening=launch), 30)
+        log = MessageLog()
+        try:
+            result = await play_tournament_async([remote, Coyote(name="Bob")], 30, seed=1,
+                                                 display=log, decision_timeout=10)
+        finally:
+            await remote.close()
+            await asyncio.to_thread(processes[0].wait, 10)
+        return remote, log.messages, result
+
+    remote, messages, result = asyncio.run(run())
+    assert remote.name == "Alice"
+    assert not [m for m in messages if "auto-" in m]
+    assert result['hands_played'] > 0
+    assert sum(result['chips'].values()) == 2000
@@ -0,0 +1,87 @@
+"""Betting rounds: a short all-in doesn't reopen the raise for seats that already acted."""
+import random
+
+from bots.ParentBot import ParentBot
+from display import NullSink
+from game_engine import run_betting_round
+from game_state import GameState
+from search_state import SearchState, random_policy
+
+
+class Scripted(ParentBot):
+    """Plays its moves in order and keeps every observation it was shown."""
+
+    def __init__(self, name, chips, moves):
+        super().__init__(name)
+        self.chips = chips
+        self.folded = False
+        self.moves = list(moves)
+        self.seen = []
+
+    def make_decision(self, observation):
+        self.seen.append(observation)
+        return self.moves.pop(0)
+
+
+def short_all_in_round(last_move):
+    # Seat 0 is the button and opens to 100; the small blind shoves for 130
+    # total, only 30 more; the big blind hasn't acted yet and may still re-raise
+    button = Scripted("Button", 1000, [("raise", 80), last_move])
+    small = Scripted("Small", 130, [("raise", 120)])
+    big = Scripted("Big", 1000, [("call", 110)])
+    game_state = GameState([button, small, big])
+    game_state.dealer_index = 0
+    run_betting_round(game_state, NullSink())
+    return game_state, button, small, big
+
+
+def test_short_all_in_does_not_reopen_raising():
+    game_state, button, small, big = short_all_in_round(("raise", 500))
+    assert small.chips == 0
+    assert big.seen[0].legal_actions().can_raise
+    legal = button.seen[1].legal_actions()
+    assert legal.to_call == 30
+    assert not legal.can_raise
+    # The attempted re-raise is coerced into a call and the round closes
+    assert [a['action'] for a in game_state.action_history][-1] == "call"
+    assert button.current_bet == big.current_bet == small.current_bet == 130
+    assert not button.moves and not big.moves
+
+
+def test_full_raise_reopens_raising():
+    button = Scripted("Button", 1000, [("raise", 80), ("call", 80)])
+    small = Scripted("Small", 1000, [("raise", 170)])  # To 180: a full raise of 80
+    big = Scripted("Big", 1000, [("fold", 0)])
+    game_state = GameState([button, small, big])
+    game_state.dealer_index = 0
+    run_betting_round(game_state, NullSink())
+    assert button.seen[1].legal_actions().can_raise
+
+
+def test_search_state_matches_engine_after_short_all_in():
+    # Same spot as above, three seats with the button on seat 0
+    state = SearchState([1000, 130, 1000], [(), (), ()], dealer=0)
+    state.apply("raise", 80)
+    state.apply("raise", 30)  # All-in: apply() takes legal amounts only
+    assert state.legal_actions().can_raise  # Big blind hasn't acted
+    state.apply("call", 110)
+    assert state.to_act == 0
+    assert not state.legal_actions().can_raise
+    state.undo()
+    state.undo()
+    state.undo()
+    assert state.to_act == 0 and state.legal_actions().can_raise
+
+
+def test_search_state_undo_restores_acted_flags():
+    rng = random.Random(0)
+    for _ in range(200):
+        state = SearchState([rng.randint(30, 400) for _ in range(4)], [(), (), (), ()],
+                            dealer=rng.randrange(4))
+        snapshots = []
+        while not state.terminal:
+            snapshots.append((state.to_act, state.acted[:], state.legal_actions()))
+            state.apply(*random_policy(state, state.legal_actions(), rng))
+        for to_act, acted, legal in reversed(snapshots):
+            state.undo()
+            assert (state.to_act, state.acted, state.legal_actions()) == (to_act, acted, legal)
@@ -0,0 +1,33 @@
+"""Live dashboard: seats reflect folds and stacks during the hand."""
+import io
+
+from rich.console import Console
+
+from bots.Coyote import Coyote
+from display import LiveSink, ThreadedSink, make_sink
+
+
+def render(sink) -> str:
+    console = Console(width=120, record=True, file=io.StringIO())
+    console.print(sink._render())
+    return console.export_text()
+
+
+def test_live_sink_shows_folds_and_stacks_mid_hand():
+    players = [Coyote("Alice"), Coyote("Bob")]
+    for p in players:
+        p.folded = False
+        p.hand = []
+    sink = LiveSink()
+    sink.hands(players, 0)
+    assert "folded" not in render(sink)
+    players[1].folded = True
+    players[0].chips = 1234
+    text = render(sink)
+    assert "folded" in text
+    assert "$1,234" in text
+
+
+def test_live_sink_is_not_wrapped_in_a_thread():
+    sink = make_sink("live", threaded=True)
+    assert isinstance(sink, LiveSink) and not isinstance(sink, ThreadedSink)
@@ -0,0 +1,75 @@
+"""EquityCache: suit/order-canonical keys, memory and disk LRU, persistence."""
+import itertools
+
+import pytest
+from treys import Card
+
+import equity_cache
+from equity_cache import EquityCache, cache_key
+
+
+def cards(text):
+    return [Card.new(c) for c in text.split()]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Distinct, increasing last-used times so LRU order is deterministic
+    ticks = itertools.count(1)
+    monkeypatch.setattr(equity_cache.time, "time", lambda: float(next(ticks)))
+
+
+def test_key_ignores_suit_names_and_order():
+    key = cache_key(cards("Ah Kh"), cards("Qh 7d 2c"))
+    assert key == cache_key(cards("As Ks"), cards("Qs 7c 2h"))
+    assert key == cache_key(cards("Kh Ah"), cards("2c Qh 7d"))
+    assert key != cache_key(cards("Ah Kd"), cards("Qh 7d 2c"))
+    assert key.count("|") == 1 and len(key) == 2 * 2 + 1 + 2 * 3
+
+
+def test_isomorphic_spots_share_one_entry(tmp_path):
+    cache = EquityCache(str(tmp_path / "eq.sqlite"), num_samples=200)
+    first = cache.equity(cards("Ah Kh"), cards("Qh 7d 2c"), 2)
+    assert cache.equity(cards("Ks As"), cards("7c Qs 2h"), 2) == first
+    assert (cache.misses, cache.hits, len(cache)) == (1, 1, 1)
+    assert cache.equity(cards("Ah Kh"), cards("Qh 7d 2c"), 3) != first  # Own entry
+    assert len(cache) == 2
+    cache.close()
+
+
+def test_entries_persist_across_instances(tmp_path):
+    path = str(tmp_path / "eq.sqlite")
+    writer = EquityCache(path, num_samples=200)
+    value = writer.equity(cards("Ac Ad"))
+    writer.close()
+    reader = EquityCache(path, num_samples=200)
+    assert reader.get(cards("Ah As")) == value
+    assert reader.equity(cards("Ah As")) == value and reader.misses == 0
+    assert 0.8 < value < 0.9
+    # Asking for more samples than were stored recomputes
+    assert EquityCache(path, num_samples=400).get(cards("Ah As")) is None
+
+
+def test_memory_lru_keeps_most_recent():
+    cache = EquityCache(":memory:", num_samples=100, memory_size=2)
+    hands = [cards(h) for h in ("2c 7d", "3c 8d", "4c 9d")]
+    cache.equity(hands[0])
+    cache.equity(hands[1])
+    cache.equity(hands[0])  # Most recent now
+    cache.equity(hands[2])
+    assert [k for k, _ in cache._memory] == [cache_key(hands[0], []), cache_key(hands[2], [])]
+    assert cache.get(hands[1]) is not None  # Still on disk
+
+
+def test_disk_eviction_drops_least_recently_used(tmp_path, clock):
+    cache = EquityCache(str(tmp_path / "eq.sqlite"), num_samples=100, max_entries=2,
+                        memory_size=1)
+    hands = [cards(h) for h in ("2c 7d", "3c 8d", "4c 9d")]
+    for hand in hands:
+        cache.equity(hand)
+    cache.equity(hands[0])  # Read back from disk: touches the oldest entry
+    assert cache.evict() == 1
+    assert len(cache) == 2
+    assert cache.get(hands[1]) is None
+    assert cache.get(hands[0]) is not None and cache.get(hands[2]) is not None
+    cache.close()
@@ -0,0 +1,30 @@
+"""Sharded tables: merged per-shard stats and flags that can't apply to shards."""
+import pytest
+
+from farm import run_farm
+from main import PLAYER_FACTORIES, parse_args
+from profiling import EngineStats
+from session_stats import SessionStats
+
+
+def test_shard_stats_and_trackers_are_merged():
+    stats = EngineStats()
+    tracker = SessionStats()
+    summary = run_farm(PLAYER_FACTORIES, 3, 20, seed=1, workers=1, stats=stats, tracker=tracker)
+    hands = next(iter(summary.values()))['hands_played']
+    assert stats.counters['hands'] == hands
+    assert {name: s.hands for name, s in tracker.players.items()} == \
+        {name: hands for name in summary}
+
+
+@pytest.mark.parametrize("flag", [["--record", "x.thh"], ["--profile-out", "x.prof"],
+                                  ["--sink", "log"], ["--every", "5"], ["--background"],
+                                  ["--refresh", "2"], ["--equity"]])
+def test_flags_without_shard_support_are_rejected(flag):
+    with pytest.raises(SystemExit):
+        parse_args(["--headless", "--shards", "2"] + flag)
+
+
+def test_profile_and_player_stats_are_accepted_with_shards():
+    args = parse_args(["--headless", "--shards", "2", "--profile", "--player-stats"])
+    assert args.profile and args.player_stats
@@ -0,0 +1,56 @@
+"""HandCacheMixin: cached classification matches the evaluator and the LRU stays bounded."""
+import random
+
+from treys import Card
+
+from bots.ParentBot import HandCacheMixin
+from deck import FULL_DECK
+from hand_evaluator import evaluate, rank_class
+
+
+class Classifier(HandCacheMixin):
+    hand_cache_size = 4
+
+
+def cards(text):
+    return [Card.new(c) for c in text.split()]
+
+
+def test_classification_matches_evaluator_street_by_street():
+    rng = random.Random(4)
+    bot = Classifier()
+    bot.hand_cache_size = 64
+    for _ in range(500):
+        dealt = rng.sample(FULL_DECK, 7)
+        hole, board = dealt[:2], dealt[2:]
+        for n in (3, 4, 5):  # Turn and river build on the previous street's entry
+            rank = evaluate(hole + board[:n])
+            assert bot._classify_hand(hole, board[:n]) == (rank, rank_class(rank))
+
+
+def test_turn_extends_cached_flop():
+    bot = Classifier()
+    hole = cards("Ah Kh")
+    bot._classify_hand(hole, cards("Qh Jh 2c"))
+    assert bot._classify_hand(hole, cards("Qh Jh 2c Th")) == (1, 0)  # Royal flush
+    assert len(bot._hand_cache) == 2
+
+
+def test_lru_evicts_least_recently_used():
+    bot = Classifier()
+    hole = cards("2c 7d")
+    boards = [cards(b) for b in ("Ah Kh Qs", "As Ks Qd", "Ad Kd Qc", "Ac Kc Qh", "3h 4h 5s")]
+    for board in boards[:4]:
+        bot._classify_hand(hole, board)
+    bot._classify_hand(hole, boards[0])  # Touch the oldest so it survives
+    bot._classify_hand(hole, boards[4])
+    keys = [board for _, board in bot._hand_cache]
+    assert len(keys) == 4
+    assert tuple(boards[1]) not in keys
+    assert keys[-2:] == [tuple(boards[0]), tuple(boards[4])]
+
+
+def test_caches_are_per_instance():
+    first, second = Classifier(), Classifier()
+    first._classify_hand(cards("2c 7d"), cards("Ah Kh Qs"))
+    assert not second.__dict__.get('_hand_cache')
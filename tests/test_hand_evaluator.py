@@ -0,0 +1,56 @@
+"""Lookup evaluator: same ranks as treys for 5-7 cards, singly and in batches."""
+import random
+
+import numpy as np
+from treys import Card, Evaluator
+
+from hand_evaluator import (evaluate, evaluate_batch, evaluate_hand, evaluate_keys,
+                            evaluate_showdown, hand_keys, rank_description)
+
+DECK = [Card.new(r + s) for r in "23456789TJQKA" for s in "shdc"]
+
+
+def cards(text):
+    return [Card.new(c) for c in text.split()]
+
+
+def random_hands(k, n, seed):
+    rng = random.Random(seed)
+    return [rng.sample(DECK, k) for _ in range(n)]
+
+
+def test_known_hands():
+    assert evaluate(cards("As Ks Qs Js Ts 2d 3c")) == 1
+    assert evaluate(cards("7d 5c 4h 3s 2d")) == 7462
+    assert rank_description(evaluate(cards("Ah Ad Ac Kd Ks 2c 3c"))) == "Full House"
+    # A wheel straight beats trips but loses to the six-high straight
+    wheel = evaluate(cards("Ah 2d 3c 4s 5h Kd Kc"))
+    assert rank_description(wheel) == "Straight"
+    assert wheel > evaluate(cards("6h 2d 3c 4s 5h Kd Kc"))
+    # Four suited cards plus a fifth on the board make the flush, not the pair
+    assert rank_description(evaluate_hand(cards("2h 9h"), cards("Kh 7h 4h 4c Qd"))) == "Flush"
+
+
+def test_matches_treys_for_five_six_and_seven_cards():
+    treys = Evaluator()
+    for k in (5, 6, 7):
+        for hand in random_hands(k, 2000, seed=k):
+            assert evaluate(hand) == treys.evaluate(hand[:2], hand[2:]), Card.ints_to_pretty_str(hand)
+
+
+def test_batch_matches_single_evaluation():
+    for k in (5, 6, 7):
+        hands = random_hands(k, 500, seed=10 + k)
+        ranks = evaluate_batch(np.array(hands))
+        assert ranks.tolist() == [evaluate(h) for h in hands]
+
+
+def test_keys_and_showdown_match_evaluate():
+    board = cards("Ks Qs 7s 7d 2c")
+    holes = [cards("As 3h"), cards("7h 7c"), cards("Kd Kh"), cards("4d 5d")]
+    expected = [evaluate(h + board) for h in holes]
+    assert evaluate_showdown(holes, board) == expected
+    flop_rank, flop_suit = hand_keys(board[:3])
+    for hole, rank in zip(holes, expected):
+        rank_key, suit_key = hand_keys(hole + board[3:])
+        assert evaluate_keys(flop_rank + rank_key, flop_suit + suit_key, hole + board) == rank
@@ -0,0 +1,35 @@
+"""Hand histories: the recorded pot leaves out uncalled bets."""
+from display import NullSink
+from game_engine import play_hand
+from hand_history import HandHistoryReader, HandHistoryWriter
+
+from test_betting import Scripted
+
+
+def record(tmp_path, players):
+    path = str(tmp_path / "hands.thh")
+    with HandHistoryWriter(path) as recorder:
+        play_hand(players, 0, display=NullSink(), seed=5, recorder=recorder)
+    (hand,) = HandHistoryReader(path)
+    return hand
+
+
+def test_pot_excludes_uncalled_raise(tmp_path):
+    # Button raises 80 over the big blind, both blinds fold: the raise comes back
+    button = Scripted("Button", 1000, [("raise", 80)])
+    small = Scripted("Small", 1000, [("fold", 0)])
+    big = Scripted("Big", 1000, [("fold", 0)])
+    hand = record(tmp_path, [button, small, big])
+    assert sum(a['amount'] for a in hand['actions']) == 10 + 20 + 100
+    assert hand['pot'] == 10 + 20 + 20  # Blinds plus the call part of the raise
+    assert hand['chips_end'][0] - hand['chips_start'][0] == 30
+
+
+def test_pot_excludes_excess_over_short_all_in(tmp_path):
+    # Button shoves 500 over a small blind who can only call 130 in total
+    button = Scripted("Button", 1000, [("raise", 500 - 20)])
+    small = Scripted("Small", 130, [("call", 120)])
+    big = Scripted("Big", 1000, [("fold", 0)])
+    hand = record(tmp_path, [button, small, big])
+    assert hand['pot'] == 130 + 130 + 20
+    assert sum(hand['chips_end']) == sum(hand['chips_start'])
@@ -0,0 +1,83 @@
+"""HandIndexer: dense indices, index/unindex round trips and suit invariance."""
+import random
+from itertools import combinations
+
+import pytest
+from treys import Card
+
+from deck import FULL_DECK
+from isomorphism import (HandIndexer, board_index, canonical_cards, canonical_index,
+                         num_canonical, texture_table)
+
+SUITS = (1, 2, 4, 8)
+
+
+def cards(text):
+    return [Card.new(c) for c in text.split()]
+
+
+def relabel(hand, permutation):
+    # Swap each card's suit bit for the permuted one, keeping rank and prime
+    return [c & ~0xF000 | permutation[SUITS.index((c >> 12) & 0xF)] << 12 for c in hand]
+
+
+def test_class_counts():
+    assert num_canonical() == 169
+    assert HandIndexer((3,)).size == 1755
+    assert num_canonical(3) == 1286792
+    indices = {canonical_index(list(hole)) for hole in combinations(FULL_DECK, 2)}
+    assert indices == set(range(169))
+
+
+@pytest.mark.parametrize("rounds", [(2,), (3,), (2, 3), (2, 4), (2, 3, 1)])
+def test_unindex_round_trips(rounds):
+    indexer = HandIndexer(rounds)
+    rng = random.Random(sum(rounds))
+    sample = range(indexer.size) if indexer.size < 5000 else rng.sample(range(indexer.size), 2000)
+    for i in sample:
+        hand = indexer.unindex(i)
+        assert [len(r) for r in hand] == list(rounds)
+        assert len({c for r in hand for c in r}) == sum(rounds)
+        assert indexer.index(hand) == i
+
+
+def test_index_ignores_suit_names_and_order_within_rounds():
+    indexer = HandIndexer((2, 3))
+    rng = random.Random(7)
+    for _ in range(500):
+        dealt = rng.sample(FULL_DECK, 5)
+        i = indexer.index([dealt[:2], dealt[2:]])
+        permutation = rng.sample(SUITS, 4)
+        assert indexer.index([relabel(dealt[1::-1], permutation),
+                              relabel(dealt[:1:-1], permutation)]) == i
+        assert canonical_index(dealt[:2], dealt[2:]) == i
+        assert canonical_cards(*[relabel(part, permutation) for part in (dealt[:2], dealt[2:])]) \
+            == canonical_cards(dealt[:2], dealt[2:])
+
+
+def test_rounds_are_distinguished():
+    # The same five cards split differently between hole and board
+    assert canonical_index(cards("As Ks"), cards("Qs 2d 3c")) != \
+        canonical_index(cards("As Qs"), cards("Ks 2d 3c"))
+    assert canonical_index(cards("As Ks")) != canonical_index(cards("As Kd"))
+
+
+def test_bad_input_is_rejected():
+    indexer = HandIndexer((2, 3))
+    with pytest.raises(ValueError):
+        indexer.index([cards("As Ks")])
+    with pytest.raises(ValueError):
+        indexer.index([cards("As Ks"), cards("Qs 2d")])
+    with pytest.raises(ValueError):
+        indexer.index([cards("As Ks"), cards("As 2d 3c")])
+
+
+def test_flop_textures(tmp_path):
+    table = texture_table(3, str(tmp_path))
+    assert len(table) == 1755
+    row = table[board_index(cards("Ah Kh Qh"))]
+    assert (row['high'], row['pairs'], row['max_suit'], row['connected']) == (12, 0, 3, 3)
+    row = table[board_index(cards("2c 2d 7s"))]
+    assert (row['pairs'], row['max_rank_count'], row['max_suit']) == (1, 2, 1)
+    wheel = table[board_index(cards("Ad 2c 3h"))]
+    assert wheel['connected'] == 3  # The ace plays low
@@ -0,0 +1,21 @@
+"""Multi-table tournaments with tables resident in worker processes."""
+from bots.Coyote import Coyote
+from mtt import Tournament, field
+
+
+def run(workers, **kwargs):
+    result = Tournament(field(Coyote, 60), seed=5).run(workers=workers, **kwargs)
+    del result['wall_time']
+    return result
+
+
+def test_workers_match_in_process_play():
+    # Balancing moves bots between workers; the deals and results must not change
+    assert run(3) == run(1)
+    assert run(2, max_hands=30) == run(1, max_hands=30)
+
+
+def test_every_entrant_finishes_once():
+    result = run(2)
+    assert sorted(result['finish'].values()) == list(range(1, 61))
+    assert sum(result['prizes'].values()) == 60 * 100
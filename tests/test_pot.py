@@ -0,0 +1,78 @@
+"""Side pot construction and showdown settlement."""
+import random
+
+from pot import build_pots, settle_pots
+
+
+def settle(contributions, folded, ranks, dealer=0):
+    return settle_pots(build_pots(contributions, folded), ranks, dealer, len(contributions))
+
+
+def test_odd_chip_goes_left_of_button():
+    # 101 chips split between seats 0 and 2: the odd chip goes to the first tied
+    # winner left of the button
+    contributions = [34, 33, 34]
+    folded = [False, True, False]
+    ranks = {0: 100, 2: 100}
+    assert settle(contributions, folded, ranks, dealer=1) == {2: 51, 0: 50}
+    assert settle(contributions, folded, ranks, dealer=2) == {0: 51, 2: 50}
+
+
+def test_folded_chips_stay_in_pot_as_dead_money():
+    contributions = [200, 50, 200]
+    folded = [False, True, False]
+    pots = build_pots(contributions, folded)
+    assert pots == [{'amount': 450, 'eligible': [0, 2]}]
+    payouts = settle_pots(pots, {0: 10, 2: 20}, 0, 3)
+    assert payouts == {0: 450}
+    assert 1 not in payouts
+
+
+def test_uncalled_top_bet_is_returned():
+    # Seat 0 bets 500, seat 1 can only call 200 all-in
+    pots = build_pots([500, 200], [False, False])
+    assert pots == [{'amount': 400, 'eligible': [1, 0]}, {'amount': 300, 'eligible': [0]}]
+    # Even when the short stack wins, the uncalled 300 goes back
+    assert settle_pots(pots, {0: 50, 1: 10}, 0, 2) == {1: 400, 0: 300}
+
+
+def test_slice_merges_when_live_players_are_unchanged():
+    # The folded seat's 100 level starts a slice, but the same two live seats
+    # contest everything above it: one pot, not two
+    pots = build_pots([300, 300, 100], [False, False, True])
+    assert pots == [{'amount': 700, 'eligible': [0, 1]}]
+
+
+def test_dead_money_above_every_live_bet_joins_last_pot():
+    # Seat 2 bet 400 then folded: nobody live can win that slice on their own
+    pots = build_pots([100, 100, 400], [False, False, True])
+    assert pots == [{'amount': 600, 'eligible': [0, 1]}]
+
+
+def test_ten_way_all_in_with_distinct_stacks():
+    contributions = [100 * (i + 1) for i in range(10)]
+    folded = [False] * 10
+    pots = build_pots(contributions, folded)
+    assert len(pots) == 10
+    assert [p['eligible'] for p in pots] == [list(range(i, 10)) for i in range(10)]
+
+    rng = random.Random(0)
+    for _ in range(200):
+        ranks = {s: rng.randint(1, 3) for s in range(10)}  # Plenty of ties
+        dealer = rng.randrange(10)
+        payouts = settle_pots(pots, ranks, dealer, 10)
+        assert sum(payouts.values()) == sum(contributions)
+        assert all(v >= 0 for v in payouts.values())
+
+
+def test_random_hands_conserve_chips():
+    rng = random.Random(1)
+    for _ in range(500):
+        n = rng.randint(2, 10)
+        contributions = [rng.randint(1, 5000) for _ in range(n)]
+        folded = [rng.random() < 0.3 for _ in range(n)]
+        folded[rng.randrange(n)] = False
+        ranks = {s: rng.randint(1, 4) for s in range(n) if not folded[s]}
+        payouts = settle(contributions, folded, ranks, rng.randrange(n))
+        assert sum(payouts.values()) == sum(contributions)
+        assert all(not folded[s] for s in payouts)
@@ -0,0 +1,30 @@
+"""Engine instrumentation: wall time for play_hand and the timed display wrapper."""
+from bots.Coyote import Coyote
+from display import NullSink, ThrottledSink
+from game_engine import play_hand
+from profiling import EngineStats, TimedSink
+
+
+class EquitySink(NullSink):
+    show_equity = True
+
+
+def test_play_hand_accumulates_wall_time():
+    players = [Coyote("Alice"), Coyote("Bob")]
+    stats = EngineStats()
+    dealer = 0
+    for seed in range(5):
+        dealer = play_hand(players, dealer, display=NullSink(), seed=seed, stats=stats)
+    summary = stats.summary()
+    assert summary['counters']['hands'] == 5
+    assert summary['wall_time'] > 0 and summary['hands_per_sec'] > 0
+
+
+def test_timed_sink_follows_throttled_show_equity():
+    sink = TimedSink(ThrottledSink(EquitySink(), every=2), EngineStats())
+    shown = []
+    for _ in range(4):
+        sink.begin_hand()
+        shown.append(sink.show_equity)
+        sink.end_hand()
+    assert shown == [True, False, True, False]
@@ -0,0 +1,30 @@
+"""Equity of a hand against a weighted range."""
+import numpy as np
+from treys import Card
+
+from ranges import HandRange, hand_vs_range
+
+AKS = [Card.new("As"), Card.new("Ks")]
+TURN = [Card.new(c) for c in ("Qh", "7d", "2c", "9s")]
+
+
+def test_river_is_exact():
+    river = TURN + [Card.new("3h")]
+    results = {hand_vs_range(AKS, river, HandRange(), seed=s)['equity'] for s in range(3)}
+    assert len(results) == 1
+
+
+def test_sampled_equity_is_within_its_error_bound():
+    exact = hand_vs_range(AKS, TURN, HandRange(), samples=50_000)['equity']  # Enumerated
+    estimates = [hand_vs_range(AKS, TURN, HandRange(), seed=s)['equity'] for s in range(20)]
+    # Standard error is under 0.013 with the default samples
+    assert abs(np.mean(estimates) - exact) < 0.01
+    assert np.std(estimates) < 0.013
+
+
+def test_narrow_range_is_enumerated():
+    villain = HandRange.from_labels("JJ,TT")
+    a = hand_vs_range(AKS, TURN, villain, seed=1)
+    b = hand_vs_range(AKS, TURN, villain, seed=2)
+    assert a == b
+    assert abs(a['equity'] - 6 / 44) < 1e-9  # 6 of the 44 unseen rivers win
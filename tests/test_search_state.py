@@ -0,0 +1,66 @@
+"""SearchState: undo restores the exact state, clones are independent, and payoffs are zero-sum."""
+import random
+
+from deck import FULL_DECK
+from search_state import SearchState, random_policy
+
+
+def snapshot(state):
+    return {name: (value[:] if isinstance(value, list) else value)
+            for name in SearchState.__slots__ if name != '_undo'
+            for value in [getattr(state, name)]}
+
+
+def random_state(rng, seats):
+    cards = rng.sample(FULL_DECK, 2 * seats)
+    hole = [cards[2 * i:2 * i + 2] for i in range(seats)]
+    stacks = [rng.choice([15, 60, 300, 1000]) for _ in range(seats)]
+    return SearchState(stacks, hole, dealer=rng.randrange(seats))
+
+
+def test_undo_restores_every_field():
+    rng = random.Random(1)
+    for _ in range(300):
+        state = random_state(rng, rng.randint(2, 6))
+        history = []
+        while not state.terminal:
+            history.append(snapshot(state))
+            state.apply(*random_policy(state, state.legal_actions(), rng))
+        for before in reversed(history):
+            state.undo()
+            assert snapshot(state) == before
+
+
+def test_payoffs_sum_to_zero_and_match_stacks():
+    rng = random.Random(2)
+    for _ in range(300):
+        state = random_state(rng, rng.randint(2, 6))
+        start = [s + c for s, c in zip(state.stacks, state.contrib)]
+        while not state.terminal:
+            state.apply(*random_policy(state, state.legal_actions(), rng))
+        payoffs = state.payoffs()
+        assert sum(payoffs) == 0
+        assert all(p >= -s for p, s in zip(payoffs, start))
+        assert sum(state.rollout(rng)) == 0  # Checked down from a terminal state
+
+
+def test_rollout_and_clone_leave_the_original_alone():
+    rng = random.Random(3)
+    state = random_state(rng, 4)
+    state.apply(*state.legal_actions().enumerate()[-1])
+    before = snapshot(state)
+    for _ in range(20):
+        assert sum(state.rollout(rng, random_policy)) == 0
+        assert sum(state.rollout(rng)) == 0
+    copy = state.clone()
+    while not copy.terminal:
+        copy.apply(*random_policy(copy, copy.legal_actions(), rng))
+    assert snapshot(state) == before
+
+
+def test_heads_up_button_posts_big_blind_and_acts_first():
+    state = SearchState([1000, 1000], [FULL_DECK[:2], FULL_DECK[2:4]], dealer=0)
+    assert state.bets == [20, 10]
+    assert state.to_act == 1
+    state.apply("fold", 0)
+    assert state.terminal and state.payoffs() == [10, -10]
@@ -0,0 +1,75 @@
+"""SessionStats: VPIP/PFR/3-bet/AF counters and the Welford bb/100 moments."""
+import random
+import statistics
+from types import SimpleNamespace
+
+import pytest
+
+from session_stats import SessionStats
+
+
+def act(player, action, amount=0, stage="pre-flop"):
+    return {'player': player, 'action': action, 'amount': amount, 'stage': stage}
+
+
+def record(tracker, results, actions, big_blind=20):
+    # results: {name: (chips before, chips after)}
+    seats = [SimpleNamespace(name=name, chips=end) for name, (_, end) in results.items()]
+    tracker.record_hand(seats, [start for start, _ in results.values()], actions, big_blind)
+
+
+def test_preflop_and_postflop_counters():
+    tracker = SessionStats()
+    # Ann opens, Bob 3-bets, Cat folds, the blinds' own posts don't count as VPIP
+    record(tracker, {"Ann": (1000, 900), "Bob": (1000, 1130), "Cat": (1000, 970)}, [
+        act("Bob", "small blind", 10), act("Cat", "big blind", 20),
+        act("Ann", "raise", 60), act("Bob", "call and raise", 110), act("Cat", "fold"),
+        act("Ann", "call", 40),
+        act("Bob", "raise", 40, "flop"), act("Ann", "fold", 0, "flop"),
+    ])
+    ann, bob, cat = (tracker.get(n) for n in ("Ann", "Bob", "Cat"))
+    assert (ann.vpip_hands, ann.pfr_hands) == (1, 1)
+    assert (bob.vpip_hands, bob.pfr_hands) == (1, 1)
+    assert (cat.vpip_hands, cat.pfr_hands) == (0, 0)
+    # Only Bob faced exactly one raise; Cat and Ann acted after his re-raise
+    assert (bob.three_bet_chances, bob.three_bets) == (1, 1)
+    assert ann.three_bet_chances == cat.three_bet_chances == 0
+    assert bob.postflop_raises == 1 and ann.folds == 1 and cat.folds == 1
+    assert ann.net_bb == -5 and bob.net_bb == 6.5 and cat.net_bb == -1.5
+    assert tracker.get("Dan") is None
+
+
+def test_walk_counts_a_hand_without_vpip():
+    tracker = SessionStats()
+    record(tracker, {"Ann": (1000, 990), "Bob": (1000, 1010)},
+           [act("Ann", "small blind", 10), act("Bob", "big blind", 20), act("Ann", "fold")])
+    assert tracker.get("Bob").hands == 1
+    assert tracker.get("Bob").vpip == 0.0 and tracker.get("Ann").vpip == 0.0
+
+
+def test_welford_moments_match_statistics():
+    rng = random.Random(5)
+    results = [rng.choice([-20, -10, 0, 30, 200]) for _ in range(200)]
+    tracker = SessionStats()
+    for delta in results:
+        record(tracker, {"Ann": (1000, 1000 + delta)}, [])
+    ann = tracker.get("Ann")
+    bb = [d / 20 for d in results]
+    assert ann.bb_per_100 == pytest.approx(statistics.mean(bb) * 100)
+    assert ann.bb_per_100_stderr == pytest.approx(
+        statistics.stdev(bb) / len(bb) ** 0.5 * 100)
+
+
+def test_merge_equals_one_stream():
+    rng = random.Random(6)
+    results = [rng.randint(-100, 100) for _ in range(90)]
+    whole, first, second = SessionStats(), SessionStats(), SessionStats()
+    for i, delta in enumerate(results):
+        hand = ({"Ann": (1000, 1000 + delta)}, [act("Ann", "call", 20)])
+        record(whole, *hand)
+        record(first if i < 30 else second, *hand)
+    first.merge(second)
+    merged, expected = first.get("Ann"), whole.get("Ann")
+    assert (merged.hands, merged.vpip_hands) == (expected.hands, expected.vpip_hands) == (90, 90)
+    assert merged.bb_per_100 == pytest.approx(expected.bb_per_100)
+    assert merged.bb_per_100_stderr == pytest.approx(expected.bb_per_100_stderr)